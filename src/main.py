@@ -1,12 +1,12 @@
 import yaml
 import asyncio
-from module.engine.backtest_engine import BacktestEngine
+from module.engine.factory import create_backtest_engine
 
 from utils.helpers import load_config
 
 async def main():
     config = load_config('backtest')
-    engine = BacktestEngine(config)
+    engine = create_backtest_engine(config)
     await engine.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+DATETIME_COLUMNS = ("datetime", "datetime_ist")
+
+
+def to_column_array(series: pd.Series):
+    """Converts a DataFrame column to a contiguous array suitable for O(1) positional reads."""
+    if series.name in DATETIME_COLUMNS:
+        # DatetimeIndex keeps pd.Timestamp scalars on positional access
+        return pd.DatetimeIndex(series)
+    return np.ascontiguousarray(series.to_numpy())
+
+
+def to_column_arrays(data_df: pd.DataFrame) -> dict:
+    """Converts every column of a DataFrame into a column array, keyed by column name."""
+    return {column: to_column_array(data_df[column]) for column in data_df.columns}
+
+
+class Candle:
+    """
+    Lightweight read-only view of one row of market data.
+    The column map (column name -> full column array) is built once per data source
+    and shared by every candle, so `candle["close"]` is a dict lookup plus an array
+    index instead of a pandas label lookup, and no row data is copied.
+    """
+    __slots__ = ("_arrays", "_row")
+
+    def __init__(self, arrays: dict, row: int):
+        self._arrays = arrays
+        self._row = row
+
+    def __getitem__(self, key: str):
+        return self._arrays[key][self._row]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._arrays
+
+    def get(self, key: str, default=None):
+        if key in self._arrays:
+            return self._arrays[key][self._row]
+        return default
+
+    def keys(self):
+        return self._arrays.keys()
+
+    @property
+    def name(self) -> int:
+        """Positional index of the row, mirroring pd.Series.name for rows taken with iloc."""
+        return self._row
+
+    def to_dict(self) -> dict:
+        return {column: values[self._row] for column, values in self._arrays.items()}
+
+    def to_series(self) -> pd.Series:
+        return pd.Series(self.to_dict(), name=self._row)
+
+    def __repr__(self) -> str:
+        return f"Candle({self.to_dict()})"
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from .candle import DATETIME_COLUMNS, to_column_array
+
+# Values a float column may hold to be narrowed to float32 in compact mode (besides NaN).
+# Other float columns stay float64: any of them (OHLC, indicator levels such as moving
+# averages or SuperTrend bands) can become an entry, stop or exit price.
+FLAG_VALUES = (-1.0, 0.0, 1.0)
+
+
+class LabelCodes:
+    """
+    Column of a few string labels (e.g. SuperTrend "Buy"/"Sell") stored as int8 codes.
+    Reads like the object array it replaces: an integer index returns the label (NaN
+    for code -1), a slice returns the matching LabelCodes, and comparing with a label
+    returns a boolean array, so strategies use it unchanged at a byte per row.
+    """
+    __slots__ = ("codes", "labels", "_lookup")
+
+    def __init__(self, codes: np.ndarray, labels):
+        self.codes = codes
+        self.labels = list(labels)
+        # Code -1 indexes the last entry: the missing value
+        self._lookup = np.array(self.labels + [np.nan], dtype=object)
+
+    @classmethod
+    def from_values(cls, values):
+        """From a Categorical or an array of labels (NaN/None for missing values)."""
+        categorical = values if isinstance(values, pd.Categorical) else pd.Categorical(values)
+        return cls(np.asarray(categorical.codes, dtype=np.int8), categorical.categories)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._lookup[self.codes[index]]
+        return LabelCodes(self.codes[index], self.labels)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _code(self, label) -> int:
+        return self.labels.index(label) if label in self.labels else -2 # -2 matches no row
+
+    def __eq__(self, label):
+        return self.codes == self._code(label)
+
+    def __ne__(self, label):
+        return self.codes != self._code(label)
+
+    __hash__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        values = self._lookup[self.codes]
+        return values if dtype is None else values.astype(dtype)
+
+    def to_categorical(self) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.codes, categories=self.labels)
+
+    def __repr__(self) -> str:
+        return f"LabelCodes({self.labels}, {len(self)} rows)"
+
+
+def is_label_column(values) -> bool:
+    """True for categorical or string columns (not datetimes), which compact mode stores as LabelCodes."""
+    dtype = getattr(values, "dtype", None)
+    return isinstance(dtype, pd.CategoricalDtype) or dtype == object or pd.api.types.is_string_dtype(dtype)
+
+
+def is_flag_column(values) -> bool:
+    """True for float columns holding only FLAG_VALUES and NaN, which float32 represents exactly."""
+    if getattr(values, "dtype", None) != np.float64:
+        return False
+    array = np.asarray(values)
+    return bool(np.isin(array[~np.isnan(array)], FLAG_VALUES).all())
+
+
+def compact_column_array(series: pd.Series):
+    """Like `to_column_array`, with compact dtypes: LabelCodes for labels and float32 for flags."""
+    if series.name in DATETIME_COLUMNS:
+        return to_column_array(series)
+    if is_label_column(series):
+        return LabelCodes.from_values(series.array if isinstance(series.dtype, pd.CategoricalDtype) else series.to_numpy())
+    if is_flag_column(series):
+        return np.ascontiguousarray(series.to_numpy(dtype=np.float32))
+    return to_column_array(series)
+
+
+def compact_column_arrays(data_df: pd.DataFrame) -> dict:
+    """
+    Column arrays of `data_df` with compact dtypes. `datetime` is served as a datetime64
+    view of the int64 epoch-ms `timestamp` column instead of a second 8-byte column.
+    """
+    arrays = {
+        column: compact_column_array(data_df[column])
+        for column in data_df.columns if column not in DATETIME_COLUMNS
+    }
+    if "timestamp" in arrays:
+        timestamps = np.ascontiguousarray(arrays["timestamp"], dtype=np.int64)
+        arrays["timestamp"] = timestamps
+        arrays["datetime"] = pd.DatetimeIndex(timestamps.view("datetime64[ms]"), copy=False)
+    return arrays
+
+
+def compact_frame(data_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    `data_df` with compact dtypes: categorical labels, float32 flags, and no datetime
+    columns when there are epoch-ms timestamps to derive them from (see `with_datetime`).
+    Values are unchanged, so backtests give the same results as in the default dtypes.
+    """
+    columns = {}
+    for column in data_df.columns:
+        values = data_df[column]
+        if column in DATETIME_COLUMNS and "timestamp" in data_df.columns:
+            continue
+        if column not in DATETIME_COLUMNS and is_label_column(values):
+            values = values.astype("category")
+        elif is_flag_column(values):
+            values = values.astype(np.float32)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data_df.index)
+
+
+def with_datetime(data_df: pd.DataFrame) -> pd.DataFrame:
+    """`data_df` with the `datetime` column compact mode leaves out, derived from the timestamps."""
+    if "datetime" in data_df.columns or "timestamp" not in data_df.columns:
+        return data_df
+    return data_df.assign(datetime=pd.to_datetime(data_df["timestamp"], unit="ms"))
@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 
+from .candle import Candle
+
+
+class DataManagerError(Exception):
+    """Raised when a data storage is asked for something it cannot provide."""
+
+
 class DataStorageBase(ABC):
     """
     Abstract base class for all data storage implementations.
     Defines the interface for strategies to retrieve market data.
     """
+    # True if the storage implements next_processed_data() (see the synchronous backtest driver)
+    supports_sync = False
+
     def __init__(self, data_df: pd.DataFrame):
         self.data_df = data_df
 
@@ -14,20 +24,30 @@ class DataStorageBase(ABC):
         """
         Advances to the next data point and returns the current candle
         and the historical data needed by the strategy.
-        Returns (current_candle: pd.Series, historical_data: pd.DataFrame) or (None, None)
+        Returns (current_candle: Candle, historical_data) or (None, None)
         if no more data.
         """
         pass
 
+    def next_processed_data(self):
+        """
+        Synchronous counterpart of get_next_processed_data() for data sources that
+        never wait on I/O, used by the synchronous backtest driver. Only available
+        when `supports_sync` is True.
+        """
+        raise DataManagerError(
+            f"{self.__class__.__name__} does not support synchronous data access."
+        )
+
     @abstractmethod
-    def current_candle(self) -> pd.Series:
+    def current_candle(self) -> Candle:
         """
         Returns the current day's data (the latest candle).
         """
         pass
 
     @abstractmethod
-    def previous_candle_of(self, day_count: int) -> pd.Series:
+    def previous_candle_of(self, day_count: int) -> Candle:
         """
         Returns the data for a candle N days (or periods) before the current one.
         day_count=1 for yesterday, day_count=2 for day before yesterday, etc.
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+class DataWindow:
+    """
+    Read-only rolling window over a set of per-column arrays.
+    Column access returns a slice of the underlying array (a view, not a copy),
+    so moving the window never allocates or copies market data.
+    """
+    __slots__ = ("_arrays", "_start", "_stop")
+
+    def __init__(self, arrays: dict, start: int = 0, stop: int = 0):
+        self._arrays = arrays
+        self._start = start
+        self._stop = stop
+
+    def _move(self, start: int, stop: int, arrays: dict = None):
+        """Repositions the window, over new `arrays` if given. Only the owning data storage should call this."""
+        if arrays is not None:
+            self._arrays = arrays
+        self._start = start
+        self._stop = stop
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._arrays[column][self._start:self._stop]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._arrays
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @property
+    def columns(self) -> list:
+        return list(self._arrays.keys())
+
+    @property
+    def empty(self) -> bool:
+        return self._stop <= self._start
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Materializes the window as a DataFrame. This copies the data and is meant
+        for callers that really need pandas, not for the per-tick hot path.
+        """
+        return pd.DataFrame({column: self[column] for column in self._arrays})
@@ -1,81 +1,131 @@
 import pandas as pd
-from collections import deque
-from datetime import datetime
 
+from .candle import DATETIME_COLUMNS, Candle, to_column_arrays
+from .compact import compact_column_arrays
 from .data_manager_base import DataStorageBase
+from .data_window import DataWindow
+
 
 class HistoricalDataStorage(DataStorageBase):
     """
     Implements DataStorageBase for historical backtesting data.
-    Provides data sequentially from a pre-loaded DataFrame with a rolling window.
+    The full enriched data is kept as contiguous per-column NumPy arrays and an
+    integer cursor is advanced on every tick. The current candle, previous candles
+    (as Candle views) and the rolling window are all read straight from those arrays,
+    so a tick costs O(1) regardless of the window size or the number of columns.
     """
-    def __init__(self, data_df: pd.DataFrame, window_size: int = 500):
-        super().__init__(pd.DataFrame()) # Initialize DataStorageBase with empty DF
-        
+    supports_sync = True
+
+    def __init__(self, data_df: pd.DataFrame, window_size: int = 500, compact: bool = False):
+        # data_df is not stored: it is served lazily from the column arrays (see `data_df`).
+        # With `compact`, the arrays use compact dtypes (see compact_column_arrays) and
+        # the original frame, which they no longer share memory with, is not kept.
+        data_df = self._prepare_frame(data_df, compact)
+
+        self._full_data = None if compact else data_df # Kept for callers that need the original frame
+        self._set_arrays(compact_column_arrays(data_df) if compact else to_column_arrays(data_df), window_size)
+
+    @staticmethod
+    def _prepare_frame(data_df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
+        if compact:
+            # `datetime` is served as a view of the epoch-ms timestamps
+            data_df = data_df.drop(columns=[column for column in DATETIME_COLUMNS if column in data_df.columns])
         # Ensure datetime column is proper datetime objects
-        if 'datetime' in data_df.columns:
+        elif 'datetime' in data_df.columns:
             data_df['datetime'] = pd.to_datetime(data_df['datetime'])
         else:
             data_df['datetime'] = pd.to_datetime(data_df['timestamp'], unit='ms')
-        
-        # Ensure data is sorted by timestamp
-        data_df = data_df.sort_values(by='timestamp').reset_index(drop=True)
 
-        self._full_data = data_df # Store the full historical data
-        self._current_index = 0 # Index for iterating through _full_data
+        # Ensure data is sorted by timestamp (sorted data, e.g. memory-mapped columns, is not copied)
+        if not data_df['timestamp'].is_monotonic_increasing:
+            data_df = data_df.sort_values(by='timestamp')
+        return data_df.reset_index(drop=True)
+
+    @classmethod
+    def lazy(cls, data_df: pd.DataFrame, indicator_processor, window_size: int = 500):
+        """
+        Builds a storage over raw data whose indicator columns (from `indicator_processor`)
+        are computed the first time the strategy reads them, and kept (see LazyColumns).
+        Columns use compact dtypes if the processor is in compact mode.
+        """
+        data_df = cls._prepare_frame(data_df, indicator_processor.compact)
+        storage = cls.__new__(cls)
+        storage._full_data = data_df
+        storage._set_arrays(indicator_processor.lazy_columns(data_df), window_size)
+        return storage
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, window_size: int = 500):
+        """
+        Builds a storage directly over column arrays that are already sorted by timestamp
+        (e.g. arrays mapped from shared memory). The arrays are used as-is, not copied.
+        """
+        storage = cls.__new__(cls)
+        storage._full_data = None
+        storage._set_arrays(arrays, window_size)
+        return storage
+
+    def _set_arrays(self, arrays: dict, window_size: int):
+        self._arrays = arrays
+        self._length = len(arrays['close'])
+        self._cursor = 0 # Number of candles consumed; the current candle is at _cursor - 1
         self.window_size = window_size
-        
-        # Initialize the rolling window deque with the first 'window_size' candles
-        # or all available data if less than window_size
-        initial_window_data = self._full_data.iloc[:min(len(self._full_data), window_size)].values.tolist()
-        self._rolling_window = deque(initial_window_data, maxlen=self.window_size)
-        
-        # The data_df for the IndicatorProcessor will be built from this rolling window
-        self.data_df = pd.DataFrame(list(self._rolling_window), columns=data_df.columns) # Preserve columns
+        self._window = DataWindow(self._arrays)
 
-    async def get_next_processed_data(self):
+    @property
+    def arrays(self) -> dict:
+        """The full per-column arrays, keyed by column name."""
+        return self._arrays
+
+    @property
+    def data_df(self) -> pd.DataFrame:
+        """The current rolling window as a DataFrame. Copies data; avoid per tick."""
+        return self._window.to_dataframe()
+
+    def next_processed_data(self):
         if self.has_more_data:
-            # Get the next candle from the full data
-            next_candle_raw = self._full_data.iloc[self._current_index]
-            self._current_index += 1
+            self._cursor += 1
+            self._window._move(max(0, self._cursor - self.window_size), self._cursor)
+            return self.current_candle(), self._window
+        return None, None
 
-            # Add it to the rolling window
-            self._rolling_window.append(next_candle_raw.values.tolist())
-            
-            # Rebuild data_df from the rolling window
-            self.data_df = pd.DataFrame(list(self._rolling_window), columns=self._full_data.columns)
+    async def get_next_processed_data(self):
+        return self.next_processed_data()
 
-            # The current candle is always the last one in the rolling window
-            current_candle = self.data_df.iloc[-1]
-            historical_data = self.data_df # The entire rolling window is the historical data
+    def seek(self, step: int):
+        """Moves the cursor so that `step` candles have been consumed (clamped to the data)."""
+        self._cursor = min(max(step, 0), self._length)
+        self._window._move(max(0, self._cursor - self.window_size), self._cursor)
 
-            return current_candle, historical_data
-        return None, None
+    def _row_index(self, day_count: int):
+        """Positional index of the candle `day_count` periods before the current one."""
+        if day_count >= self.window_size:
+            return None
+        index = self._cursor - 1 - day_count
+        return index if index >= 0 else None
 
-    def current_candle(self) -> pd.Series:
-        if not self.data_df.empty:
-            return self.data_df.iloc[-1]
-        return None
+    def current_candle(self) -> Candle:
+        return self.previous_candle_of(0)
 
-    def previous_candle_of(self, day_count: int) -> pd.Series:
-        # Access from the rolling window DataFrame
-        if len(self.data_df) >= (day_count + 1):
-            return self.data_df.iloc[-(day_count + 1)]
-        return None
+    def previous_candle_of(self, day_count: int) -> Candle:
+        index = self._row_index(day_count)
+        if index is None:
+            return None
+        return Candle(self._arrays, index)
 
     @property
     def has_more_data(self) -> bool:
-        return self._current_index < len(self._full_data)
+        return self._cursor < self._length
 
     @property
     def current_date(self):
-        if not self.data_df.empty:
-            return self.data_df.iloc[-1]['datetime']
+        if self._cursor > 0:
+            return self._arrays['datetime'][self._cursor - 1]
         return None
 
     @property
     def current_step(self) -> int:
-        return self._current_index
+        return self._cursor
 
     async def connect(self):
         pass # No connection needed for historical data
@@ -0,0 +1,74 @@
+import numpy as np
+
+from module.storage_manager.factory import create_store_manager
+from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, RAW_DATA_TYPE
+from utils.helpers import timeframe_to_ms
+from utils.historical_data_fetcher import update_data_for_pair
+
+# Lower-timeframe columns the resolver reads
+INTRABAR_COLUMNS = ["timestamp", "high", "low"]
+
+
+class IntrabarResolver:
+    """
+    Decides which of two price levels a bar reached first, using lower-timeframe data.
+    When a bar touches both the stop loss and the strategy's exit level, the bar alone
+    cannot tell the order. The resolver keeps the lower-timeframe candles (e.g. 1m) as
+    sorted arrays and only looks up the slice of an ambiguous bar, with searchsorted.
+    The rest of the backtest keeps running on the main timeframe.
+    """
+    def __init__(self, timestamps: np.ndarray, high: np.ndarray, low: np.ndarray, bar_duration_ms: int):
+        order = np.argsort(timestamps, kind="stable")
+        self._timestamps = np.asarray(timestamps, dtype=np.int64)[order]
+        self._high = np.asarray(high, dtype=float)[order]
+        self._low = np.asarray(low, dtype=float)[order]
+        self.bar_duration_ms = bar_duration_ms
+
+    @classmethod
+    def from_store(cls, pair_config, timeframe="1m"):
+        """
+        Loads the lower-timeframe series matching `pair_config` through the store manager,
+        downloading the parts of the period not stored yet first. Returns None if no data
+        is available.
+        """
+        lower_config = {**pair_config, "timeframe": timeframe}
+        try:
+            update_data_for_pair(lower_config)
+        except Exception as e:
+            print(f"❌ Could not download {timeframe} data for intrabar resolution: {e}")
+        data_store_manager = create_store_manager(lower_config, BACKTEST_DATA_TYPE)
+        lower_data = data_store_manager.load_dataframe(RAW_DATA_TYPE, columns=INTRABAR_COLUMNS)
+        if lower_data.empty:
+            print(f"❌ No {timeframe} data for {pair_config['symbol']}. Intrabar resolution disabled.")
+            return None
+
+        return cls(
+            lower_data["timestamp"].to_numpy(),
+            lower_data["high"].to_numpy(),
+            lower_data["low"].to_numpy(),
+            timeframe_to_ms(pair_config["timeframe"]),
+        )
+
+    def _bar_slice(self, bar_timestamp):
+        start = np.searchsorted(self._timestamps, bar_timestamp, side="left")
+        end = np.searchsorted(self._timestamps, bar_timestamp + self.bar_duration_ms, side="left")
+        return slice(start, end)
+
+    def stop_hit_first(self, bar_timestamp, trade_type, stop_price, exit_price) -> bool:
+        """
+        Returns True if the stop was reached no later than the exit level within the bar
+        starting at `bar_timestamp`. Stays conservative (True) when the lower-timeframe data
+        is missing or both levels are touched by the same lower-timeframe candle.
+        """
+        bar = self._bar_slice(int(bar_timestamp))
+        high, low = self._high[bar], self._low[bar]
+        if len(high) == 0:
+            return True
+
+        stop_touched = low <= stop_price if trade_type == "buy" else high >= stop_price
+        exit_touched = (low <= exit_price) & (high >= exit_price)
+        if not exit_touched.any():
+            return True
+        if not stop_touched.any():
+            return False
+        return int(np.argmax(stop_touched)) <= int(np.argmax(exit_touched))
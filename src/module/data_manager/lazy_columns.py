@@ -0,0 +1,83 @@
+import pandas as pd
+
+from module.indicators.context import IndicatorContext
+from .candle import to_column_array, to_column_arrays
+from .compact import compact_column_array, compact_column_arrays
+
+
+class LazyColumns(dict):
+    """
+    Column map (column name -> array) whose indicator columns are computed on first access.
+    It starts with the dataset's own columns. Reading an indicator column that is not
+    there yet computes the indicator producing it through the IndicatorProcessor (after
+    the indicator columns it reads, and from the indicator cache if there is one) and
+    keeps all of that indicator's columns, so indicators nothing reads cost neither
+    time nor memory. Indicators that do not declare their output columns are computed
+    up front.
+    In compact mode (see IndicatorProcessor) the columns use compact dtypes.
+    Lookups of computed columns are plain dict lookups. `in` also reports columns not
+    computed yet; iterating over the map (keys, values, items, len) exposes every
+    column, so it computes the remaining ones first.
+    """
+    def __init__(self, data_df: pd.DataFrame, indicator_processor):
+        super().__init__(compact_column_arrays(data_df) if indicator_processor.compact else to_column_arrays(data_df))
+        self._processor = indicator_processor
+        self._to_column_array = compact_column_array if indicator_processor.compact else to_column_array
+        self._context = IndicatorContext(data_df)
+        self._cache_keys = indicator_processor.cache_keys(data_df)
+        # Column not computed yet -> index of the indicator producing it
+        self._pending = {}
+        for index, indicator in enumerate(indicator_processor.indicators):
+            if indicator.output_columns is None:
+                self._compute(index)
+                continue
+            for column in indicator.output_columns:
+                self._pending.setdefault(column, index)
+
+    def _compute(self, index: int):
+        config = self._processor.configs[index]
+        if config.get("column") in self._pending:
+            self[config["column"]] # Computes the indicator it reads first
+        outputs = self._processor.compute_indicator(self._context, index, self._cache_keys)
+        for column, values in outputs.items():
+            dict.__setitem__(self, column, self._to_column_array(pd.Series(values, name=column)))
+            self._pending.pop(column, None)
+        # Later indicators read the stored column arrays, not the raw outputs. Intermediates
+        # are not kept between accesses: only the columns read stay in memory
+        self._context.add({column: dict.__getitem__(self, column) for column in outputs})
+        self._context.release()
+
+    def __missing__(self, column):
+        if column not in self._pending:
+            raise KeyError(column)
+        self._compute(self._pending[column])
+        return dict.__getitem__(self, column)
+
+    def __contains__(self, column) -> bool:
+        return dict.__contains__(self, column) or column in self._pending
+
+    def materialize(self):
+        """Computes every indicator column not computed yet."""
+        while self._pending:
+            self._compute(next(iter(self._pending.values())))
+        return self
+
+    @property
+    def computed(self) -> list:
+        """The indicator columns computed so far, in order."""
+        return [column for column in dict.keys(self) if column not in self._context.data_df.columns]
+
+    def __iter__(self):
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self.materialize())
+
+    def keys(self):
+        return dict.keys(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def items(self):
+        return dict.items(self.materialize())
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import ccxt.pro as ccxtpro
 import asyncio
@@ -7,10 +8,12 @@ import os
 from dotenv import load_dotenv
 import pytz
 
+from module.data_manager.candle import DATETIME_COLUMNS, Candle, to_column_array
 from module.data_manager.data_manager_base import DataStorageBase
+from module.data_manager.data_window import DataWindow
 from utils.indicator_processor import IndicatorProcessor
 from utils.event_emitter import EventEmitter
-from module.storage_manager.file_store_manager import FileStoreManager
+from module.storage_manager.factory import create_store_manager
 from module.storage_manager.storage_manager_base import (
     LIVE_DATA_TYPE,
     RAW_DATA_TYPE,
@@ -19,6 +22,18 @@ from module.storage_manager.storage_manager_base import (
 
 
 class LiveDataManager(DataStorageBase, EventEmitter):
+    """
+    Live (or simulated) data storage for one symbol and timeframe.
+    The processed window is kept in preallocated per-column buffers with room for
+    twice the window: a new candle is written in place after the last row, and the
+    last rows are copied to new buffers only when the buffers are full, so a candle
+    costs O(columns) amortized instead of rebuilding the window. Candles are views
+    over the buffers; `data_df` builds a DataFrame only when asked for.
+    A buffer row is written once and never overwritten, so Candles and column slices
+    handed out earlier keep their values after the window moves on (they read the
+    buffers they were taken from). The DataWindow returned with each candle is the
+    same object, moved to the current window.
+    """
     def __init__(
         self,
         symbol: str,
@@ -29,7 +44,7 @@ class LiveDataManager(DataStorageBase, EventEmitter):
         simulation_data: pd.DataFrame = None,
         logger=None,
     ):
-        DataStorageBase.__init__(self, pd.DataFrame())
+        # data_df is not stored: it is built on demand from the window buffers (see `data_df`)
         EventEmitter.__init__(self)
 
         self.symbol = symbol
@@ -42,13 +57,13 @@ class LiveDataManager(DataStorageBase, EventEmitter):
         self.exchange = exchange
         self.last_ws_candle_timestamp = None
 
-        # Initialize FileStoreManager for live data
+        # Initialize the store manager for live data
         symbol_info = {
             "symbol": symbol,
             "timeframe": timeframe,
             "start": datetime.now().strftime("%Y-%m-%d"),
         }
-        self.file_store_manager = FileStoreManager(symbol_info, data_type=LIVE_DATA_TYPE)
+        self.file_store_manager = create_store_manager(symbol_info, data_type=LIVE_DATA_TYPE)
 
         self.all_candles = deque(maxlen=500)
         if not self.simulation_mode:
@@ -83,18 +98,78 @@ class LiveDataManager(DataStorageBase, EventEmitter):
         )
 
         self.indicator_processor = IndicatorProcessor(self.indicator_configs)
-        self.data_df = self.indicator_processor.process(initial_df)
+        # With streaming indicators, each new candle only advances their state
+        # instead of recomputing them over the whole window
+        if self.indicator_processor.streaming:
+            processed_df = self.indicator_processor.seed(initial_df)
+        else:
+            processed_df = self.indicator_processor.process(initial_df)
+        self._load_window(processed_df)
 
         # Save initial raw candles to file
         self.file_store_manager.save_dataframe(initial_df, RAW_DATA_TYPE)
         # Save initial processed candles to file
-        self.file_store_manager.save_dataframe(self.data_df, PROCESSED_DATA_TYPE)
+        self.file_store_manager.save_dataframe(processed_df, PROCESSED_DATA_TYPE)
 
         if self.logger:
             self.logger.info(
                 f"LiveDataStorage initialized for {symbol} ({timeframe}). Initial data saved."
             )
 
+    def _load_window(self, processed_df: pd.DataFrame):
+        """Copies the processed window into newly allocated column buffers."""
+        capacity = 2 * self.all_candles.maxlen
+        self._buffers = {}
+        for column in processed_df.columns:
+            values = to_column_array(processed_df[column])
+            if column in DATETIME_COLUMNS:
+                # pd.Timestamp objects, as served by the DatetimeIndex columns of the other storages
+                values = np.asarray(values, dtype=object)
+            buffer = np.empty(capacity, dtype=values.dtype)
+            buffer[:len(values)] = values
+            self._buffers[column] = buffer
+        self._start = 0
+        self._stop = len(processed_df)
+        self._window = DataWindow(self._buffers, self._start, self._stop)
+
+    def _append_row(self, row: dict):
+        """Writes a processed candle after the last row of the window, dropping the oldest row once it is full."""
+        if self._stop == self._start:
+            # Nothing to take the dtypes from before the first candle
+            self._load_window(pd.DataFrame([row]))
+            return
+        maxlen = self.all_candles.maxlen
+        if self._stop == len(self._buffers["timestamp"]):
+            # Buffers full: copy the rows that stay in the window to the start of new
+            # buffers; the old ones are left as they are for the views still reading them
+            kept = maxlen - 1
+            buffers = {}
+            for column, buffer in self._buffers.items():
+                buffers[column] = np.empty_like(buffer)
+                buffers[column][:kept] = buffer[self._stop - kept:self._stop]
+            self._buffers = buffers
+            self._start, self._stop = 0, kept
+            self._window._move(self._start, self._stop, buffers)
+        for column, buffer in self._buffers.items():
+            try:
+                buffer[self._stop] = row[column]
+            except (TypeError, ValueError):
+                # A label in a column inferred as numeric (e.g. NaN during the warm-up)
+                buffer = self._buffers[column] = buffer.astype(object)
+                buffer[self._stop] = row[column]
+        self._stop += 1
+        self._start = max(self._start, self._stop - maxlen)
+        self._window._move(self._start, self._stop)
+
+    @property
+    def data_df(self) -> pd.DataFrame:
+        """The current window as a DataFrame. Copies data; avoid per tick."""
+        data_df = self._window.to_dataframe().infer_objects()
+        for column in DATETIME_COLUMNS:
+            if column in data_df.columns:
+                data_df[column] = pd.to_datetime(data_df[column])
+        return data_df
+
     async def connect(self):
         if not self.simulation_mode:
             await self.exchange.client.load_markets()
@@ -190,18 +265,10 @@ class LiveDataManager(DataStorageBase, EventEmitter):
 
         completed_candle = candle_df_single.iloc[0]  # Get as Series
 
-        # Save the new candle to the raw data file
+        # Append the new candle to the raw data file (created by the first candle);
+        # the stored candles are not read back and rewritten
         try:
-            existing_df = self.file_store_manager.load_dataframe(RAW_DATA_TYPE)
-            if not existing_df.empty:
-                # Append new candle and save
-                updated_df = pd.concat(
-                    [existing_df, candle_df_single], ignore_index=True
-                )
-                self.file_store_manager.save_dataframe(updated_df, RAW_DATA_TYPE)
-            else:
-                # If file was empty, save the new candle directly
-                self.file_store_manager.save_dataframe(candle_df_single, RAW_DATA_TYPE)
+            self.file_store_manager.save_dataframe(candle_df_single, RAW_DATA_TYPE, append=True)
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error saving live raw data: {e}")
@@ -210,6 +277,11 @@ class LiveDataManager(DataStorageBase, EventEmitter):
             completed_candle.values.tolist()
         )  # Store as list for deque consistency
 
+        if self.indicator_processor.streaming:
+            # Keep the same window as the deque: the new row replaces the oldest one
+            self._append_row(self.indicator_processor.update(completed_candle.to_dict()))
+            return self._finish_candle()
+
         # Create a DataFrame from the current deque content and process indicators
         current_deque_list = []
         for candle_data in self.all_candles:
@@ -235,15 +307,19 @@ class LiveDataManager(DataStorageBase, EventEmitter):
             temp_df["datetime_ist"]
         )  # Ensure datetime objects
 
-        self.data_df = self.indicator_processor.process(
-            temp_df
+        self._load_window(
+            self.indicator_processor.process(temp_df)
         )  # Process the current window
+        return self._finish_candle()
+
+    def _finish_candle(self):
+        """Advances the step after a new processed candle, and saves it."""
         self._current_step += 1
 
         # Save the processed data
         try:
             # Append only the latest processed candle to the file
-            latest_processed_candle = self.data_df.tail(1)
+            latest_processed_candle = pd.DataFrame([self.current_candle().to_dict()])
             self.file_store_manager.save_dataframe(
                 latest_processed_candle, PROCESSED_DATA_TYPE, append=True
             )
@@ -251,7 +327,7 @@ class LiveDataManager(DataStorageBase, EventEmitter):
             if self.logger:
                 self.logger.error(f"Error saving live processed data: {e}")
 
-        return self.current_candle(), self.data_df
+        return self.current_candle(), self._window
 
     async def start_live_data(self):
         """
@@ -321,14 +397,13 @@ class LiveDataManager(DataStorageBase, EventEmitter):
     #     finally:
     #         await self.close()
 
-    def current_candle(self) -> pd.Series:
-        if not self.data_df.empty:
-            return self.data_df.iloc[-1]
-        return None
+    def current_candle(self) -> Candle:
+        return self.previous_candle_of(0)
 
-    def previous_candle_of(self, day_count: int) -> pd.Series:
-        if len(self.data_df) >= (day_count + 1):
-            return self.data_df.iloc[-(day_count + 1)]
+    def previous_candle_of(self, day_count: int) -> Candle:
+        index = self._stop - 1 - day_count
+        if index >= self._start:
+            return Candle(self._buffers, index)
         return None
 
     @property
@@ -337,8 +412,8 @@ class LiveDataManager(DataStorageBase, EventEmitter):
 
     @property
     def current_date(self):
-        if not self.data_df.empty:
-            return self.data_df.iloc[-1]["datetime"]
+        if self._stop > self._start:
+            return self._buffers["datetime"][self._stop - 1]
         return None
 
     @property
@@ -0,0 +1,111 @@
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .compact import LabelCodes
+
+# Offsets of the columns inside the block are rounded up to this many bytes
+COLUMN_ALIGNMENT = 64
+
+
+def _to_shareable(values):
+    """Returns (array, kind) with a fixed-size dtype that can live in a shared memory block."""
+    if isinstance(values, LabelCodes):
+        # int8 codes; the labels travel in the kind
+        return values.codes, f"labels:{json.dumps(values.labels)}"
+    if isinstance(values, pd.DatetimeIndex):
+        # datetime64 values in UTC; the timezone (if any) is restored on attach
+        return values if values.tz is None else values.tz_convert(None), f"datetime:{values.tz or ''}"
+    values = np.asarray(values)
+    if values.dtype == object:
+        # e.g. SuperTrend directions ("Buy"/"Sell"/NA) become fixed-width strings, NA -> ""
+        return pd.Series(values).fillna("").astype(str).to_numpy(dtype=str), "string"
+    return values, "array"
+
+
+class SharedColumns:
+    """
+    Column arrays stored in a single `multiprocessing.shared_memory` block.
+    The parent process copies the enriched data in once with `create()` and passes
+    the (small, picklable) `spec` to worker processes, which `attach()` to the same
+    memory. Workers read the columns as NumPy views: nothing is pickled or reloaded
+    from disk per job.
+    Batched indicator outputs can be stored as (bars x columns) matrices: each is one
+    column-major region of the block, and its columns are exposed in `arrays` as
+    contiguous views into it.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, spec: dict):
+        self._shm = shm
+        self.spec = spec
+        self.arrays = {}
+        self.matrices = []
+        for name, dtype, offset, kind in spec["columns"]:
+            values = np.ndarray((spec["length"],), dtype=dtype, buffer=shm.buf, offset=offset)
+            values.flags.writeable = False
+            if kind.startswith("labels:"):
+                values = LabelCodes(values, json.loads(kind.split(":", 1)[1]))
+            elif kind.startswith("datetime:"):
+                timezone = kind.split(":", 1)[1]
+                values = pd.DatetimeIndex(values, name=name)
+                values = values.tz_localize("UTC").tz_convert(timezone) if timezone else values
+            self.arrays[name] = values
+        for names, dtype, offset in spec.get("matrices", ()):
+            matrix = np.ndarray((spec["length"], len(names)), dtype=dtype, buffer=shm.buf, offset=offset, order="F")
+            matrix.flags.writeable = False
+            self.matrices.append((names, matrix))
+            self.arrays.update((name, matrix[:, column]) for column, name in enumerate(names))
+
+    @classmethod
+    def create(cls, arrays: dict, matrices=()):
+        """
+        Copies `arrays` (column name -> array, as built by `to_column_arrays`) into shared memory,
+        and the (column names, (bars x columns) array) pairs of `matrices` (e.g. from
+        `IndicatorProcessor.compute_batches`).
+        """
+        columns, offset = [], 0
+        shareable = {}
+        for name, values in arrays.items():
+            values, kind = _to_shareable(values)
+            values = np.asarray(values)
+            shareable[name] = values
+            columns.append((name, values.dtype.str, offset, kind))
+            offset += -(-values.nbytes // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+        matrix_specs = []
+        for names, matrix in matrices:
+            matrix = np.asarray(matrix)
+            matrix_specs.append((list(names), matrix.dtype.str, offset))
+            offset += -(-matrix.nbytes // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+
+        length = len(next(iter(shareable.values()))) if shareable else 0
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, dtype, column_offset, _), values in zip(columns, shareable.values()):
+            np.ndarray(values.shape, dtype=dtype, buffer=shm.buf, offset=column_offset)[:] = values
+        for (names, dtype, matrix_offset), (_, matrix) in zip(matrix_specs, matrices):
+            np.ndarray((length, len(names)), dtype=dtype, buffer=shm.buf, offset=matrix_offset, order="F")[:] = matrix
+        return cls(shm, {"name": shm.name, "length": length, "columns": columns, "matrices": matrix_specs})
+
+    @classmethod
+    def attach(cls, spec: dict):
+        """
+        Maps the block described by `spec` (from the creating process) without copying it.
+        Close it when done (or use it as a context manager): views into it must be gone by then.
+        """
+        return cls(shared_memory.SharedMemory(name=spec["name"]), spec)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmaps the block in this process."""
+        self.arrays = {}
+        self.matrices = []
+        self._shm.close()
+
+    def unlink(self):
+        """Frees the block. Only the creating process should call this, after all workers are done."""
+        self._shm.unlink()
@@ -2,74 +2,340 @@ import yaml
 import pandas as pd
 import importlib
 import re
-import copy
 from calendar import month_name
 import asyncio
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+from module.data_manager.compact import with_datetime
 from module.data_manager.historical_data_manager import HistoricalDataStorage
-from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, RESULT_DATA_TYPE, SUMMARY_DATA_TYPE
+from module.data_manager.intrabar_resolver import IntrabarResolver
+from module.engine.checkpoint import BacktestCheckpoint, RunManifest
+from module.engine.job_queue import JobQueue
+from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, MARKET_DATA_COLUMNS, MONTE_CARLO_DATA_TYPE, PROCESSED_DATA_TYPE, RAW_DATA_TYPE, RESULT_DATA_TYPE, SUMMARY_DATA_TYPE
+from module.portfolio.monte_carlo import print_monte_carlo, run_monte_carlo
 from module.portfolio.portfolio import Portfolio
-from utils.backtestHelpers import prepare_data_for_backtest
-from module.storage_manager.file_store_manager import FileStoreManager
+from utils.backtestHelpers import load_raw_data_for_backtest, period_rows
+from utils.historical_data_fetcher import update_data_for_pair
+from utils.indicator_cache import create_indicator_cache
+from utils.indicator_processor import IndicatorProcessor
+from module.storage_manager.factory import configure_storage, create_store_manager
+
+from utils.helpers import initialize_strategy, load_strategy_class, required_indicator_configs, timeframe_to_ms
+
+# backtest_settings entries that shape a job's results (or the files saved with them),
+# part of its key: changing one runs finished jobs again
+RESULT_SETTINGS = ("engine", "driver", "intrabar_resolution", "monte_carlo", "lazy_indicators", "compact_dtypes")
 
-from utils.helpers import initialize_strategy
 
 class BacktestEngine:
+    # Whether long runs snapshot their state (see `_attach_checkpoint`)
+    SUPPORTS_CHECKPOINTS = True
+
     def __init__(self, config):
         self.config = config
+        self._manifest = None
+        # Queued jobs carry their own config: store with the backend it selects
+        configure_storage(config)
 
-    def _initialize_components(self, enriched_data, timeframe):
-        strategy_config = self.config["strategy"]
-        
+    def _initialize_components(self, enriched_data, pair_config):
         data_for_strategy = enriched_data
         data_storage = HistoricalDataStorage(data_for_strategy, window_size=500)
+        return self._create_strategy(data_storage, pair_config)
+
+    def _lazy_indicators(self) -> bool:
+        """
+        True if indicator columns are computed the first time the strategy reads them:
+        `backtest_settings.lazy_indicators` is on and the strategy does not declare the
+        columns it reads (declared columns already limit the indicators computed).
+        """
+        if not self.config["backtest_settings"].get("lazy_indicators", True):
+            return False
+        strategy_config = self.config["strategy"]
+        return load_strategy_class(strategy_config).required_columns(strategy_config["parameters"]) is None
+
+    def _compact_dtypes(self) -> bool:
+        """True if `backtest_settings.compact_dtypes` keeps market data in compact dtypes (see compact_frame)."""
+        return (self.config["backtest_settings"].get("compact_dtypes") or {}).get("enabled", False)
+
+    def _build_strategy(self, pair_config, raw_data=None, portfolio=None):
+        """
+        The strategy over the data of one period, or None if there is no data.
+        The raw data is loaded (and downloaded if missing) unless given. The indicators
+        the strategy needs are computed up front and saved as processed data, or, in
+        lazy mode, on first access.
+        """
+        compact = self._compact_dtypes()
+        if raw_data is None:
+            raw_data = load_raw_data_for_backtest(pair_config, compact)
+        if raw_data is None or raw_data.empty:
+            return None
+
+        indicator_processor = IndicatorProcessor(
+            required_indicator_configs(self.config), cache=create_indicator_cache(self.config), compact=compact
+        )
+        if self._lazy_indicators():
+            data_storage = HistoricalDataStorage.lazy(raw_data, indicator_processor, window_size=500)
+            return self._create_strategy(data_storage, pair_config, portfolio=portfolio)
+
+        print(f"🔄 Processing indicators for {pair_config['symbol']} ({pair_config['timeframe']})...")
+        enriched_data = indicator_processor.process(raw_data)
+        # Saved with its datetime column, read by the visualizer, in compact mode too
+        create_store_manager(pair_config, BACKTEST_DATA_TYPE).save_dataframe(with_datetime(enriched_data), PROCESSED_DATA_TYPE)
+        data_storage = HistoricalDataStorage(enriched_data, window_size=500, compact=compact)
+        return self._create_strategy(data_storage, pair_config, portfolio=portfolio)
 
-        portfolio = Portfolio(
-            capital=self.config["portfolio"]["initial_capital"],
+    def _create_portfolio(self, capital=None):
+        """A fresh Portfolio from the `portfolio` config, optionally starting from another capital."""
+        return Portfolio(
+            capital=capital if capital is not None else self.config["portfolio"]["initial_capital"],
             fee_pct=self.config["portfolio"]["fee_pct"],
             risk_pct=self.config["portfolio"]["risk_pct"],
         )
 
-        return initialize_strategy(strategy_config, data_storage, portfolio)
+    def _create_strategy(self, data_storage, pair_config, strategy_config=None, capital=None, portfolio=None):
+        """Builds the configured (or given) strategy over `data_storage`, with a fresh portfolio unless one is given."""
+        strategy_config = strategy_config or self.config["strategy"]
+        if portfolio is None:
+            portfolio = self._create_portfolio(capital)
 
-    async def _run_and_save_results(self, strategy, pair_config):
-        print(f"\n--- Running Backtest: {strategy.__class__.__name__} on {pair_config['symbol']} ({pair_config['timeframe']}) ---")
-        data_store_manager = FileStoreManager(pair_config, BACKTEST_DATA_TYPE)
-        symbol = pair_config['symbol']
-        timeframe = pair_config['timeframe']
-        summary = await strategy.run_backtest()
+        strategy = initialize_strategy(strategy_config, data_storage, portfolio)
+        strategy.intrabar_resolver = self._create_intrabar_resolver(pair_config)
+        return strategy
+
+    def _create_intrabar_resolver(self, pair_config):
+        """Builds the IntrabarResolver if `backtest_settings.intrabar_resolution` enables it."""
+        settings = self.config["backtest_settings"].get("intrabar_resolution") or {}
+        lower_timeframe = settings.get("timeframe", "1m")
+        if not settings.get("enabled", False):
+            return None
+        if timeframe_to_ms(lower_timeframe) >= timeframe_to_ms(pair_config["timeframe"]):
+            return None
+        return IntrabarResolver.from_store(pair_config, lower_timeframe)
+
+    async def _execute_backtest(self, strategy):
+        """
+        Runs the strategy over its data storage and returns the portfolio summary.
+        Uses the synchronous driver unless `backtest_settings.driver` is "async" or the
+        data storage cannot be read synchronously.
+        """
+        if self.config["backtest_settings"].get("driver", "sync") == "async" or not strategy.data_storage.supports_sync:
+            return await strategy.run_backtest()
+        return strategy.run_backtest_sync()
+
+    def _save_results(self, pair_config, portfolio):
+        """Writes the trades and summary of a finished backtest and prints the summary."""
+        data_store_manager = create_store_manager(pair_config, BACKTEST_DATA_TYPE)
+        summary = portfolio.summary()
 
         data_store_manager.save_dataframe(pd.DataFrame(summary["trades"]), RESULT_DATA_TYPE)
         data_store_manager.save_json(summary, SUMMARY_DATA_TYPE)
         
-        print(f"\n--- Results for {symbol} ({timeframe}) ---")
-        strategy.portfolio.print_summary()
+        print(f"\n--- Results for {pair_config['symbol']} ({pair_config['timeframe']}) ---")
+        portfolio.print_summary()
+        self._run_monte_carlo(data_store_manager, portfolio)
         print("--------------------------------------")
 
-    async def run(self):
+    def _run_monte_carlo(self, data_store_manager, portfolio):
+        """Optional post-step: Monte Carlo resampling of the trades, saved next to the summary."""
+        settings = self.config["backtest_settings"].get("monte_carlo") or {}
+        if not settings.get("enabled", False):
+            return
+        result = run_monte_carlo(
+            portfolio.trades,
+            portfolio.initial_capital,
+            simulations=settings.get("simulations", 10000),
+            method=settings.get("method", "bootstrap"),
+            seed=settings.get("seed"),
+        )
+        if result is None:
+            return
+        data_store_manager.save_json(result, MONTE_CARLO_DATA_TYPE)
+        print_monte_carlo(result)
+
+    async def _run_and_save_results(self, strategy, pair_config):
+        print(f"\n--- Running Backtest: {strategy.__class__.__name__} on {pair_config['symbol']} ({pair_config['timeframe']}) ---")
+        self._attach_checkpoint(strategy, pair_config)
+        await self._execute_backtest(strategy)
+        self._save_results(pair_config, strategy.portfolio)
+        self._mark_completed(pair_config)
+        self._clear_checkpoint(pair_config)
+
+    def _checkpoint_settings(self):
+        return self.config["backtest_settings"].get("checkpoint") or {}
+
+    def _job_key(self, pair_config, **extra):
+        """
+        Identifies a job by its period and the settings that shape its result (strategy,
+        parameters, indicators, portfolio, storage backend and RESULT_SETTINGS). Other
+        config edits (queue, parallelism, checkpoints, the run grid) keep the key.
+        """
         backtest_settings = self.config["backtest_settings"]
-        symbols = backtest_settings["symbols"]
-        timeframes = backtest_settings["timeframes"]
-        periods = backtest_settings["periods"]
+        return JobQueue.job_key({
+            "pair_config": pair_config,
+            "strategy": self.config["strategy"],
+            "indicators": self.config["indicators"],
+            "portfolio": self.config["portfolio"],
+            "storage": self.config.get("storage") or {},
+            **{name: backtest_settings.get(name) for name in RESULT_SETTINGS},
+            **extra,
+        })
 
-        for symbol in symbols:
-            for timeframe in timeframes:
-                for year, months in periods.items():
+    def _is_completed(self, pair_config, **extra):
+        """True if the run manifest records the job as finished (always False without checkpoints)."""
+        manifest = self._run_manifest()
+        if manifest is None or not manifest.is_done(self._job_key(pair_config, **extra)):
+            return False
+        print(f"⏭️  {pair_config['symbol']} ({pair_config['timeframe']}) {pair_config['start']} → {pair_config['end']} already completed. Skipping.")
+        return True
+
+    def _mark_completed(self, pair_config, **extra):
+        manifest = self._run_manifest()
+        if manifest is not None:
+            manifest.mark_done(self._job_key(pair_config, **extra), pair_config)
+
+    def _run_manifest(self):
+        """The RunManifest of `backtest_settings.checkpoint.path`, or None when checkpoints are disabled."""
+        settings = self._checkpoint_settings()
+        if not settings.get("enabled", False):
+            return None
+        if self._manifest is None:
+            self._manifest = RunManifest(Path(settings.get("path", "./data/checkpoint")) / "manifest.jsonl")
+        return self._manifest
+
+    def _checkpoint(self, pair_config):
+        settings = self._checkpoint_settings()
+        key = self._job_key(pair_config)
+        return BacktestCheckpoint(
+            Path(settings.get("path", "./data/checkpoint")) / f"{key}.pkl", key, every_bars=settings.get("every_bars", 5000)
+        )
+
+    def _attach_checkpoint(self, strategy, pair_config):
+        """
+        Gives the strategy a BacktestCheckpoint when checkpoints are enabled, resuming
+        from the last snapshot of the same job if there is one.
+        """
+        if not self._checkpoint_settings().get("enabled", False) or not self.SUPPORTS_CHECKPOINTS:
+            return
+        checkpoint = self._checkpoint(pair_config)
+        step = checkpoint.restore(strategy)
+        if step:
+            print(f"♻️  Resuming {pair_config['symbol']} ({pair_config['timeframe']}) from candle {step}")
+        strategy.checkpointer = checkpoint
+
+    def _clear_checkpoint(self, pair_config):
+        """Drops the snapshot of a job whose results are saved."""
+        if self._checkpoint_settings().get("enabled", False):
+            self._checkpoint(pair_config).clear()
+
+    def _build_pair_configs(self):
+        """Expands the symbols x timeframes x periods grid into pair configs, in run order."""
+        backtest_settings = self.config["backtest_settings"]
+        pair_configs = []
+        for symbol in backtest_settings["symbols"]:
+            for timeframe in backtest_settings["timeframes"]:
+                for year, months in backtest_settings["periods"].items():
                     if not months:
-                        date_range = {"year": year, "months": [], "start": f"{year}-01-01", "end": f"{year}-12-31"}
-                        pair_config = {"symbol": symbol, "timeframe": timeframe, "start": date_range["start"], "end": date_range["end"]}
-                        enriched_data = prepare_data_for_backtest(pair_config, copy.deepcopy(self.config["indicators"]))
-                        if enriched_data is not None and not enriched_data.empty:
-                            strategy = self._initialize_components(enriched_data, timeframe)
-                            await self._run_and_save_results(strategy, pair_config)
-                    else:
-                        for month in months:
-                            month_num = list(month_name).index(month.capitalize())
-                            start_date = f"{year}-{month_num:02d}-01"
-                            end_date = pd.to_datetime(start_date).to_period('M').end_time.strftime('%Y-%m-%d')
-                            date_range = {"year": year, "months": [month], "start": start_date, "end": end_date}
-                            pair_config = {"symbol": symbol, "timeframe": timeframe, "start": date_range["start"], "end": date_range["end"]}
-                            enriched_data = prepare_data_for_backtest(pair_config, copy.deepcopy(self.config["indicators"]))
-                            if enriched_data is not None and not enriched_data.empty:
-                                strategy = self._initialize_components(enriched_data, timeframe)
-                                await self._run_and_save_results(strategy, pair_config)
+                        pair_configs.append({"symbol": symbol, "timeframe": timeframe, "start": f"{year}-01-01", "end": f"{year}-12-31"})
+                        continue
+                    for month in months:
+                        month_num = list(month_name).index(month.capitalize())
+                        start_date = f"{year}-{month_num:02d}-01"
+                        end_date = pd.to_datetime(start_date).to_period('M').end_time.strftime('%Y-%m-%d')
+                        pair_configs.append({"symbol": symbol, "timeframe": timeframe, "start": start_date, "end": end_date, "month": month.lower()})
+        return pair_configs
+
+    async def run(self):
+        parallel_settings = self.config["backtest_settings"].get("parallel") or {}
+        if parallel_settings.get("enabled", False):
+            self._run_parallel(parallel_settings)
+            return
+
+        for pair_config in self._build_pair_configs():
+            if self._is_completed(pair_config):
+                continue
+            strategy = self._build_strategy(pair_config)
+            if strategy is not None:
+                await self._run_and_save_results(strategy, pair_config)
+
+    def _run_parallel(self, settings):
+        """
+        Runs every (pair_config, strategy) job of the grid on a process pool.
+        Raw data is first brought up to date per symbol and timeframe, in the same
+        datasets the serial run uses (one task per symbol and timeframe, so each coverage
+        index has a single writer); each job then loads its period and computes its own
+        indicators, exactly as the serial run does. Portfolios are collected in the parent
+        and results are saved in grid order, so the output does not depend on scheduling.
+        """
+        workers = settings.get("workers") or os.cpu_count()
+        chunksize = settings.get("chunksize", 1)
+
+        downloads = {}
+        jobs = []
+        for pair_config in self._build_pair_configs():
+            if self._is_completed(pair_config):
+                continue
+            downloads.setdefault(_pair_key(pair_config), []).append(pair_config)
+            jobs.append(pair_config)
+
+        print(f"⚙️  Running {len(jobs)} backtests on {workers} workers ({len(downloads)} symbols and timeframes)...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            downloaded = executor.map(_download_pair_data, downloads.values())
+            ready = {(*key, *period) for key, periods in zip(downloads, downloaded) for period in periods}
+            runnable = [
+                pair_config for pair_config in jobs
+                if (*_pair_key(pair_config), pair_config["start"], pair_config["end"]) in ready
+            ]
+
+            results = executor.map(_run_backtest_job, repeat(self), runnable, chunksize=chunksize)
+            for pair_config, portfolio in zip(runnable, results):
+                if portfolio is None:
+                    print(f"❌ No data for {pair_config['symbol']} ({pair_config['timeframe']}) from {pair_config['start']} to {pair_config['end']}. Skipping.")
+                    continue
+                self._save_results(pair_config, portfolio)
+                self._mark_completed(pair_config)
+                self._clear_checkpoint(pair_config)
+
+
+def _pair_key(pair_config):
+    return (pair_config["symbol"], pair_config["timeframe"])
+
+
+def _download_pair_data(pair_configs):
+    """
+    Process-pool task: downloads what is not stored yet of the periods of one symbol
+    and timeframe. Returns the (start, end) of the periods whose data is ready.
+    """
+    ready = []
+    for pair_config in pair_configs:
+        try:
+            update_data_for_pair(pair_config)
+        except Exception as e:
+            print(f"❌ Could not download {pair_config['symbol']} ({pair_config['timeframe']}) from {pair_config['start']} to {pair_config['end']}: {e}")
+            continue
+        ready.append((pair_config["start"], pair_config["end"]))
+    return ready
+
+
+def _load_period_data(pair_config, compact=False):
+    """Raw rows of the period of `pair_config`, from the dataset the serial run uses (already downloaded)."""
+    return period_rows(
+        create_store_manager(pair_config, BACKTEST_DATA_TYPE).load_dataframe(
+            RAW_DATA_TYPE, compact=compact, columns=MARKET_DATA_COLUMNS
+        ),
+        pair_config,
+    )
+
+
+def _run_backtest_job(engine, pair_config):
+    """Process-pool task: enriches the data of one period, backtests it and returns the Portfolio."""
+    strategy = engine._build_strategy(pair_config, _load_period_data(pair_config, engine._compact_dtypes()))
+    if strategy is None:
+        return None
+
+    print(f"\n--- Running Backtest: {strategy.__class__.__name__} on {pair_config['symbol']} ({pair_config['timeframe']}) {pair_config['start']} → {pair_config['end']} ---")
+    engine._attach_checkpoint(strategy, pair_config)
+    asyncio.run(engine._execute_backtest(strategy))
+    return strategy.portfolio
@@ -0,0 +1,79 @@
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+
+class RunManifest:
+    """
+    Append-only record (one JSON line per job) of the jobs of a run that finished and
+    saved their results. A restarted run skips the keys found here.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.completed = set()
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        self.completed.add(json.loads(line)["key"])
+                    except (ValueError, KeyError):
+                        continue # Partial last line of an interrupted write
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark_done(self, key: str, pair_config: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"key": key, "pair_config": pair_config, "finished_at": time.time()}, default=str) + "\n")
+        self.completed.add(key)
+
+
+class BacktestCheckpoint:
+    """
+    Periodic snapshot of one running backtest: the portfolio state and the number of
+    candles consumed. The strategy's sync driver calls `maybe_save()` after each step;
+    `restore()` puts a fresh strategy back at the snapshot, so the run continues from
+    there instead of from the first candle. Snapshots are written to a temporary file
+    and renamed, so an interruption never leaves a truncated one.
+    """
+    def __init__(self, path, key: str, every_bars: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.key = key
+        self.every_bars = every_bars
+        self._saved_step = 0
+
+    def maybe_save(self, strategy):
+        step = strategy.data_storage.current_step
+        if step - self._saved_step >= self.every_bars:
+            self.save(strategy)
+
+    def save(self, strategy):
+        snapshot = {"key": self.key, "step": strategy.data_storage.current_step, "portfolio": strategy.portfolio.state()}
+        temporary = self.path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            pickle.dump(snapshot, f)
+        os.replace(temporary, self.path)
+        self._saved_step = snapshot["step"]
+
+    def restore(self, strategy) -> int:
+        """Loads the snapshot into `strategy` if there is a valid one. Returns the step resumed from (0 if none)."""
+        if not self.path.exists():
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return 0
+        if snapshot.get("key") != self.key or snapshot["step"] > len(strategy.data_storage.arrays["close"]):
+            return 0
+        strategy.portfolio.restore_state(snapshot["portfolio"])
+        strategy.data_storage.seek(snapshot["step"])
+        self._saved_step = snapshot["step"]
+        return snapshot["step"]
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,40 @@
+from module.engine.backtest_engine import BacktestEngine
+from module.engine.halving_engine import SuccessiveHalvingEngine
+from module.engine.multi_asset_engine import MultiAssetBacktestEngine
+from module.engine.sweep_engine import ParameterSweepEngine
+from module.engine.vectorized_backtest_engine import VectorizedBacktestEngine
+from module.engine.walk_forward_engine import WalkForwardEngine
+
+ENGINE_MAP = {
+    "event": BacktestEngine,
+    "vectorized": VectorizedBacktestEngine,
+    "multi_asset": MultiAssetBacktestEngine,
+}
+
+SWEEP_MAP = {
+    "grid": ParameterSweepEngine,
+    "halving": SuccessiveHalvingEngine,
+    "walk_forward": WalkForwardEngine,
+}
+
+def create_backtest_engine(config):
+    """
+    Factory function to create the backtest engine selected by `backtest_settings.engine`.
+    Defaults to the event-driven BacktestEngine. When `backtest_settings.sweep` is
+    enabled, the engine is wrapped in the sweep engine selected by `sweep.method`.
+    """
+    name = config["backtest_settings"].get("engine", "event")
+    engine_class = ENGINE_MAP.get(name.lower())
+    if not engine_class:
+        raise ValueError(f"Backtest engine '{name}' not recognized.")
+
+    engine = engine_class(config)
+    sweep_settings = config["backtest_settings"].get("sweep") or {}
+    if not sweep_settings.get("enabled", False):
+        return engine
+
+    method = sweep_settings.get("method", "grid")
+    sweep_class = SWEEP_MAP.get(method.lower())
+    if not sweep_class:
+        raise ValueError(f"Sweep method '{method}' not recognized.")
+    return sweep_class(engine)
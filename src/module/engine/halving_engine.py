@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from module.engine.sweep_engine import ParameterSweepEngine
+
+
+class SuccessiveHalvingEngine(ParameterSweepEngine):
+    """
+    Parameter search by successive halving over growing slices of history.
+    Every candidate is first backtested on a short slice at the start of the data
+    (`halving.min_fraction`); the best 1/eta by `sweep.rank_by` are promoted to a slice
+    eta times longer, and so on until the survivors run on the full history. Most of
+    the candidates are thus only scored on a small part of the data.
+    The parameter space is the same as the grid sweep's; `halving.samples` optionally
+    draws a random subset of it first. Indicators are computed once on the full series,
+    so a candidate's columns are the same on every slice.
+    """
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.halving = self.settings.get("halving") or {}
+        self.eta = self.halving.get("eta", 3)
+        self.min_fraction = self.halving.get("min_fraction", 0.05)
+        if self.eta < 2:
+            raise ValueError("sweep.halving.eta must be at least 2.")
+        if not 0 < self.min_fraction <= 1:
+            raise ValueError("sweep.halving.min_fraction must be in (0, 1].")
+
+    def _candidates(self):
+        candidates = self._parameter_sets()
+        samples = self.halving.get("samples")
+        if samples and samples < len(candidates):
+            rng = np.random.default_rng(self.halving.get("seed"))
+            picked = np.sort(rng.choice(len(candidates), size=samples, replace=False))
+            candidates = [candidates[index] for index in picked]
+        return candidates
+
+    def _rung_fractions(self):
+        """Share of the history used at each rung, ending with the full history."""
+        rungs = math.ceil(math.log(1 / self.min_fraction, self.eta) - 1e-9)
+        return [min(1.0, self.min_fraction * self.eta ** rung) for rung in range(rungs)] + [1.0]
+
+    def _search(self, executor, pair_config, overrides, strategy_params, arrays):
+        """
+        Runs the rungs, keeping each candidate's metrics from the last rung it reached.
+        Returns the unranked results table, with the rung and the number of bars.
+        """
+        length = len(arrays["close"])
+        results = [None] * len(overrides)
+        alive = list(range(len(overrides)))
+        fractions = self._rung_fractions()
+        for rung, fraction in enumerate(fractions):
+            if len(alive) == 1:
+                fraction = 1.0 # a single survivor goes straight to the full history
+            bars = max(2, int(length * fraction))
+            print(f"🔎 Rung {rung + 1}/{len(fractions)}: {len(alive)} candidates on {bars} bars")
+            summaries = self._evaluate(executor, pair_config, [strategy_params[index] for index in alive], (0, bars))
+            for index, summary in zip(alive, summaries):
+                results[index] = {**overrides[index], "rung": rung + 1, "bars": bars, **summary}
+            if fraction >= 1.0:
+                break
+
+            scores = self._rank(pd.DataFrame([results[index] for index in alive], index=alive))
+            alive = sorted(scores.index[:max(1, math.ceil(len(alive) / self.eta))])
+
+        return pd.DataFrame(results)
+
+    def _rank(self, table):
+        """Candidates that reached a later rung rank first, then by the sweep metric."""
+        table = super()._rank(table)
+        if "rung" in table.columns:
+            table = table.sort_values("rung", ascending=False, kind="stable")
+        return table
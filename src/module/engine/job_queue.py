@@ -0,0 +1,211 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    claim_token TEXT,
+    heartbeat_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+"""
+
+
+class JobQueue:
+    """
+    Durable job queue in a single SQLite file, for spreading backtests over several
+    machines without a broker: every host that can open the file (local disk or a
+    shared mount) can enqueue, claim and complete jobs.
+
+    - Enqueueing is idempotent: a job is keyed by a hash of its payload (or of the
+      key given for it), so running the coordinator twice does not duplicate work.
+    - Claiming happens in an IMMEDIATE transaction, so a job is handed to one worker
+      only. The worker gets a claim token and must present it to complete the job.
+    - Running workers refresh a heartbeat. Jobs whose heartbeat is older than
+      `stale_after` seconds are given back to the queue (up to `max_attempts` times);
+      a late result from the worker that lost the claim is then ignored.
+
+    Note that SQLite relies on file locks: on network filesystems make sure locking is
+    supported (e.g. NFSv4), or run the coordinator and workers against a local path.
+    """
+    def __init__(self, path, stale_after=120, max_attempts=3, timeout=60):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front, so read-then-update is atomic."""
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    @staticmethod
+    def job_key(payload: dict) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def enqueue(self, payloads, keys=None) -> int:
+        """
+        Adds jobs that are not queued yet. Returns the number of new jobs.
+        `keys` are the job keys of the payloads; by default a hash of each whole payload.
+        """
+        payloads = list(payloads)
+        keys = keys if keys is not None else [self.job_key(payload) for payload in payloads]
+        rows = [(key, json.dumps(payload, default=str)) for key, payload in zip(keys, payloads)]
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO jobs (job_key, payload) VALUES (?, ?)", rows)
+            return connection.total_changes - before
+
+    def _requeue_stale(self, connection, now):
+        """Gives the jobs of dead workers back to the queue, or fails them after max_attempts."""
+        stale = now - self.stale_after
+        connection.execute(
+            "UPDATE jobs SET status = ?, error = 'worker heartbeat lost', finished_at = ? "
+            "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+            (FAILED, now, RUNNING, stale, self.max_attempts),
+        )
+        connection.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, claim_token = NULL, error = 'worker heartbeat lost' "
+            "WHERE status = ? AND heartbeat_at < ?",
+            (PENDING, RUNNING, stale),
+        )
+
+    def claim(self, worker: str):
+        """Claims the oldest pending job. Returns (job_id, claim_token, payload) or None."""
+        now = time.time()
+        with self._transaction() as connection:
+            self._requeue_stale(connection, now)
+            row = connection.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, payload = row
+            token = uuid.uuid4().hex
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker = ?, claim_token = ?, attempts = attempts + 1, "
+                "heartbeat_at = ?, started_at = ?, error = NULL WHERE id = ?",
+                (RUNNING, worker, token, now, now, job_id),
+            )
+        return job_id, token, json.loads(payload)
+
+    def heartbeat(self, job_id, token) -> bool:
+        """Refreshes a running job's heartbeat. Returns False if the claim was lost."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND claim_token = ? AND status = ?",
+                (time.time(), job_id, token, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, token) -> bool:
+        """Marks a job done. Returns False if the claim was lost (the job was given to another worker)."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND claim_token = ? AND status = ?",
+                (DONE, time.time(), job_id, token, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, token, error: str) -> bool:
+        """Records a failed attempt: the job goes back to the queue until max_attempts is reached."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "worker = NULL, claim_token = NULL, error = ?, finished_at = ? "
+                "WHERE id = ? AND claim_token = ? AND status = ?",
+                (self.max_attempts, FAILED, PENDING, error, time.time(), job_id, token, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def reset_failed(self) -> int:
+        """Puts failed jobs back in the queue with a fresh attempt count."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, error = NULL WHERE status = ?", (PENDING, FAILED)
+            )
+            return cursor.rowcount
+
+    def counts(self) -> dict:
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            connection.close()
+        return {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def jobs(self, status=None) -> list:
+        """Jobs as dicts (payload decoded), optionally filtered by status."""
+        query = "SELECT id, status, attempts, worker, heartbeat_at, started_at, finished_at, error, payload FROM jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        connection = self._connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            rows = connection.execute(query + " ORDER BY id", params).fetchall()
+        finally:
+            connection.close()
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    @contextmanager
+    def keep_alive(self, job_id, token, interval):
+        """Refreshes the job's heartbeat every `interval` seconds from a background thread while the block runs."""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    alive = self.heartbeat(job_id, token)
+                except Exception as e:
+                    # e.g. "database is locked" on a busy shared file: try again next interval
+                    print(f"⚠️  Heartbeat of job {job_id} failed, retrying: {e}")
+                    continue
+                if not alive:
+                    print(f"⚠️  Job {job_id} was reassigned while running.")
+                    return
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
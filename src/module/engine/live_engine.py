@@ -2,7 +2,7 @@ import asyncio
 from module.exchange.exchange import Exchange
 from module.portfolio.portfolio import Portfolio
 from utils.logger import app_logger
-from utils.helpers import initialize_strategy
+from utils.helpers import initialize_strategy, required_indicator_configs
 from module.data_manager.live_data_manager import LiveDataManager
 from module.storage_manager.storage_manager_base import LIVE_DATA_TYPE
 
@@ -53,7 +53,8 @@ class LiveTradingEngine:
 
     async def _initialize_components(self):
         live_config = self.config["live_trading"]
-        indicator_configs = self.config["indicators"]
+        # Only the indicators the strategy declares it reads, when it does
+        indicator_configs = required_indicator_configs(self.config)
         strategy_config = self.config["strategy"]
 
         symbol, timeframe = (
@@ -118,7 +119,7 @@ class LiveTradingEngine:
                     self.logger.info(
                         f"New candle received: {current_candle['datetime']}"
                     )
-                    self.strategy.on_tick()
+                    await self.strategy.on_tick()
                 else:
                     await asyncio.sleep(1)
             except Exception as e:
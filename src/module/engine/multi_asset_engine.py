@@ -0,0 +1,96 @@
+import numpy as np
+
+from module.engine.backtest_engine import BacktestEngine
+from module.portfolio.multi_asset_portfolio import MultiAssetPortfolio
+
+PORTFOLIO_SYMBOL = "portfolio"
+
+
+class MultiAssetBacktestEngine(BacktestEngine):
+    """
+    Backtests all configured symbols together, against one MultiAssetPortfolio.
+    For every timeframe and period, the symbols' enriched data are aligned once on the
+    union of their timestamps: a (bars x symbols) table gives, for each step of the
+    shared clock, which symbols have a candle. The simulation then walks that clock and
+    ticks only those symbols, each through its own strategy and data storage, so cash
+    committed by one symbol is not available to the others. Within a step, symbols are
+    ticked in config order.
+    Results are saved once per timeframe and period, under the symbol "portfolio",
+    with a per-symbol breakdown in the summary.
+    The shared clock is walked in one process with the synchronous driver, without
+    snapshots: parallel runs, the async driver and checkpoints are rejected.
+    """
+    SUPPORTS_CHECKPOINTS = False
+
+    def __init__(self, config):
+        super().__init__(config)
+        settings = config["backtest_settings"]
+        if (settings.get("parallel") or {}).get("enabled", False):
+            raise ValueError("Multi-asset backtests do not run in parallel; disable backtest_settings.parallel.")
+        if settings.get("driver", "sync") != "sync":
+            raise ValueError("Multi-asset backtests use the sync driver; set backtest_settings.driver to 'sync'.")
+        if (settings.get("checkpoint") or {}).get("enabled", False):
+            raise ValueError("Multi-asset backtests are not checkpointed; disable backtest_settings.checkpoint.")
+
+    def _build_portfolio_configs(self):
+        """Pair configs of the grid grouped by timeframe and period: [(portfolio_config, pair_configs)]."""
+        groups = {}
+        for pair_config in self._build_pair_configs():
+            period = {key: value for key, value in pair_config.items() if key != "symbol"}
+            key = tuple(sorted(period.items()))
+            if key not in groups:
+                groups[key] = ({"symbol": PORTFOLIO_SYMBOL, **period}, [])
+            groups[key][1].append(pair_config)
+        return list(groups.values())
+
+    @staticmethod
+    def _align(timestamps: list):
+        """
+        Shared clock of several timestamp arrays (each sorted, unique).
+        Returns (clock, has_bar), where has_bar[i, j] tells whether symbol j has a candle
+        at clock[i].
+        """
+        clock = np.unique(np.concatenate(timestamps))
+        has_bar = np.zeros((len(clock), len(timestamps)), dtype=bool)
+        for column, symbol_timestamps in enumerate(timestamps):
+            has_bar[np.searchsorted(clock, symbol_timestamps), column] = True
+        return clock, has_bar
+
+    def _simulate(self, strategies: list, has_bar: np.ndarray):
+        """Steps every strategy on the shared clock, then closes the positions still open."""
+        for row in has_bar:
+            for column in np.flatnonzero(row):
+                strategy = strategies[column]
+                strategy.data_storage.next_processed_data()
+                strategy.on_tick_sync()
+
+        for strategy in strategies:
+            if strategy.portfolio.current_trade:
+                strategy._liquidate_sync(reason="end_of_data")
+
+    async def run(self):
+        for portfolio_config, pair_configs in self._build_portfolio_configs():
+            symbols = [pair_config["symbol"] for pair_config in pair_configs]
+            if self._is_completed(portfolio_config, symbols=symbols):
+                continue
+            portfolio = MultiAssetPortfolio(
+                capital=self.config["portfolio"]["initial_capital"],
+                fee_pct=self.config["portfolio"]["fee_pct"],
+                risk_pct=self.config["portfolio"]["risk_pct"],
+            )
+            strategies = []
+            for pair_config in pair_configs:
+                strategy = self._build_strategy(pair_config, portfolio=portfolio.view(pair_config["symbol"]))
+                if strategy is None:
+                    print(f"❌ No data for {pair_config['symbol']} ({pair_config['timeframe']}). Leaving it out of the portfolio.")
+                    continue
+                strategies.append(strategy)
+            if not strategies:
+                continue
+
+            clock, has_bar = self._align([strategy.data_storage.arrays["timestamp"] for strategy in strategies])
+            print(f"\n--- Running Portfolio Backtest: {strategies[0].__class__.__name__} on {', '.join(strategy.portfolio.symbol for strategy in strategies)} "
+                  f"({portfolio_config['timeframe']}, {len(clock)} bars) ---")
+            self._simulate(strategies, has_bar)
+            self._save_results(portfolio_config, portfolio)
+            self._mark_completed(portfolio_config, symbols=symbols)
@@ -0,0 +1,192 @@
+import asyncio
+import copy
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from module.data_manager.historical_data_manager import HistoricalDataStorage
+from module.data_manager.shared_columns import SharedColumns
+from module.storage_manager.factory import create_store_manager
+from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, SWEEP_DATA_TYPE
+from utils.backtestHelpers import prepare_data_for_backtest
+from utils.helpers import load_strategy_class, required_indicator_configs
+from utils.indicator_cache import create_indicator_cache
+from utils.indicator_processor import IndicatorProcessor
+
+# Summary entries that are not per-run metrics and are left out of the sweep table
+NON_METRIC_KEYS = ("trades", "open_trade_info")
+
+
+class ParameterSweepEngine:
+    """
+    Evaluates every combination of the strategy parameter ranges declared under
+    `backtest_settings.sweep.parameters`, for each pair config of the run grid.
+    The data is enriched once with the indicators of all parameter sets, copied into
+    shared memory, and the parameter sets are spread over a process pool whose tasks
+    attach to that memory. Indicators that only differ in a batchable parameter (e.g.
+    the moving averages of every swept period) are computed in one pass into a
+    (bars x periods) matrix that workers index directly, instead of being added to the
+    enriched frame one column at a time. Each parameter set is backtested with the wrapped engine
+    (event-driven or vectorized); the results are written as one table of
+    `Portfolio.summary()` metrics per pair config, ranked by `sweep.rank_by`.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.config = engine.config
+        self.settings = self.config["backtest_settings"]["sweep"]
+        # Spec of the shared data of the sweep in progress, which every task attaches to
+        self._shared_spec = None
+
+    @staticmethod
+    def _parameter_values(spec):
+        """A list of values, or a {start, stop, step} range (stop included)."""
+        if isinstance(spec, dict):
+            if all(isinstance(spec[key], int) for key in ("start", "stop", "step")):
+                return list(range(spec["start"], spec["stop"] + 1, spec["step"]))
+            values = np.arange(spec["start"], spec["stop"] + spec["step"] / 2, spec["step"])
+            return [round(float(value), 10) for value in values]
+        if isinstance(spec, (list, tuple)):
+            return list(spec)
+        return [spec]
+
+    def _parameter_sets(self):
+        """Cartesian product of the swept parameters, as a list of {name: value} overrides."""
+        ranges = self.settings.get("parameters") or {}
+        if not ranges:
+            raise ValueError("Parameter sweep enabled but `sweep.parameters` is empty.")
+        names = list(ranges)
+        values = [self._parameter_values(ranges[name]) for name in names]
+        return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+    @staticmethod
+    def _merge_indicators(indicator_configs):
+        """Drops duplicate indicator configs, keeping the first occurrence."""
+        merged, seen = [], set()
+        for config in indicator_configs:
+            key = tuple(sorted(config.items()))
+            if key not in seen:
+                seen.add(key)
+                merged.append(config)
+        return merged
+
+    def _candidates(self):
+        """Parameter overrides to evaluate: the full grid."""
+        return self._parameter_sets()
+
+    def _pair_configs(self):
+        return self.engine._build_pair_configs()
+
+    async def run(self):
+        strategy_config = self.config["strategy"]
+        strategy_class = load_strategy_class(strategy_config)
+        overrides = self._candidates()
+        setups = [strategy_class.sweep_setup({**strategy_config["parameters"], **override}) for override in overrides]
+        strategy_params = [params for params, _ in setups]
+        self.indicator_configs = self._merge_indicators(
+            required_indicator_configs(self.config, *strategy_params) + [config for _, configs in setups for config in configs]
+        )
+        single_configs, batches = IndicatorProcessor(self.indicator_configs).batch_groups()
+
+        for pair_config in self._pair_configs():
+            if self.engine._is_completed(pair_config, sweep=self.settings):
+                continue
+            compact = self.engine._compact_dtypes()
+            enriched_data = prepare_data_for_backtest(pair_config, copy.deepcopy(single_configs), create_indicator_cache(self.config), compact)
+            if enriched_data is None or enriched_data.empty:
+                continue
+            # Sorted as the data storage will be, so the batched matrices line up with its rows
+            enriched_data = enriched_data.sort_values(by="timestamp", kind="stable").reset_index(drop=True)
+            matrices = IndicatorProcessor.compute_batches(enriched_data, batches)
+            print(f"\n--- Sweeping {len(overrides)} parameter sets of {strategy_config['class_name']} on {pair_config['symbol']} ({pair_config['timeframe']}) ---")
+            table = self._run_sweep(enriched_data, pair_config, overrides, strategy_params, matrices)
+            self._save_table(pair_config, table, list(overrides[0]))
+            self.engine._mark_completed(pair_config, sweep=self.settings)
+
+    def _run_sweep(self, enriched_data, pair_config, overrides, strategy_params, matrices=()):
+        """Runs the search on a process pool whose workers share the enriched data and batched indicator matrices."""
+        workers = self.settings.get("workers") or os.cpu_count()
+
+        shared = SharedColumns.create(HistoricalDataStorage(enriched_data, compact=self.engine._compact_dtypes()).arrays, matrices)
+        self._shared_spec = shared.spec
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return self._search(executor, pair_config, overrides, strategy_params, shared.arrays)
+        finally:
+            self._shared_spec = None
+            shared.close()
+            shared.unlink()
+
+    def _evaluate(self, executor, pair_config, strategy_params, rows=None):
+        """
+        Backtests each parameter set on the candles in `rows` (a (start, stop) pair, or a
+        list with one pair per parameter set; all candles if None). Returns their metrics.
+        """
+        if rows is None or isinstance(rows, tuple):
+            rows = repeat(rows)
+        return list(executor.map(
+            _run_sweep_job, repeat(self.engine), repeat(pair_config), repeat(self._shared_spec), strategy_params, rows,
+            chunksize=self.settings.get("chunksize", 1),
+        ))
+
+    def _search(self, executor, pair_config, overrides, strategy_params, arrays):
+        """Evaluates every parameter set on the whole data. Returns the unranked results table."""
+        summaries = self._evaluate(executor, pair_config, strategy_params)
+        return pd.DataFrame([{**override, **summary} for override, summary in zip(overrides, summaries)])
+
+    def _rank(self, table):
+        rank_by = self.settings.get("rank_by", "net_profit")
+        if rank_by not in table.columns:
+            raise ValueError(f"Unknown sweep ranking metric: {rank_by}")
+        return table.sort_values(rank_by, ascending=False, kind="stable")
+
+    def _save_table(self, pair_config, table, parameter_names):
+        """Ranks the results table, writes it and prints its head."""
+        rank_by = self.settings.get("rank_by", "net_profit")
+        table = self._rank(table).reset_index(drop=True)
+        table.insert(0, "rank", table.index + 1)
+
+        create_store_manager(pair_config, BACKTEST_DATA_TYPE).save_dataframe(table, SWEEP_DATA_TYPE)
+
+        columns = ["rank", *parameter_names, "total_trades", "net_profit", "win_rate", "max_drawdown_pct"]
+        if rank_by not in columns:
+            columns.append(rank_by)
+        print(f"\n--- Top parameter sets for {pair_config['symbol']} ({pair_config['timeframe']}) by {rank_by} ---")
+        print(table[columns].head(self.settings.get("top", 10)).to_string(index=False))
+        print("--------------------------------------")
+
+
+def _slice_arrays(arrays, rows):
+    """Views of the columns restricted to `rows`, a (start, stop) pair, or all rows if None."""
+    if rows is None:
+        return arrays
+    start, stop = rows
+    return {column: values[start:stop] for column, values in arrays.items()}
+
+
+def _backtest_arrays(engine, pair_config, strategy_params, arrays, capital=None):
+    """Backtests one parameter set on the column `arrays` and returns the Portfolio (which holds no views of them)."""
+    strategy_config = {**engine.config["strategy"], "parameters": strategy_params}
+    data_storage = HistoricalDataStorage.from_arrays(arrays)
+    strategy = engine._create_strategy(data_storage, pair_config, strategy_config, capital)
+    asyncio.run(engine._execute_backtest(strategy))
+    return strategy.portfolio
+
+
+def _backtest_rows(engine, pair_config, spec, strategy_params, rows=None, capital=None):
+    """
+    Process-pool task: backtests one parameter set on the candles in `rows` of the shared
+    data described by `spec` and returns the Portfolio. The block is unmapped when the task ends.
+    """
+    with SharedColumns.attach(spec) as shared:
+        return _backtest_arrays(engine, pair_config, strategy_params, _slice_arrays(shared.arrays, rows), capital)
+
+
+def _run_sweep_job(engine, pair_config, spec, strategy_params, rows=None):
+    """Process-pool task: backtests one parameter set on the candles in `rows` and returns its summary metrics."""
+    summary = _backtest_rows(engine, pair_config, spec, strategy_params, rows).summary()
+    return {key: value for key, value in summary.items() if key not in NON_METRIC_KEYS}
+
@@ -0,0 +1,114 @@
+import numpy as np
+
+from module.engine.backtest_engine import BacktestEngine
+
+END_OF_DATA_REASON = "end_of_data"
+
+
+class VectorizedBacktestEngine(BacktestEngine):
+    """
+    Backtest engine for strategies that expose array versions of their signal methods.
+    Entry and exit signals are evaluated once over whole columns. The engine then jumps
+    from one signal to the next and resolves each exit with the stop-loss kernel
+    (numba-compiled when available), instead of calling `on_tick` for every candle.
+    Trades are booked through the strategy's Portfolio, so results keep the same
+    schema as the event-driven engine.
+    Strategies without vectorized signals fall back to the event-driven loop.
+    A backtest is a single pass over the signals, so runs are not checkpointed.
+    """
+    SUPPORTS_CHECKPOINTS = False
+
+    async def _execute_backtest(self, strategy):
+        signals = self._vectorized_signals(strategy)
+        if signals is None:
+            print(f"⚠️  {strategy.__class__.__name__} has no vectorized signals, using the event-driven loop.")
+            return await super()._execute_backtest(strategy)
+
+        self._simulate(strategy, signals)
+        return strategy.portfolio.summary()
+
+    @staticmethod
+    def _vectorized_signals(strategy):
+        """Evaluates the strategy's array signals, or returns None if any is unsupported."""
+        columns = strategy.data_storage.arrays
+        signals = {
+            "buy": strategy.buy_signal_vectorized(columns),
+            "sell": strategy.sell_signal_vectorized(columns),
+            "close_long": strategy.close_long_signal_vectorized(columns),
+            "close_short": strategy.close_short_signal_vectorized(columns),
+        }
+        if any(signal is None for signal in signals.values()):
+            return None
+        return signals
+
+    @staticmethod
+    def _signal_mask(prices):
+        """Bars where a signal price is set (mirrors the `if price:` checks of the event loop)."""
+        prices = np.asarray(prices, dtype=float)
+        return np.isfinite(prices) & (prices != 0)
+
+    def _simulate(self, strategy, signals):
+        """Walks from entry signal to exit, booking every trade on the strategy's portfolio."""
+        columns = strategy.data_storage.arrays
+        length = len(columns["close"])
+        has_buy = self._signal_mask(signals["buy"][0])
+        has_sell = self._signal_mask(signals["sell"][0])
+        entry_bars = np.flatnonzero(has_buy | has_sell)
+
+        bar = 0
+        while bar < length:
+            position = np.searchsorted(entry_bars, bar)
+            if position == len(entry_bars):
+                break
+            entry = int(entry_bars[position])
+            if not self._open_trade(strategy, entry, signals, has_buy, has_sell):
+                bar = entry + 1
+                continue
+            exit_bar = self._close_trade(strategy, entry, signals)
+            if exit_bar is None:
+                break
+            bar = exit_bar + 1
+
+    @staticmethod
+    def _open_trade(strategy, bar, signals, has_buy, has_sell):
+        """Opens a position at `bar`, trying the long side first like `_check_entry_signals`."""
+        dates = strategy.data_storage.arrays["datetime"]
+        for trade_type, mask, (prices, stops) in (
+            ("buy", has_buy, signals["buy"]),
+            ("sell", has_sell, signals["sell"]),
+        ):
+            if not mask[bar]:
+                continue
+            stop_loss = None if np.isnan(stops[bar]) else stops[bar]
+            stop_loss, risk_per_share = strategy._resolve_stop_loss(trade_type, prices[bar], stop_loss)
+            strategy.portfolio.open_position(
+                trade_type=trade_type,
+                price=prices[bar],
+                stop_loss=stop_loss,
+                risk_per_share=risk_per_share,
+                entry_date=dates[bar],
+                entry_step=bar + 1,
+            )
+            if strategy.portfolio.current_trade:
+                return True
+        return False
+
+    @staticmethod
+    def _close_trade(strategy, entry, signals):
+        """Finds and books the exit of the open trade. Returns the exit bar, or None at end of data."""
+        portfolio = strategy.portfolio
+        trade = portfolio.current_trade
+        columns = strategy.data_storage.arrays
+        exit_signals = {"buy": signals["close_long"], "sell": signals["close_short"]}
+
+        exit_bar, price, reason, final_stop = strategy._resolve_trade_exit(entry, trade, exit_signals)
+        if final_stop != trade["stop_loss"]:
+            portfolio.update_stop_loss(final_stop)
+
+        if exit_bar is None:
+            last = len(columns["close"]) - 1
+            portfolio.close_position(columns["close"][last], columns["datetime"][last], last, END_OF_DATA_REASON)
+            return None
+
+        portfolio.close_position(price, columns["datetime"][exit_bar], exit_bar + 1, reason)
+        return exit_bar
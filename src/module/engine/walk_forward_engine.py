@@ -0,0 +1,116 @@
+import pandas as pd
+
+from module.engine.sweep_engine import ParameterSweepEngine, _backtest_rows
+from module.storage_manager.factory import create_store_manager
+from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, SWEEP_DATA_TYPE
+from utils.indicator_processor import IndicatorProcessor
+
+
+class WalkForwardEngine(ParameterSweepEngine):
+    """
+    Walk-forward analysis over the sweep's parameter space.
+    Rolling windows of `in_sample_months` are each followed by an out-of-sample window
+    of `out_of_sample_months`; windows advance by the out-of-sample length. On every
+    in-sample window all candidates are backtested and the best by `sweep.rank_by` is
+    then run on the out-of-sample window that follows. The out-of-sample runs are
+    chained (each starts from the previous one's capital) into one trade list and
+    equity curve.
+    Indicators are computed once on the full series and every window reads views of
+    the same shared columns. The first window starts after the indicators' warm-up
+    (`Indicator.warmup`), so each window sees the values a run on the full history
+    would see.
+    """
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.walk_forward = self.settings.get("walk_forward") or {}
+        self.in_sample_months = self.walk_forward.get("in_sample_months", 12)
+        self.out_of_sample_months = self.walk_forward.get("out_of_sample_months", 1)
+        if self.in_sample_months < 1 or self.out_of_sample_months < 1:
+            raise ValueError("Walk-forward window lengths must be at least one month.")
+        self._chained_portfolio = None
+
+    def _pair_configs(self):
+        """One pair config per symbol and timeframe over `walk_forward.start`..`end`, if set."""
+        start, end = self.walk_forward.get("start"), self.walk_forward.get("end")
+        if not (start and end):
+            return super()._pair_configs()
+        backtest_settings = self.config["backtest_settings"]
+        return [
+            {"symbol": symbol, "timeframe": timeframe, "start": str(start), "end": str(end), "month": "walkforward"}
+            for symbol in backtest_settings["symbols"]
+            for timeframe in backtest_settings["timeframes"]
+        ]
+
+    def _windows(self, dates, first):
+        """(in-sample start, out-of-sample start, out-of-sample stop) row bounds of each window."""
+        in_sample = pd.DateOffset(months=self.in_sample_months)
+        out_of_sample = pd.DateOffset(months=self.out_of_sample_months)
+        windows = []
+        if first >= len(dates):
+            return windows
+
+        anchor = dates[first]
+        while True:
+            start = dates.searchsorted(anchor)
+            split = dates.searchsorted(anchor + in_sample)
+            stop = dates.searchsorted(anchor + in_sample + out_of_sample)
+            if split >= len(dates) or split <= start:
+                break
+            windows.append((int(start), int(split), int(stop)))
+            if stop >= len(dates):
+                break
+            anchor += out_of_sample
+        return windows
+
+    def _search(self, executor, pair_config, overrides, strategy_params, arrays):
+        """Optimizes every in-sample window, then chains the out-of-sample runs. Returns the windows table."""
+        rank_by = self.settings.get("rank_by", "net_profit")
+        dates = arrays["datetime"]
+        windows = self._windows(dates, IndicatorProcessor(self.indicator_configs).warmup)
+        self._chained_portfolio = self.engine._create_portfolio()
+        if not windows:
+            print(f"⚠️  Not enough data for a {self.in_sample_months}+{self.out_of_sample_months} month walk-forward window.")
+            return pd.DataFrame()
+
+        # In-sample runs of all windows are independent: submit them as one batch
+        print(f"🔎 {len(windows)} walk-forward windows x {len(overrides)} candidates")
+        in_sample_rows = [(start, split) for start, split, _ in windows for _ in overrides]
+        summaries = self._evaluate(executor, pair_config, strategy_params * len(windows), in_sample_rows)
+
+        rows = []
+        for number, (start, split, stop) in enumerate(windows, start=1):
+            scores = self._rank(pd.DataFrame(summaries[(number - 1) * len(overrides):number * len(overrides)]))
+            best = scores.index[0]
+
+            segment = executor.submit(
+                _backtest_rows, self.engine, pair_config, self._shared_spec, strategy_params[best], (split, stop),
+                self._chained_portfolio.capital,
+            ).result()
+            for trade in segment.trades:
+                trade["entry_step"] += split
+                trade["exit_step"] += split
+                trade["window"] = number
+            self._chained_portfolio.append_segment(segment)
+
+            rows.append({
+                "window": number,
+                "in_sample_start": dates[start],
+                "in_sample_end": dates[split - 1],
+                "out_of_sample_start": dates[split],
+                "out_of_sample_end": dates[stop - 1],
+                **overrides[best],
+                f"in_sample_{rank_by}": scores.loc[best, rank_by],
+                "out_of_sample_trades": len(segment.trades),
+                "out_of_sample_net_profit": segment.capital - segment.initial_capital,
+                "capital": self._chained_portfolio.capital,
+            })
+        return pd.DataFrame(rows)
+
+    def _save_table(self, pair_config, table, parameter_names):
+        """Writes the windows table, and the chained out-of-sample trades and summary."""
+        if table.empty:
+            return
+        create_store_manager(pair_config, BACKTEST_DATA_TYPE).save_dataframe(table, SWEEP_DATA_TYPE)
+        print(f"\n--- Walk-forward windows for {pair_config['symbol']} ({pair_config['timeframe']}) ---")
+        print(table.to_string(index=False))
+        self.engine._save_results(pair_config, self._chained_portfolio)
@@ -1,10 +1,26 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 
+from .context import IndicatorContext
+
+
+class IndicatorError(Exception):
+    """Raised when an indicator is asked for something it does not support."""
+
+
 class Indicator(ABC):
     """
     Abstract base class for all indicators.
+    Indicators with `streaming = True` can also be seeded from history and then advanced
+    one candle at a time (`seed` / `update`), which live trading uses instead of
+    recomputing the whole window on every candle.
+    Indicators with a single output column and a `batch_parameter` can compute many
+    instances that differ only in that parameter in one pass (`compute_batch`), which
+    parameter sweeps use instead of one column per parameter value.
     """
+    streaming = False
+    # Parameter that `compute_batch` vectorizes over; None if the indicator has no batched form
+    batch_parameter = None
     def __init__(self, **params):
         """
         Initializes the indicator with its parameters.
@@ -14,7 +30,47 @@ class Indicator(ABC):
         # Pop 'custom_name' from params so it's not passed to the calculation logic.
         self.output_name = self.params.pop('custom_name', None)
 
+    @property
+    def warmup(self) -> int:
+        """
+        Number of leading bars before the indicator's values are reliable.
+        Windows of data that start at least this many bars into the series can use
+        columns computed on the full series unchanged.
+        """
+        return 0
+
+    @property
+    def output_columns(self):
+        """
+        Names of the columns `compute` returns, known without computing them, or None if
+        they are not declared (the indicator is then always computed).
+        """
+        return None
+
     @abstractmethod
+    def compute(self, context) -> dict:
+        """
+        Computes the indicator on the dataset of an IndicatorContext, taking shared
+        intermediates (true range, ATR, rolling means, ...) from the context.
+
+        :param context: The IndicatorContext of the dataset being processed.
+        :return: The indicator's output columns, keyed by column name.
+        """
+        pass
+
+    @classmethod
+    def compute_batch(cls, context, indicators: list):
+        """
+        Computes several instances of this indicator, differing only in
+        `batch_parameter`, in one pass over the dataset of an IndicatorContext.
+        Only available when `batch_parameter` is set; raises IndicatorError otherwise.
+
+        :param context: The IndicatorContext of the dataset being processed.
+        :param indicators: The instances, in output column order.
+        :return: A (bars x instances) array of their output columns (`column_name`).
+        """
+        raise IndicatorError(f"{cls.__name__} does not support batched computation.")
+
     def apply(self, data_df: pd.DataFrame) -> pd.DataFrame:
         """
         Applies the indicator calculation to the DataFrame.
@@ -22,4 +78,27 @@ class Indicator(ABC):
         :param data_df: The input DataFrame with market data (OHLCV).
         :return: The DataFrame with the indicator data added.
         """
-        pass
+        for name, values in self.compute(IndicatorContext(data_df)).items():
+            data_df[name] = values
+        return data_df
+
+    def seed(self, context) -> dict:
+        """
+        Computes the indicator on the history of an IndicatorContext, like `compute`,
+        and keeps the state that `update` needs to extend it. Only available when
+        `streaming` is True; raises IndicatorError otherwise.
+
+        :param context: The IndicatorContext of the history.
+        :return: The indicator's output columns, keyed by column name.
+        """
+        raise IndicatorError(f"{self.__class__.__name__} does not support streaming updates.")
+
+    def update(self, candle: dict) -> dict:
+        """
+        Advances the indicator by one candle, after `seed`. Only available when
+        `streaming` is True; raises IndicatorError otherwise.
+
+        :param candle: The new candle's columns, including those added by the indicators before this one.
+        :return: The values of this indicator's columns for the candle.
+        """
+        raise IndicatorError(f"{self.__class__.__name__} does not support streaming updates.")
@@ -0,0 +1,88 @@
+"""
+Batched indicator kernels: one indicator over a vector of parameters in a single pass,
+returned as a (bars x params) array in column-major order, so each parameter's column
+is contiguous and can be used as a column array without copying.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def rolling_mean_batch(values, periods) -> np.ndarray:
+    """
+    Rolling means of `values` over each window length in `periods`, from one cumulative
+    sum (accumulated in extended precision, so the results agree with
+    `Series.rolling(period).mean()` to a few units in the last place). NaN until a
+    window is full.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    output = np.full((len(values), len(periods)), np.nan, order="F")
+    if np.isnan(values).any():
+        # A NaN would poison the cumulative sum from there on: use pandas per period
+        series = pd.Series(values)
+        for column, period in enumerate(periods):
+            output[:, column] = series.rolling(window=period).mean().to_numpy()
+        return output
+
+    # Summing deviations from the first value keeps the partial sums, and their rounding errors, small
+    offset = values[0] if len(values) else 0.0
+    cumulative = np.concatenate(([0], np.cumsum(values - offset, dtype=np.longdouble)))
+    for column, period in enumerate(periods):
+        if period <= len(values):
+            output[period - 1:, column] = offset + (cumulative[period:] - cumulative[:-period]) / period
+    return output
+
+
+def _ewm_loop(values, alphas, output):
+    """
+    EWM means (adjust=False) of `values` for each smoothing factor, with the exact
+    arithmetic of pandas' ewm kernel (so results are bit-identical) and its NaN rules.
+    """
+    for column in range(len(alphas)):
+        alpha = alphas[column]
+        old_weight_factor = 1.0 - alpha
+        old_weight = 1.0
+        new_weight = alpha
+        weighted = values[0]
+        output[0, column] = weighted
+        for row in range(1, len(values)):
+            current = values[row]
+            if weighted == weighted:
+                # Missing values still decay the weight of the average so far
+                old_weight *= old_weight_factor
+                if alpha == 0.5:
+                    # pandas renormalizes the new weight when com == 1 (span 3)
+                    new_weight = 1.0 - old_weight
+                if current == current:
+                    if weighted != current:
+                        weighted = (old_weight * weighted + new_weight * current) / (old_weight + new_weight)
+                    old_weight = 1.0
+            elif current == current:
+                weighted = current
+            output[row, column] = weighted
+
+
+if NUMBA_AVAILABLE:
+    _ewm_jit = njit(cache=True, nogil=True)(_ewm_loop)
+
+
+def ewm_batch(values, spans) -> np.ndarray:
+    """EWM means (`Series.ewm(span=span, adjust=False).mean()`) of `values` for each span in `spans`."""
+    values = np.asarray(values, dtype=np.float64)
+    output = np.empty((len(values), len(spans)), order="F")
+    if len(values) == 0:
+        return output
+    if NUMBA_AVAILABLE:
+        # Same smoothing factor as pandas: alpha = 1 / (1 + com), com = (span - 1) / 2
+        alphas = np.array([1.0 / (1.0 + (span - 1) / 2.0) for span in spans])
+        _ewm_jit(values, alphas, output)
+        return output
+    series = pd.Series(values)
+    for column, span in enumerate(spans):
+        output[:, column] = series.ewm(span=span, adjust=False).mean().to_numpy()
+    return output
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# Intermediate name -> function(context, *args) returning its value
+INTERMEDIATES = {}
+
+
+def intermediate(name):
+    """Registers a function computing a named intermediate (see IndicatorContext.intermediate)."""
+    def register(function):
+        INTERMEDIATES[name] = function
+        return function
+    return register
+
+
+class IndicatorContext:
+    """
+    Shared state of the indicators computed on one dataset.
+    Indicators ask for named intermediates (true range, ATR, rolling means, ...) with
+    `intermediate(name, *args)` instead of computing them themselves. Each distinct
+    (name, args) is computed once, after the intermediates it asks for in turn, so the
+    indicators and intermediates form a dependency graph evaluated lazily with memoized
+    nodes: two SuperTrends with the same period share one ATR, and an EMA of the close
+    with the same span as another is computed once.
+    Indicator outputs are collected with `add` and turned into a single frame by
+    `to_frame`; the input frame is neither copied per indicator nor modified.
+    """
+    def __init__(self, data_df: pd.DataFrame):
+        self.data_df = data_df
+        self.outputs = {}
+        self._intermediates = {}
+
+    def column(self, name: str) -> np.ndarray:
+        """A column of the dataset or an earlier indicator's output, as an array (not copied)."""
+        if name in self.outputs:
+            return np.asarray(self.outputs[name])
+        return self.data_df[name].to_numpy()
+
+    def intermediate(self, name: str, *args):
+        key = (name, *args)
+        if key not in self._intermediates:
+            self._intermediates[key] = INTERMEDIATES[name](self, *args)
+        return self._intermediates[key]
+
+    @property
+    def computed(self) -> list:
+        """The (name, *args) keys of the intermediates computed so far."""
+        return list(self._intermediates)
+
+    def add(self, columns: dict):
+        """Adds indicator output columns; later indicators can read them through `column`."""
+        self.outputs.update(columns)
+
+    def release(self):
+        """Drops the memoized intermediates; outputs already added are kept."""
+        self._intermediates.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The dataset with every output column. The dataset's columns are copied once;
+        the output arrays are used as they are, and the intermediates are released.
+        """
+        self.release()
+        columns = {
+            name: self.outputs[name] if name in self.outputs else self.data_df[name].array.copy()
+            for name in self.data_df.columns
+        }
+        columns.update((name, values) for name, values in self.outputs.items() if name not in columns)
+        seen = set()
+        for name, values in columns.items():
+            # Outputs taken from the same intermediate (e.g. two identical EMAs) must not share memory
+            if id(values) in seen:
+                columns[name] = values.copy()
+            seen.add(id(values))
+        return pd.DataFrame(columns, index=self.data_df.index, copy=False)
+
+
+@intermediate("true_range")
+def _true_range(context):
+    high, low, close = context.column("high"), context.column("low"), context.column("close")
+    previous_close = np.concatenate(([np.nan], close[:-1]))[:len(close)]
+    # fmax skips NaN like DataFrame.max(axis=1): the first bar's range is high - low
+    return np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+
+
+@intermediate("ewm")
+def _ewm(context, source, span):
+    """EWM mean (adjust=False) of a column, or of another intermediate when `source` is a (name, *args) tuple."""
+    values = context.intermediate(*source) if isinstance(source, tuple) else context.column(source)
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+@intermediate("atr")
+def _atr(context, period):
+    return context.intermediate("ewm", ("true_range",), period)
+
+
+@intermediate("rolling_mean")
+def _rolling_mean(context, source, period):
+    return pd.Series(context.column(source)).rolling(window=period).mean().to_numpy()
+
+
+@intermediate("hl2")
+def _hl2(context):
+    return (context.column("high") + context.column("low")) / 2
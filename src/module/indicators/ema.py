@@ -1,13 +1,49 @@
-import pandas as pd
+import numpy as np
 from .base import Indicator
+from .batch import ewm_batch
 
 class EMAIndicator(Indicator):
-    def apply(self, data_df: pd.DataFrame) -> pd.DataFrame:
+    streaming = True
+    batch_parameter = "period"
+
+    @property
+    def warmup(self) -> int:
+        # The weight left on the seed value drops below 0.3% after 3 spans
+        return 3 * self.params.get("period", 0)
+
+    @property
+    def column_name(self) -> str:
+        return self.output_name or f'EMA_{self.params.get("period")}'
+
+    @property
+    def output_columns(self) -> list:
+        return [self.column_name]
+
+    def compute(self, context) -> dict:
         period = self.params.get("period")
         if period is None:
             raise ValueError("EMA indicator requires a 'period' parameter.")
-        
+
         column = self.params.get("column", "close")
-        column_name = self.output_name or f'EMA_{period}'
-        data_df[column_name] = data_df[column].ewm(span=period, adjust=False).mean()
-        return data_df
+        return {self.column_name: context.intermediate("ewm", column, period)}
+
+    @classmethod
+    def compute_batch(cls, context, indicators: list) -> np.ndarray:
+        periods = [indicator.params.get("period") for indicator in indicators]
+        if None in periods:
+            raise ValueError("EMA indicator requires a 'period' parameter.")
+        # Instances of one batch share every parameter but the period
+        return ewm_batch(context.column(indicators[0].params.get("column", "close")), periods)
+
+    def seed(self, context) -> dict:
+        outputs = self.compute(context)
+        values = outputs[self.column_name]
+        self._alpha = 2 / (self.params["period"] + 1)
+        self._last = values[-1] if len(values) else np.nan
+        return outputs
+
+    def update(self, candle: dict) -> dict:
+        value = candle[self.params.get("column", "close")]
+        # Same recursion as ewm(adjust=False): the first value seeds the average
+        self._last = value if np.isnan(self._last) else self._last + self._alpha * (value - self._last)
+        return {self.column_name: self._last}
@@ -1,16 +1,61 @@
-import pandas as pd
+from collections import deque
+
+import numpy as np
 from .base import Indicator
+from .batch import rolling_mean_batch
+
+
+class _RollingMeanIndicator(Indicator):
+    """Rolling mean of one price column over `period` candles, with a running-sum streaming update."""
+    streaming = True
+    batch_parameter = "period"
+    source_column = None
+
+    @property
+    def warmup(self) -> int:
+        return self.params.get("period", 20)
+
+    @property
+    def column_name(self) -> str:
+        return self.output_name or f'ma{self.params.get("period", 20)}{self.source_column}'
+
+    @property
+    def output_columns(self) -> list:
+        return [self.column_name]
 
-class MAHighIndicator(Indicator):
-    def apply(self, data_df: pd.DataFrame) -> pd.DataFrame:
+    def compute(self, context) -> dict:
         period = self.params.get("period", 20)
-        column_name = self.output_name or f'ma{period}high'
-        data_df[column_name] = data_df['high'].rolling(window=period).mean()
-        return data_df
+        return {self.column_name: context.intermediate("rolling_mean", self.source_column, period)}
 
-class MALowIndicator(Indicator):
-    def apply(self, data_df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def compute_batch(cls, context, indicators: list) -> np.ndarray:
+        # Every period from one cumulative sum of the source column
+        return rolling_mean_batch(
+            context.column(cls.source_column), [indicator.params.get("period", 20) for indicator in indicators]
+        )
+
+    def seed(self, context) -> dict:
         period = self.params.get("period", 20)
-        column_name = self.output_name or f'ma{period}low'
-        data_df[column_name] = data_df['low'].rolling(window=period).mean()
-        return data_df
\ No newline at end of file
+        self._window = deque(context.column(self.source_column)[-period:].tolist(), maxlen=period)
+        self._sum = sum(self._window)
+        return self.compute(context)
+
+    def update(self, candle: dict) -> dict:
+        value = candle[self.source_column]
+        if len(self._window) == self._window.maxlen:
+            self._sum -= self._window[0]
+        self._window.append(value)
+        self._sum += value
+        if np.isnan(self._sum):
+            # A NaN poisons the running sum until it leaves the window
+            self._sum = sum(self._window)
+        mean = self._sum / len(self._window) if len(self._window) == self._window.maxlen else np.nan
+        return {self.column_name: mean}
+
+
+class MAHighIndicator(_RollingMeanIndicator):
+    source_column = "high"
+
+
+class MALowIndicator(_RollingMeanIndicator):
+    source_column = "low"
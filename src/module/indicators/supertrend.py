@@ -1,81 +1,195 @@
+import numpy as np
 import pandas as pd
 from .base import Indicator
+from .context import intermediate
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Direction codes of the kernel; 0 marks bars without a direction
+UPTREND = 1
+DOWNTREND = -1
+DIRECTION_LABELS = {UPTREND: "Buy", DOWNTREND: "Sell"}
+
+
+def _supertrend_step(previous_close, close, upper, lower,
+                     previous_upper_band, previous_lower_band, previous_supertrend, previous_direction):
+    """
+    One bar of SuperTrend, from the basic bands of the bar and the state of the previous
+    one. Returns (final_upper_band, final_lower_band, supertrend, direction).
+    NaN comparisons are False and max()/min() keep their first argument against NaN,
+    exactly like the Series-based loop this replaces.
+    """
+    if upper != upper or lower != lower:
+        # Missing bands (e.g. NaN prices): no value, and no bands to carry over
+        return np.nan, np.nan, np.nan, 0
+
+    if previous_close <= previous_lower_band:
+        final_lower_band = lower
+    else:
+        final_lower_band = previous_lower_band if previous_lower_band > lower else lower
+    if previous_close >= previous_upper_band:
+        final_upper_band = upper
+    else:
+        final_upper_band = previous_upper_band if previous_upper_band < upper else upper
+
+    if previous_supertrend == previous_upper_band: # Previous was downtrend
+        trend = UPTREND if close > final_upper_band else DOWNTREND
+    elif previous_supertrend == previous_lower_band: # Previous was uptrend
+        trend = DOWNTREND if close < final_lower_band else UPTREND
+    elif close > final_upper_band:
+        trend = UPTREND
+    elif close < final_lower_band:
+        trend = DOWNTREND
+    else:
+        trend = previous_direction
+
+    if trend == UPTREND:
+        return final_upper_band, final_lower_band, final_lower_band, trend
+    if trend == DOWNTREND:
+        return final_upper_band, final_lower_band, final_upper_band, trend
+    return final_upper_band, final_lower_band, np.nan, trend
+
+
+if NUMBA_AVAILABLE:
+    _supertrend_step = njit(cache=True, nogil=True)(_supertrend_step)
+
+
+def _supertrend_loop(close, basic_upper_band, basic_lower_band, supertrend, direction, final_bands):
+    """
+    Fills `supertrend` (NaN-initialized) and `direction` (zero-initialized) bar by bar,
+    and writes the final (upper, lower) bands of the last bar to `final_bands`.
+    Compiled by numba when available; otherwise run on Python lists, which index much
+    faster than NumPy arrays from plain Python.
+    """
+    final_upper_band = basic_upper_band[0]
+    final_lower_band = basic_lower_band[0]
+    for i in range(1, len(close)):
+        final_upper_band, final_lower_band, line, trend = _supertrend_step(
+            close[i - 1], close[i], basic_upper_band[i], basic_lower_band[i],
+            final_upper_band, final_lower_band, supertrend[i - 1], direction[i - 1],
+        )
+        supertrend[i] = line
+        direction[i] = trend
+    final_bands[0] = final_upper_band
+    final_bands[1] = final_lower_band
+
+
+if NUMBA_AVAILABLE:
+    _supertrend_jit = njit(cache=True, nogil=True)(_supertrend_loop)
+
+
+def _supertrend_with_bands(close, basic_upper_band, basic_lower_band):
+    """`supertrend` plus the final (upper, lower) bands of the last bar, which streaming continues from."""
+    length = len(close)
+    if length == 0:
+        return np.empty(0), np.empty(0, dtype=np.int8), (np.nan, np.nan)
+    if NUMBA_AVAILABLE:
+        line, direction, final_bands = np.full(length, np.nan), np.zeros(length, dtype=np.int8), np.empty(2)
+        _supertrend_jit(close, basic_upper_band, basic_lower_band, line, direction, final_bands)
+        return line, direction, (final_bands[0], final_bands[1])
+    line, direction, final_bands = [np.nan] * length, [0] * length, [np.nan, np.nan]
+    _supertrend_loop(close.tolist(), basic_upper_band.tolist(), basic_lower_band.tolist(), line, direction, final_bands)
+    return np.array(line), np.array(direction, dtype=np.int8), tuple(final_bands)
+
+
+def supertrend(close, basic_upper_band, basic_lower_band):
+    """SuperTrend line (NaN where undefined) and int8 direction (1 up, -1 down, 0 none) of float arrays."""
+    line, direction, _ = _supertrend_with_bands(close, basic_upper_band, basic_lower_band)
+    return line, direction
+
+
+def _direction_labels(direction):
+    """Categorical "Buy"/"Sell" (NaN without a direction) from int8 direction codes."""
+    return pd.Categorical.from_codes(
+        np.where(direction == UPTREND, 0, np.where(direction == DOWNTREND, 1, -1)),
+        categories=[DIRECTION_LABELS[UPTREND], DIRECTION_LABELS[DOWNTREND]],
+    )
+
+
+@intermediate("supertrend")
+def _supertrend_intermediate(context, period, multiplier):
+    """(line, direction, final bands of the last bar) over the shared ATR and hl2 intermediates."""
+    atr = context.intermediate("atr", period)
+    hl2 = context.intermediate("hl2")
+    # Calculate Basic Upper and Lower Bands
+    basic_upper_band = hl2 + (multiplier * atr)
+    basic_lower_band = hl2 - (multiplier * atr)
+    return _supertrend_with_bands(np.asarray(context.column("close"), dtype=np.float64), basic_upper_band, basic_lower_band)
+
 
 class SuperTrendIndicator(Indicator):
-    def apply(self, data_df: pd.DataFrame) -> pd.DataFrame:
-        period = self.params.get("period", 10)
+    streaming = True
+
+    @property
+    def warmup(self) -> int:
+        # The ATR is an EMA of the true range, see EMAIndicator.warmup
+        return 3 * self.params.get("period", 10)
+
+    @property
+    def output_columns(self) -> list:
+        column_name = self.output_name or 'superTrend'
+        return [column_name, f'{column_name}Direction']
+
+    def compute(self, context) -> dict:
+        line, direction, _ = context.intermediate(
+            "supertrend", self.params.get("period", 10), self.params.get("multiplier", 3)
+        )
+        column_name = self.output_name or 'superTrend'
+        return {
+            column_name: line,
+            # Categorical "Buy"/"Sell" (NaN without a direction): int8 codes instead of Python strings
+            f'{column_name}Direction': _direction_labels(direction),
+        }
+
+    def seed(self, context) -> dict:
+        period, multiplier = self.params.get("period", 10), self.params.get("multiplier", 3)
+        outputs = self.compute(context)
+        line, direction, (self._upper_band, self._lower_band) = context.intermediate("supertrend", period, multiplier)
+        closes = context.column("close")
+        if len(closes):
+            self._atr = context.intermediate("atr", period)[-1]
+            self._close = closes[-1]
+            self._supertrend = line[-1]
+            self._direction = int(direction[-1])
+        else:
+            self._atr = self._close = self._supertrend = np.nan
+            self._direction = 0
+        self._bars = len(closes)
+        return outputs
+
+    def update(self, candle: dict) -> dict:
         multiplier = self.params.get("multiplier", 3)
+        alpha = 2 / (self.params.get("period", 10) + 1)
+        high, low, close = candle['high'], candle['low'], candle['close']
+
+        # True range skips the previous close when there is none, like max(axis=1)
+        ranges = [value for value in (high - low, abs(high - self._close), abs(low - self._close)) if not np.isnan(value)]
+        true_range = max(ranges) if ranges else np.nan
+        if np.isnan(self._atr):
+            self._atr = true_range
+        elif not np.isnan(true_range):
+            self._atr += alpha * (true_range - self._atr)
+        basic_upper_band = (high + low) / 2 + multiplier * self._atr
+        basic_lower_band = (high + low) / 2 - multiplier * self._atr
+
+        if self._bars == 0:
+            # First bar: bands only, no direction yet
+            self._upper_band, self._lower_band = basic_upper_band, basic_lower_band
+            self._supertrend, self._direction = np.nan, 0
+        else:
+            self._upper_band, self._lower_band, self._supertrend, self._direction = _supertrend_step(
+                self._close, close, basic_upper_band, basic_lower_band,
+                self._upper_band, self._lower_band, self._supertrend, self._direction,
+            )
+        self._close = close
+        self._bars += 1
 
-        df = data_df.copy()
-        
-        # Calculate Average True Range (ATR)
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift())
-        low_close = abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        atr = true_range.ewm(span=period, adjust=False).mean()
-
-        # Calculate Basic Upper and Lower Bands
-        basic_upper_band = ((df['high'] + df['low']) / 2) + (multiplier * atr)
-        basic_lower_band = ((df['high'] + df['low']) / 2) - (multiplier * atr)
-
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int) # 1 for uptrend, -1 for downtrend
-
-        # Initialize final bands and SuperTrend values
-        final_upper_band = pd.Series(index=df.index, dtype=float)
-        final_lower_band = pd.Series(index=df.index, dtype=float)
-
-        # Iterate to calculate SuperTrend
-        for i in range(len(df)):
-            if pd.isna(basic_upper_band.iloc[i]) or pd.isna(basic_lower_band.iloc[i]):
-                supertrend.iloc[i] = pd.NA
-                direction.iloc[i] = pd.NA
-                final_upper_band.iloc[i] = pd.NA
-                final_lower_band.iloc[i] = pd.NA
-                continue
-
-            if i == 0:
-                final_upper_band.iloc[i] = basic_upper_band.iloc[i]
-                final_lower_band.iloc[i] = basic_lower_band.iloc[i]
-                direction.iloc[i] = pd.NA
-                supertrend.iloc[i] = pd.NA
-            else:
-                if df['close'].iloc[i-1] <= final_lower_band.iloc[i-1]:
-                    final_lower_band.iloc[i] = basic_lower_band.iloc[i]
-                else:
-                    final_lower_band.iloc[i] = max(basic_lower_band.iloc[i], final_lower_band.iloc[i-1])
-
-                if df['close'].iloc[i-1] >= final_upper_band.iloc[i-1]:
-                    final_upper_band.iloc[i] = basic_upper_band.iloc[i]
-                else:
-                    final_upper_band.iloc[i] = min(basic_upper_band.iloc[i], final_upper_band.iloc[i-1])
-
-                if supertrend.iloc[i-1] == final_upper_band.iloc[i-1]: # Previous was downtrend
-                    if df['close'].iloc[i] > final_upper_band.iloc[i]:
-                        direction.iloc[i] = 1 # Change to uptrend
-                    else:
-                        direction.iloc[i] = -1 # Remain downtrend
-                elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1]: # Previous was uptrend
-                    if df['close'].iloc[i] < final_lower_band.iloc[i]:
-                        direction.iloc[i] = -1 # Change to downtrend
-                    else:
-                        direction.iloc[i] = 1 # Remain uptrend
-                else:
-                    if df['close'].iloc[i] > final_upper_band.iloc[i]:
-                        direction.iloc[i] = 1
-                    elif df['close'].iloc[i] < final_lower_band.iloc[i]:
-                        direction.iloc[i] = -1
-                    else:
-                        direction.iloc[i] = direction.iloc[i-1]
-
-                if direction.iloc[i] == 1: # Uptrend
-                    supertrend.iloc[i] = final_lower_band.iloc[i]
-                elif direction.iloc[i] == -1: # Downtrend
-                    supertrend.iloc[i] = final_upper_band.iloc[i]
-
-        df['superTrend'] = supertrend
-        df['superTrendDirection'] = direction.apply(lambda x: 'Buy' if x == 1 else ('Sell' if x == -1 else pd.NA))
-
-        return df
+        column_name = self.output_name or 'superTrend'
+        return {
+            column_name: self._supertrend,
+            f'{column_name}Direction': DIRECTION_LABELS.get(self._direction, np.nan),
+        }
@@ -0,0 +1,105 @@
+"""
+Monte Carlo robustness analysis of a backtest's trade sequence.
+
+The closed trades' net P&L is resampled into many alternative trade sequences, either
+bootstrapped (drawn with replacement) or shuffled (the same trades in another order).
+Every sequence is a row of a 2D array, and the per-path statistics Portfolio computes
+for the single historical path (final capital, max drawdown as in `_calculate_drawdown`,
+longest win/loss streaks as in `_calculate_consecutive_trades`) are computed for all
+rows at once with NumPy.
+"""
+import numpy as np
+
+METHODS = ("bootstrap", "shuffle")
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Upper bound on the number of simulated trades held in memory at once
+BATCH_ELEMENTS = 2_000_000
+
+
+def _longest_runs(flags: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True in each row."""
+    positions = np.arange(flags.shape[1])
+    last_break = np.maximum.accumulate(np.where(flags, -1, positions), axis=1)
+    return (positions - last_break).max(axis=1)
+
+
+def path_statistics(profits: np.ndarray, initial_capital: float) -> dict:
+    """
+    Per-path statistics of a (paths x trades) array of trade net P&L.
+    Same definitions as Portfolio's single-path statistics.
+    """
+    capital = initial_capital + np.cumsum(profits, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(capital, axis=1), initial_capital)
+    max_drawdown = (peaks - capital).max(axis=1)
+    final_peak = peaks[:, -1]
+    return {
+        "final_capital": capital[:, -1],
+        "max_drawdown": max_drawdown,
+        "max_drawdown_pct": np.where(final_peak > 0, max_drawdown / final_peak * 100, 0.0),
+        "max_consecutive_wins": _longest_runs(profits > 0),
+        "max_consecutive_losses": _longest_runs(profits < 0),
+    }
+
+
+def _distribution(values: np.ndarray) -> dict:
+    stats = {"mean": float(values.mean()), "std": float(values.std()), "min": float(values.min()), "max": float(values.max())}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{percentile}"] = float(value)
+    return stats
+
+
+def run_monte_carlo(trades, initial_capital, simulations=10000, method="bootstrap", seed=None):
+    """
+    Resamples `trades` (Portfolio.trades) `simulations` times.
+
+    :param method: "bootstrap" draws each path's trades with replacement; "shuffle" keeps
+                   the same trades and only permutes their order (final capital is then
+                   fixed and only the path-dependent statistics vary).
+    :return: dict with the distribution (mean, std, min, max, percentiles) of each path
+             statistic, the probability of ending below the initial capital, and the
+             statistics of the historical sequence for reference. None without trades.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+    profits = np.array([trade["net_profit_loss"] for trade in trades], dtype=float)
+    if len(profits) == 0:
+        return None
+
+    rng = np.random.default_rng(seed)
+    batch_size = max(1, BATCH_ELEMENTS // len(profits))
+    batches = []
+    for start in range(0, simulations, batch_size):
+        paths = min(batch_size, simulations - start)
+        if method == "bootstrap":
+            sample = profits[rng.integers(0, len(profits), size=(paths, len(profits)))]
+        else:
+            sample = rng.permuted(np.broadcast_to(profits, (paths, len(profits))), axis=1)
+        batches.append(path_statistics(sample, initial_capital))
+    statistics = {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+    historical = path_statistics(profits[np.newaxis, :], initial_capital)
+
+    return {
+        "method": method,
+        "simulations": simulations,
+        "trades": len(profits),
+        "seed": seed,
+        "probability_of_loss": float((statistics["final_capital"] < initial_capital).mean()),
+        "historical": {name: float(values[0]) for name, values in historical.items()},
+        **{name: _distribution(values) for name, values in statistics.items()},
+    }
+
+
+def print_monte_carlo(result):
+    """Prints the 5th/50th/95th percentiles of the Monte Carlo distributions."""
+    print(f"\n🎲 MONTE CARLO ({result['simulations']:,} {result['method']} paths of {result['trades']} trades):")
+    print(f"   {'':24}{'p5':>14}{'p50':>14}{'p95':>14}")
+    for name, label, fmt in (
+        ("final_capital", "Final Capital", "${:,.2f}"),
+        ("max_drawdown", "Max Drawdown", "${:,.2f}"),
+        ("max_drawdown_pct", "Max Drawdown %", "{:.2f}%"),
+        ("max_consecutive_losses", "Max Consecutive Losses", "{:.0f}"),
+    ):
+        values = [fmt.format(result[name][f"p{percentile}"]) for percentile in (5, 50, 95)]
+        print(f"   {label:24}{values[0]:>14}{values[1]:>14}{values[2]:>14}")
+    print(f"   Probability of Loss:  {result['probability_of_loss'] * 100:.1f}%")
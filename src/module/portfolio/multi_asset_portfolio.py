@@ -0,0 +1,90 @@
+from module.portfolio.portfolio import Portfolio
+
+
+class SymbolPortfolio(Portfolio):
+    """
+    One symbol's view of a MultiAssetPortfolio, handed to that symbol's strategy.
+    It has its own position (`current_trade`) and trade list, while `capital` and
+    `total_fees_paid` read and write the shared portfolio, so position sizing of every
+    symbol draws on the same cash. Closed trades are also recorded on the shared
+    portfolio, tagged with the symbol.
+    """
+    def __init__(self, parent, symbol):
+        # Set before Portfolio.__init__, whose writes to `capital` and `total_fees_paid` go through the proxies below
+        self.parent = parent
+        self.symbol = symbol
+        self._fees_paid = 0
+        # The shared portfolio's current capital is written back unchanged, not reset
+        super().__init__(capital=parent.capital, risk_pct=parent.risk_pct, fee_pct=parent.fee_pct * 100, logger=parent.logger)
+        # Positions are sized on the shared portfolio's starting capital
+        self.initial_capital = parent.initial_capital
+        self.risk_per_trade = parent.risk_per_trade
+
+    @property
+    def capital(self):
+        return self.parent.capital
+
+    @capital.setter
+    def capital(self, value):
+        self.parent.capital = value
+
+    @property
+    def total_fees_paid(self):
+        return self._fees_paid
+
+    @total_fees_paid.setter
+    def total_fees_paid(self, value):
+        self.parent.total_fees_paid += value - self._fees_paid
+        self._fees_paid = value
+
+    def close_position(self, price, exit_date, exit_step, action="exit"):
+        trades_before = len(self.trades)
+        super().close_position(price, exit_date, exit_step, action)
+        if len(self.trades) > trades_before:
+            trade = self.trades[-1]
+            trade["symbol"] = self.symbol
+            self.parent.trades.append(trade)
+
+    def net_profit(self):
+        return sum(trade["net_profit_loss"] for trade in self.trades)
+
+
+class MultiAssetPortfolio(Portfolio):
+    """
+    Portfolio shared by several symbols: one cash balance, one position per symbol.
+    Strategies trade through `view(symbol)`; this object holds the combined trade list
+    (in closing order) and capital, so `summary()` reports the portfolio as a whole,
+    with a per-symbol breakdown under "symbols".
+    """
+    def __init__(self, capital=100000, risk_pct=5, fee_pct=0.1, logger=None):
+        super().__init__(capital=capital, risk_pct=risk_pct, fee_pct=fee_pct, logger=logger)
+        self.views = {}
+
+    def view(self, symbol) -> SymbolPortfolio:
+        if symbol not in self.views:
+            self.views[symbol] = SymbolPortfolio(self, symbol)
+        return self.views[symbol]
+
+    @property
+    def open_positions(self) -> dict:
+        return {symbol: view.current_trade for symbol, view in self.views.items() if view.current_trade}
+
+    def summary(self):
+        summary = super().summary()
+        summary["has_open_trade"] = bool(self.open_positions)
+        summary["open_trade_info"] = self.open_positions or None
+        summary["symbols"] = {
+            symbol: {
+                "total_trades": len(view.trades),
+                "net_profit": view.net_profit(),
+                "total_fees_paid": view.total_fees_paid,
+            }
+            for symbol, view in self.views.items()
+        }
+        return summary
+
+    def print_summary(self):
+        super().print_summary()
+        print("\n📦 PER-SYMBOL BREAKDOWN:")
+        for symbol, stats in self.summary()["symbols"].items():
+            print(f"   {symbol:<12} Trades: {stats['total_trades']:<6} Net P&L: ${stats['net_profit']:,.2f}")
@@ -40,6 +40,9 @@ class Portfolio:
         if self.current_trade:
             return  # Already in a trade
 
+        # Prices may be NumPy scalars of the column arrays: book them as floats
+        price, risk_per_share = float(price), float(risk_per_share)
+        stop_loss = None if stop_loss is None else float(stop_loss)
         qty = self._calculate_position_size(risk_per_share, price)
         if qty == 0:
             if self.logger:
@@ -81,6 +84,7 @@ class Portfolio:
         if not self.current_trade:
             return
 
+        price = float(price)
         qty = self.current_trade["quantity"]
         entry_price = self.current_trade["entry_price"]
 
@@ -147,11 +151,35 @@ class Portfolio:
                 if self.logger:
                     self.logger.error(f"Error saving trade record: {e}")
 
+    def append_segment(self, segment):
+        """
+        Chains a portfolio that was started from this one's capital (e.g. the next
+        walk-forward window): takes over its closed trades, fees and final capital.
+        """
+        self.trades.extend(segment.trades)
+        self.total_fees_paid += segment.total_fees_paid
+        self.capital = segment.capital
+
+    def state(self):
+        """The mutable state of the portfolio, for checkpoints (see `restore_state`)."""
+        return {
+            "capital": self.capital,
+            "total_fees_paid": self.total_fees_paid,
+            "current_trade": dict(self.current_trade) if self.current_trade else None,
+            "trades": list(self.trades),
+        }
+
+    def restore_state(self, state):
+        self.capital = state["capital"]
+        self.total_fees_paid = state["total_fees_paid"]
+        self.current_trade = state["current_trade"]
+        self.trades = list(state["trades"])
+
     def update_stop_loss(self, new_stop_loss):
         """Update the stop loss for the current trade."""
         if self.current_trade:
             old_stop_loss = self.current_trade["stop_loss"]
-            self.current_trade["stop_loss"] = new_stop_loss
+            self.current_trade["stop_loss"] = float(new_stop_loss)
             if self.logger:
                 self.logger.info(f"Updated stop loss from {old_stop_loss} to {new_stop_loss}")
 
@@ -0,0 +1,76 @@
+import json
+import os
+from pathlib import Path
+
+from .storage_manager_base import BACKTEST_DATA_TYPE, BASE_PATH
+
+
+def _merge(intervals) -> list:
+    """Sorted, non-overlapping [start_ms, end_ms] intervals; adjacent ones are joined."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class CoverageIndex:
+    """
+    Which time ranges of a symbol/timeframe are already stored, per dataset (the store
+    manager's file name). Kept as `data/<data type>/coverage/<symbol>_<timeframe>.json`:
+    dataset -> sorted [start_ms, end_ms] intervals, both ends inclusive.
+    Intervals are the ranges the exchange answered for, candles or not, so a closed
+    period without candles (e.g. before a listing, or an exchange outage) is not
+    requested again. A fetch that gives up after repeated errors covers only what was
+    answered before them; the rest is requested again on the next update.
+    """
+    def __init__(self, symbol: str, timeframe: str, data_type: str = BACKTEST_DATA_TYPE):
+        self.path = Path(BASE_PATH) / data_type / "coverage" / f"{symbol.replace('/', '').lower()}_{timeframe}.json"
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, index: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temporary, self.path)
+
+    def intervals(self, dataset: str) -> list:
+        return self._load().get(dataset, [])
+
+    def add(self, dataset: str, start_ms: int, end_ms: int):
+        """Records [start_ms, end_ms] of `dataset` as stored."""
+        # Re-read right before writing: other datasets of the pair may have been updated meanwhile
+        index = self._load()
+        index[dataset] = _merge(index.get(dataset, []) + [[int(start_ms), int(end_ms)]])
+        self._save(index)
+
+    def reset(self, dataset: str):
+        """Forgets what is stored for `dataset` (e.g. before replacing its data)."""
+        index = self._load()
+        if index.pop(dataset, None) is not None:
+            self._save(index)
+
+    def gaps(self, dataset: str, start_ms: int, end_ms: int) -> list:
+        """The (start_ms, end_ms) parts of [start_ms, end_ms] that `dataset` does not cover yet."""
+        gaps = []
+        cursor = start_ms
+        for covered_start, covered_end in self.intervals(dataset):
+            if covered_end < cursor:
+                continue
+            if covered_start > end_ms:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - 1))
+            cursor = max(cursor, covered_end + 1)
+        if cursor <= end_ms:
+            gaps.append((cursor, end_ms))
+        return gaps
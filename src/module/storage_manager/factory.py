@@ -0,0 +1,36 @@
+from .file_store_manager import FileStoreManager
+from .memmap_store_manager import MemmapStoreManager
+from .parquet_store_manager import ParquetStoreManager
+from .sqlite_store_manager import SqliteStoreManager
+from .storage_manager_base import BACKTEST_DATA_TYPE
+
+STORE_MANAGER_MAP = {
+    "csv": FileStoreManager,
+    "parquet": ParquetStoreManager,
+    "mmap": MemmapStoreManager,
+    "sqlite": SqliteStoreManager,
+}
+
+# Store manager class used by create_store_manager in this process (see configure_storage)
+_store_manager_class = FileStoreManager
+
+
+def configure_storage(config):
+    """
+    Selects the storage backend of `storage.backend` ("csv" by default) for the store
+    managers created from now on in this process.
+    """
+    global _store_manager_class
+    name = (config.get("storage") or {}).get("backend", "csv")
+    store_manager_class = STORE_MANAGER_MAP.get(name.lower())
+    if not store_manager_class:
+        raise ValueError(f"Storage backend '{name}' not recognized.")
+    _store_manager_class = store_manager_class
+
+
+def create_store_manager(pair_config, data_type: str = BACKTEST_DATA_TYPE):
+    """
+    Factory function to create the store manager of the configured backend for one
+    pair and data type.
+    """
+    return _store_manager_class(pair_config, data_type)
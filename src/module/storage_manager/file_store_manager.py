@@ -2,6 +2,8 @@ import pandas as pd
 from pathlib import Path
 import json
 
+from module.data_manager.candle import DATETIME_COLUMNS
+from module.data_manager.compact import compact_frame
 from .storage_manager_base import DataStoreManagerBase
 
 class FileStoreManager(DataStoreManagerBase):
@@ -15,12 +17,14 @@ class FileStoreManager(DataStoreManagerBase):
         self.processed_data_dir = self.base_path / "processed"
         self.result_dir = self.base_path / "result"
         self.summary_dir = self.base_path / "summary"
+        self.sweep_dir = self.base_path / "sweep"
 
         # Ensure directories exist
         self.raw_data_dir.mkdir(parents=True, exist_ok=True)
         self.processed_data_dir.mkdir(parents=True, exist_ok=True)
         self.result_dir.mkdir(parents=True, exist_ok=True)
         self.summary_dir.mkdir(parents=True, exist_ok=True)
+        self.sweep_dir.mkdir(parents=True, exist_ok=True)
 
     def get_raw_filepath(self, file_extension) -> Path:
         return self.raw_data_dir / f"{self.filename}.{file_extension}"
@@ -34,6 +38,12 @@ class FileStoreManager(DataStoreManagerBase):
     def get_summary_filepath(self, file_extension) -> Path:
         return self.summary_dir / f"{self.filename}.{file_extension}"
 
+    def get_monte_carlo_filepath(self, file_extension) -> Path:
+        return self.summary_dir / f"{self.filename}_monte_carlo.{file_extension}"
+
+    def get_sweep_filepath(self, file_extension) -> Path:
+        return self.sweep_dir / f"{self.filename}.{file_extension}"
+
     def _get_filepath(self, type: str) -> Path:
         """
         Helper method to get the file path based on type.
@@ -46,6 +56,10 @@ class FileStoreManager(DataStoreManagerBase):
             return self.get_result_filepath("csv")
         elif type == "summary":
             return self.get_summary_filepath("json")
+        elif type == "monte_carlo":
+            return self.get_monte_carlo_filepath("json")
+        elif type == "sweep":
+            return self.get_sweep_filepath("csv")
         else:
             raise ValueError(f"Unknown data type: {type}")
 
@@ -56,9 +70,16 @@ class FileStoreManager(DataStoreManagerBase):
         else:
             df.to_csv(self._get_filepath(type), index=False)
 
-    def load_dataframe(self, type: str) -> pd.DataFrame:
+    def load_dataframe(self, type: str, compact: bool = False, columns=None) -> pd.DataFrame:
         if self._get_filepath(type).exists():
-            return pd.read_csv(self._get_filepath(type))
+            stored = pd.read_csv(self._get_filepath(type), nrows=0).columns
+            # Datetime text columns are the bulk of a CSV frame: skip them when timestamps can replace them
+            skipped = DATETIME_COLUMNS if compact and "timestamp" in stored else ()
+            df = pd.read_csv(
+                self._get_filepath(type),
+                usecols=lambda column: column not in skipped and (columns is None or column in columns),
+            )
+            return compact_frame(df) if compact else df
         return pd.DataFrame() # Return empty DataFrame if file not found
 
     def save_json(self, data: dict, type: str):
@@ -0,0 +1,178 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from module.data_manager.candle import DATETIME_COLUMNS
+from module.data_manager.compact import compact_frame
+from .file_store_manager import FileStoreManager
+from .storage_manager_base import PROCESSED_DATA_TYPE, RAW_DATA_TYPE
+
+# Bump when the layout of the column files or the header changes
+COLUMN_STORE_VERSION = 1
+HEADER_FILE = "header.json"
+# Market data types kept as column files; results and sweeps are small tables of strings, kept as CSV
+COLUMN_STORE_TYPES = (RAW_DATA_TYPE, PROCESSED_DATA_TYPE)
+# Label columns (categoricals, strings) are stored as codes of this dtype, labels in the header
+LABEL_CODE_DTYPE = np.int16
+
+
+def _encode_column(values: pd.Series) -> tuple:
+    """(fixed-width array, schema entry) of a column."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        utc = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        return utc.to_numpy().view(np.int64), {"dtype": str(utc.dtype), "tz": str(dtype.tz)}
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == object or pd.api.types.is_string_dtype(dtype):
+        categorical = values.array if isinstance(dtype, pd.CategoricalDtype) else pd.Categorical(values)
+        codes = np.asarray(categorical.codes, dtype=LABEL_CODE_DTYPE)
+        return codes, {"dtype": np.dtype(LABEL_CODE_DTYPE).name, "labels": [str(label) for label in categorical.categories]}
+    array = values.to_numpy()
+    if array.dtype == object:
+        raise ValueError(f"Column '{values.name}' of dtype {dtype} cannot be stored as a fixed-width column.")
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.view(np.int64), {"dtype": str(array.dtype)}
+    return array, {"dtype": array.dtype.str}
+
+
+def _decode_column(array: np.ndarray, entry: dict):
+    """Column values over the mapped `array`: views for numbers and naive datetimes."""
+    if "labels" in entry:
+        return pd.Categorical.from_codes(array, categories=entry["labels"])
+    if "tz" in entry:
+        return pd.DatetimeIndex(array.view(entry["dtype"])).tz_localize("UTC").tz_convert(entry["tz"])
+    if entry["dtype"].startswith("datetime64"):
+        return array.view(entry["dtype"])
+    return array
+
+
+class MemmapStoreManager(FileStoreManager):
+    """
+    FileStoreManager keeping raw and processed market data as memory-mapped column
+    files (results, sweeps and JSON documents are stored like in FileStoreManager).
+    A dataset is a directory with one fixed-width binary file per column and a small
+    `header.json` holding the schema (name, dtype, labels of label columns) and the
+    row count. Loading maps the files read-only instead of decoding them, so columns
+    are zero-copy views, and the processes reading the same symbol share its pages
+    through the page cache.
+    Appending writes the new rows at the end of each column file and then the new
+    row count, so a live feed grows the dataset in place and readers only ever see
+    whole rows.
+    """
+    def _get_filepath(self, type: str) -> Path:
+        filepath = super()._get_filepath(type)
+        return filepath.with_suffix(".columns") if type in COLUMN_STORE_TYPES else filepath
+
+    @staticmethod
+    def _read_header(store_path: Path) -> dict:
+        with open(store_path / HEADER_FILE, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_header(store_path: Path, header: dict):
+        # Written aside and renamed: readers see the old or the new row count, never a partial header
+        temporary = store_path / f"{HEADER_FILE}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(header, f, indent=4)
+        os.replace(temporary, store_path / HEADER_FILE)
+
+    def save_dataframe(self, df: pd.DataFrame, type: str, append: bool = False):
+        if type not in COLUMN_STORE_TYPES:
+            return super().save_dataframe(df, type, append)
+        store_path = self._get_filepath(type)
+        if append and (store_path / HEADER_FILE).exists():
+            return self._append(store_path, df)
+
+        # Written to a new directory swapped in once complete: processes still mapping the
+        # old files keep valid views of them
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = store_path.with_suffix(f".{os.getpid()}.tmp")
+        shutil.rmtree(temporary, ignore_errors=True)
+        temporary.mkdir()
+        columns = []
+        for index, column in enumerate(df.columns):
+            array, entry = _encode_column(df[column])
+            entry = {"name": str(column), "file": f"{index}.bin", **entry}
+            np.ascontiguousarray(array).tofile(temporary / entry["file"])
+            columns.append(entry)
+        self._write_header(temporary, {"version": COLUMN_STORE_VERSION, "rows": len(df), "columns": columns})
+
+        previous = store_path.with_suffix(f".{os.getpid()}.old")
+        if store_path.exists():
+            os.replace(store_path, previous)
+        os.replace(temporary, store_path)
+        shutil.rmtree(previous, ignore_errors=True)
+
+    def _append(self, store_path: Path, df: pd.DataFrame):
+        """Writes the rows of `df` after the stored ones, then publishes the new row count."""
+        header = self._read_header(store_path)
+        stored = [entry["name"] for entry in header["columns"]]
+        if sorted(stored) != sorted(str(column) for column in df.columns):
+            raise ValueError(f"Cannot append columns {list(df.columns)} to {store_path} with columns {stored}.")
+
+        for entry in header["columns"]:
+            values = df[entry["name"]]
+            if "labels" in entry:
+                # Labels not seen yet get the next codes
+                labels = np.asarray(values, dtype=object)
+                entry["labels"] += [str(label) for label in pd.unique(labels[pd.notna(labels)]) if str(label) not in entry["labels"]]
+                array = pd.Categorical(labels, categories=entry["labels"]).codes.astype(LABEL_CODE_DTYPE)
+            elif entry["dtype"].startswith("datetime64"):
+                # Same unit (and UTC for tz-aware columns) as the stored values
+                times = pd.to_datetime(values, utc="tz" in entry)
+                times = times.dt.tz_localize(None) if "tz" in entry else times
+                array = times.to_numpy().astype(entry["dtype"]).view(np.int64)
+            else:
+                array = np.ascontiguousarray(values.to_numpy(), dtype=entry["dtype"])
+            with open(store_path / entry["file"], "r+b") as f:
+                # Past any bytes left by an interrupted append: they were never counted
+                f.seek(header["rows"] * array.itemsize)
+                f.write(array.tobytes())
+                f.truncate()
+        header["rows"] += len(df)
+        self._write_header(store_path, header)
+
+    def load_columns(self, type: str, columns=None) -> dict:
+        """
+        Column name -> values of the dataset, mapped read-only from its files (only the
+        given columns if any). Numeric and naive datetime columns are zero-copy views.
+        """
+        store_path = self._get_filepath(type)
+        header = self._read_header(store_path)
+        rows = header["rows"]
+        loaded = {}
+        for entry in header["columns"]:
+            if columns is not None and entry["name"] not in columns:
+                continue
+            dtype = np.int64 if entry["dtype"].startswith("datetime64") else np.dtype(entry["dtype"])
+            if rows == 0:
+                array = np.empty(0, dtype=dtype)
+            else:
+                array = np.memmap(store_path / entry["file"], dtype=dtype, mode="r", shape=(rows,))
+            loaded[entry["name"]] = _decode_column(array, entry)
+        return loaded
+
+    def load_dataframe(self, type: str, compact: bool = False, columns=None) -> pd.DataFrame:
+        if type not in COLUMN_STORE_TYPES:
+            return super().load_dataframe(type, compact, columns)
+        store_path = self._get_filepath(type)
+        if not (store_path / HEADER_FILE).exists():
+            csv_path = store_path.with_suffix(".csv")
+            if not csv_path.exists():
+                return pd.DataFrame() # Return empty DataFrame if file not found
+            # Existing CSV data is converted once
+            df = pd.read_csv(csv_path)
+            for column in DATETIME_COLUMNS:
+                if column in df.columns:
+                    df[column] = pd.to_datetime(df[column], format="mixed")
+            self.save_dataframe(df, type)
+
+        loaded = self.load_columns(type, columns)
+        if compact and "timestamp" in loaded:
+            # Timestamps replace the datetime columns in compact mode
+            loaded = {name: values for name, values in loaded.items() if name not in DATETIME_COLUMNS}
+        df = pd.DataFrame(loaded, copy=False)
+        return compact_frame(df) if compact else df
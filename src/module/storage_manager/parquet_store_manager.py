@@ -0,0 +1,151 @@
+import argparse
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from module.data_manager.candle import DATETIME_COLUMNS
+from module.data_manager.compact import compact_frame
+from .file_store_manager import FileStoreManager
+from .storage_manager_base import BASE_PATH
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Dataset directories of a data type holding DataFrames (summaries stay JSON)
+DATAFRAME_DIRECTORIES = ("raw", "processed", "result", "sweep")
+# Appended part files merged into the dataset file once there are this many
+PARTS_PER_COMPACTION = 256
+
+
+class ParquetStoreManager(FileStoreManager):
+    """
+    FileStoreManager storing DataFrames as Parquet files instead of CSV (JSON documents
+    are unchanged). Columns keep their dtypes (datetimes, categoricals, int64
+    timestamps), files are a fraction of the CSV size, and `columns` reads only the
+    requested columns from disk.
+    A dataset without a Parquet file yet is read from its CSV once and converted, so
+    existing data migrates on first use (or all at once with `migrate_csv_files`).
+    Parquet files cannot be appended to: appended rows (e.g. live candles) are written
+    as small part files in a `<dataset>.parts` directory next to the dataset file, read
+    after it, and merged into it every PARTS_PER_COMPACTION appends, so an append costs
+    the size of the new rows rather than of the dataset.
+    """
+    EXTENSION = "parquet"
+
+    def __init__(self, symbol_info, data_type: str = "backtest"):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("The parquet storage backend requires pyarrow (pip install pyarrow).")
+        super().__init__(symbol_info, data_type)
+
+    def _get_filepath(self, type: str) -> Path:
+        filepath = super()._get_filepath(type)
+        return filepath if filepath.suffix == ".json" else filepath.with_suffix(".parquet")
+
+    @staticmethod
+    def _parts_path(filepath: Path) -> Path:
+        return filepath.with_suffix(".parts")
+
+    @classmethod
+    def _part_files(cls, filepath: Path) -> list:
+        """Appended part files of the dataset, in append order."""
+        parts_path = cls._parts_path(filepath)
+        return sorted(parts_path.glob("*.parquet")) if parts_path.exists() else []
+
+    @staticmethod
+    def _write(df: pd.DataFrame, filepath: Path):
+        # Written aside and renamed, so readers never see a partial file
+        temporary = filepath.with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(temporary, index=False)
+        os.replace(temporary, filepath)
+
+    def save_dataframe(self, df: pd.DataFrame, type: str, append: bool = False):
+        filepath = self._get_filepath(type)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if append and filepath.exists():
+            return self._append(filepath, df)
+        self._write(df, filepath)
+        shutil.rmtree(self._parts_path(filepath), ignore_errors=True)
+
+    def _append(self, filepath: Path, df: pd.DataFrame):
+        """Writes `df` as the next part file of the dataset, merging the parts into it when there are enough."""
+        parts = self._part_files(filepath)
+        parts_path = self._parts_path(filepath)
+        if len(parts) + 1 >= PARTS_PER_COMPACTION:
+            merged = pd.concat([pd.read_parquet(path) for path in [filepath, *parts]] + [df], ignore_index=True)
+            self._write(merged, filepath)
+            shutil.rmtree(parts_path, ignore_errors=True)
+            return
+        parts_path.mkdir(exist_ok=True)
+        number = int(parts[-1].stem) + 1 if parts else 0
+        self._write(df, parts_path / f"{number:08d}.parquet")
+
+    def load_dataframe(self, type: str, compact: bool = False, columns=None) -> pd.DataFrame:
+        filepath = self._get_filepath(type)
+        if not filepath.exists():
+            if not filepath.with_suffix(".csv").exists():
+                return pd.DataFrame() # Return empty DataFrame if file not found
+            convert_csv_file(filepath.with_suffix(".csv"))
+
+        stored = pq.ParquetFile(filepath).schema_arrow.names
+        selected = [column for column in stored if columns is None or column in columns]
+        if compact and "timestamp" in stored:
+            # Timestamps replace the datetime columns in compact mode: not read at all
+            selected = [column for column in selected if column not in DATETIME_COLUMNS]
+        df = pd.read_parquet(filepath, columns=selected)
+        parts = self._part_files(filepath)
+        if parts:
+            df = pd.concat([df] + [pd.read_parquet(path, columns=selected) for path in parts], ignore_index=True)
+        return compact_frame(df) if compact else df
+
+
+def convert_csv_file(csv_path: Path, delete: bool = False) -> Path:
+    """Writes the CSV file as Parquet next to it, with datetime columns parsed. Returns the Parquet path."""
+    df = pd.read_csv(csv_path)
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], format="mixed")
+    parquet_path = csv_path.with_suffix(".parquet")
+    temporary = parquet_path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_parquet(temporary, index=False)
+    os.replace(temporary, parquet_path)
+    if delete:
+        csv_path.unlink()
+    return parquet_path
+
+
+def migrate_csv_files(base_path=BASE_PATH, delete: bool = False) -> list:
+    """
+    Converts every CSV dataset under `base_path` (all data types) that has no Parquet
+    file yet. With `delete`, the CSV files are removed once converted. Returns the
+    Parquet paths written.
+    """
+    converted = []
+    for directory in DATAFRAME_DIRECTORIES:
+        for csv_path in sorted(Path(base_path).glob(f"*/{directory}/*.csv")):
+            if csv_path.with_suffix(".parquet").exists():
+                continue
+            converted.append(convert_csv_file(csv_path, delete=delete))
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the CSV datasets to Parquet for the parquet storage backend.")
+    parser.add_argument("--path", default=BASE_PATH, help="data directory")
+    parser.add_argument("--delete", action="store_true", help="delete each CSV file once converted")
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        raise ImportError("The parquet storage backend requires pyarrow (pip install pyarrow).")
+    converted = migrate_csv_files(args.path, delete=args.delete)
+    for parquet_path in converted:
+        print(f"📦 {parquet_path}")
+    print(f"✅ Converted {len(converted)} CSV datasets to Parquet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+import argparse
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from module.data_manager.candle import DATETIME_COLUMNS
+from module.data_manager.compact import compact_frame
+from .storage_manager_base import (
+    BACKTEST_DATA_TYPE,
+    BASE_PATH,
+    MONTE_CARLO_DATA_TYPE,
+    PROCESSED_DATA_TYPE,
+    RAW_DATA_TYPE,
+    RESULT_DATA_TYPE,
+    SUMMARY_DATA_TYPE,
+    SWEEP_DATA_TYPE,
+    DataStoreManagerBase,
+)
+
+DATABASE_FILE = "store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    name TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    month TEXT,
+    year TEXT,
+    saved_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_datasets_symbol ON datasets (symbol, timeframe);
+CREATE TABLE IF NOT EXISTS candles (
+    dataset TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (dataset, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS features (
+    dataset TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (dataset, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trades (
+    dataset TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (dataset, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sweeps (
+    dataset TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (dataset, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS schemas (
+    dataset TEXT NOT NULL,
+    type TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    PRIMARY KEY (dataset, type)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    dataset TEXT NOT NULL,
+    type TEXT NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (dataset, type)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    dataset TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (dataset, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_metrics_metric ON metrics (metric, value);
+"""
+
+# Data type -> (table, key column). Candles and features are keyed by timestamp, so
+# appending a candle that is already stored replaces it; trades and sweep rows by their position
+TABLES = {
+    RAW_DATA_TYPE: ("candles", "timestamp"),
+    PROCESSED_DATA_TYPE: ("features", "timestamp"),
+    RESULT_DATA_TYPE: ("trades", "position"),
+    SWEEP_DATA_TYPE: ("sweeps", "position"),
+}
+DOCUMENT_TYPES = (SUMMARY_DATA_TYPE, MONTE_CARLO_DATA_TYPE)
+# Data type -> directory of its CSV files under FileStoreManager, imported on first load
+CSV_DIRECTORIES = {
+    RAW_DATA_TYPE: "raw",
+    PROCESSED_DATA_TYPE: "processed",
+    RESULT_DATA_TYPE: "result",
+    SWEEP_DATA_TYPE: "sweep",
+}
+# Column kind of datetime columns equal to the epoch-ms timestamps: derived on load, not stored
+DERIVED = "derived:"
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _is_timestamp_view(values: pd.Series, timestamps: pd.Series) -> bool:
+    """True if the datetime column holds exactly the epoch-ms `timestamps`."""
+    utc = values.dt.tz_convert("UTC").dt.tz_localize(None) if isinstance(values.dtype, pd.DatetimeTZDtype) else values
+    return bool((utc.to_numpy() == timestamps.to_numpy().astype("datetime64[ms]")).all())
+
+
+def _encode_column(values: pd.Series, timestamps=None) -> tuple:
+    """(column kind, values to insert or None when derived). The kind restores the dtype on load."""
+    dtype = values.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        if values.name in DATETIME_COLUMNS and timestamps is not None and _is_timestamp_view(values, timestamps):
+            return DERIVED + str(dtype), None
+        return str(dtype), [None if pd.isna(value) else value.isoformat() for value in values]
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category", [None if pd.isna(value) else str(value) for value in values]
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        return "object", [
+            value if value is None or isinstance(value, (str, int, float)) else None if pd.isna(value) else str(value)
+            for value in values.tolist()
+        ]
+    return np.dtype(dtype).str, values.tolist()
+
+
+def _decode_column(values: pd.Series, kind: str, timestamps=None):
+    if kind.startswith(DERIVED):
+        dtype = pd.api.types.pandas_dtype(kind[len(DERIVED):])
+        utc = pd.to_datetime(timestamps, unit="ms", utc=isinstance(dtype, pd.DatetimeTZDtype))
+        return utc.dt.tz_convert(dtype.tz).astype(dtype) if isinstance(dtype, pd.DatetimeTZDtype) else utc.astype(dtype)
+    if kind.startswith("datetime64"):
+        dtype = pd.api.types.pandas_dtype(kind)
+        parsed = pd.to_datetime(values, format="ISO8601", utc=isinstance(dtype, pd.DatetimeTZDtype))
+        return parsed.dt.tz_convert(dtype.tz).astype(dtype) if isinstance(dtype, pd.DatetimeTZDtype) else parsed.astype(dtype)
+    if kind == "category":
+        return values.astype("category")
+    if kind == "object":
+        return values
+    return values.astype(kind)
+
+
+class SqliteStoreManager(DataStoreManagerBase):
+    """
+    Implements DataStoreManagerBase on a single SQLite database per data type
+    (`data/<data type>/store.sqlite`), instead of one file per dataset and kind.
+    - Raw candles, processed features, trades and sweep rows go to indexed tables keyed
+      by dataset (the FileStoreManager file name) and timestamp or row; indicator and
+      trade columns are added to their table as they appear. Each save is one bulk
+      insert in one transaction, and `columns` selects only the requested columns.
+    - Summaries and Monte Carlo results are JSON documents. The numeric metrics of each
+      summary are also kept in an indexed `metrics` table, so cross-run questions
+      (e.g. the best profit_factor per symbol, see `best_runs`) are single queries.
+    Datetime columns equal to the timestamps are rebuilt from them rather than stored.
+    A dataset not in the database yet is imported from its CSV file (as stored by
+    FileStoreManager) on first load, so existing data is not downloaded again.
+    """
+    def __init__(self, symbol_info, data_type: str = BACKTEST_DATA_TYPE, timeout=60):
+        super().__init__(symbol_info, data_type)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.database_path = self.base_path / DATABASE_FILE
+        self.timeout = timeout
+        connection = self._connect()
+        try:
+            # WAL: backtests running in parallel read while another one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.database_path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    # Every dataset lives in the database file
+    def get_raw_filepath(self, *args) -> Path:
+        return self.database_path
+
+    def get_processed_filepath(self, *args) -> Path:
+        return self.database_path
+
+    def get_result_filepath(self, *args) -> Path:
+        return self.database_path
+
+    def get_summary_filepath(self, *args) -> Path:
+        return self.database_path
+
+    def _register_dataset(self, connection):
+        connection.execute(
+            "INSERT OR REPLACE INTO datasets (name, symbol, timeframe, month, year, saved_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.filename,
+                self.pair_config["symbol"],
+                self.pair_config["timeframe"],
+                str(self.pair_config.get("month", "all")),
+                self.pair_config["start"].split("-")[0],
+                time.time(),
+            ),
+        )
+
+    @staticmethod
+    def _table(type: str) -> tuple:
+        if type not in TABLES:
+            raise ValueError(f"Unknown data type: {type}")
+        return TABLES[type]
+
+    def _schema(self, connection, type: str):
+        row = connection.execute(
+            "SELECT columns FROM schemas WHERE dataset = ? AND type = ?", (self.filename, type)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_dataframe(self, df: pd.DataFrame, type: str, append: bool = False):
+        table, key = self._table(type)
+        if key == "timestamp" and "timestamp" not in df.columns:
+            raise ValueError(f"Cannot store {type} data without a timestamp column.")
+        timestamps = df["timestamp"] if key == "timestamp" else None
+
+        encoded = [(str(column), *_encode_column(df[column], timestamps)) for column in df.columns]
+        schema = [[name, kind] for name, kind, _ in encoded]
+
+        with self._transaction() as connection:
+            existing = self._schema(connection, type)
+            if append and existing is not None:
+                if sorted(name for name, _ in existing) != sorted(name for name, _ in schema):
+                    raise ValueError(f"Cannot append columns {list(df.columns)} to {type} data with columns {[name for name, _ in existing]}.")
+                first_row = connection.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE dataset = ?", (self.filename,)
+                ).fetchone()[0]
+                schema = existing
+            else:
+                connection.execute(f"DELETE FROM {table} WHERE dataset = ?", (self.filename,))
+                first_row = 0
+
+            kinds = dict(schema)
+            stored = [
+                # Appended rows follow the stored schema: a column stored so far stays stored
+                (name, values if values is not None else _encode_column(df[name])[1])
+                for name, _, values in encoded
+                if name != key and not kinds[name].startswith(DERIVED)
+            ]
+
+            table_columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            for name, _ in stored:
+                if name not in table_columns:
+                    # No declared type: values keep their own storage class (REAL, INTEGER or TEXT)
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(name)}")
+
+            keys = timestamps.tolist() if key == "timestamp" else range(first_row, first_row + len(df))
+            names = ", ".join(["dataset", key] + [_quote(name) for name, _ in stored])
+            placeholders = ", ".join(["?"] * (len(stored) + 2))
+            rows = zip([self.filename] * len(df), keys, *[values for _, values in stored])
+            connection.executemany(f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})", rows)
+            connection.execute(
+                "INSERT OR REPLACE INTO schemas (dataset, type, columns) VALUES (?, ?, ?)",
+                (self.filename, type, json.dumps(schema)),
+            )
+            self._register_dataset(connection)
+
+    def _import_csv(self, type: str) -> bool:
+        """Stores the dataset's FileStoreManager CSV file, if there is one. Returns True if imported."""
+        csv_path = self.base_path / CSV_DIRECTORIES[type] / f"{self.filename}.csv"
+        if not csv_path.exists():
+            return False
+        df = pd.read_csv(csv_path)
+        for column in DATETIME_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], format="mixed")
+        self.save_dataframe(df, type)
+        print(f"📦 Imported {csv_path} into {self.database_path}")
+        return True
+
+    def load_dataframe(self, type: str, compact: bool = False, columns=None) -> pd.DataFrame:
+        table, key = self._table(type)
+        connection = self._connect()
+        try:
+            schema = self._schema(connection, type)
+            if schema is None:
+                if not self._import_csv(type):
+                    return pd.DataFrame() # Return empty DataFrame if not stored
+                schema = self._schema(connection, type)
+            schema = [(name, kind) for name, kind in schema if columns is None or name in columns]
+            if compact and any(name == "timestamp" for name, _ in schema):
+                # Timestamps replace the datetime columns in compact mode
+                schema = [(name, kind) for name, kind in schema if name not in DATETIME_COLUMNS]
+            selected = [key] + [_quote(name) for name, kind in schema if name != key and not kind.startswith(DERIVED)]
+            loaded = pd.read_sql_query(
+                f"SELECT {', '.join(selected)} FROM {table} WHERE dataset = ? ORDER BY {key}",
+                connection,
+                params=(self.filename,),
+            )
+        finally:
+            connection.close()
+
+        timestamps = loaded["timestamp"] if key == "timestamp" else None
+        df = pd.DataFrame({name: _decode_column(loaded[name] if not kind.startswith(DERIVED) else None, kind, timestamps) for name, kind in schema})
+        return compact_frame(df) if compact else df
+
+    def save_json(self, data: dict, type: str):
+        if type not in DOCUMENT_TYPES:
+            raise ValueError(f"Unknown data type: {type}")
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO documents (dataset, type, document) VALUES (?, ?, ?)",
+                (self.filename, type, json.dumps(data, default=str)),
+            )
+            if type == SUMMARY_DATA_TYPE:
+                connection.execute("DELETE FROM metrics WHERE dataset = ?", (self.filename,))
+                connection.executemany(
+                    "INSERT INTO metrics (dataset, metric, value) VALUES (?, ?, ?)",
+                    [
+                        (self.filename, metric, float(value))
+                        for metric, value in data.items()
+                        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+                    ],
+                )
+            self._register_dataset(connection)
+
+    def load_json(self, type: str) -> dict:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT document FROM documents WHERE dataset = ? AND type = ?", (self.filename, type)
+            ).fetchone()
+        finally:
+            connection.close()
+        return json.loads(row[0]) if row else {} # Return empty dict if not stored
+
+
+def best_runs(database_path, metric: str = "profit_factor", group_by: str = "symbol") -> pd.DataFrame:
+    """
+    The stored run with the highest `metric` for each `group_by` value ("symbol" or
+    "timeframe"), best first, as an indexed lookup on the metrics table.
+    """
+    if group_by not in ("symbol", "timeframe"):
+        raise ValueError(f"Cannot group runs by '{group_by}'.")
+    connection = sqlite3.connect(database_path)
+    try:
+        # With MAX(), SQLite takes the other selected columns from the row holding the maximum
+        return pd.read_sql_query(
+            f"SELECT d.name AS dataset, d.symbol, d.timeframe, d.month, d.year, MAX(m.value) AS value "
+            f"FROM metrics m JOIN datasets d ON d.name = m.dataset WHERE m.metric = ? "
+            f"GROUP BY d.{group_by} ORDER BY value DESC",
+            connection,
+            params=(metric,),
+        ).rename(columns={"value": metric})
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the runs stored by the sqlite storage backend.")
+    parser.add_argument("--metric", default="profit_factor", help="summary metric to rank by (highest first)")
+    parser.add_argument("--by", default="symbol", choices=["symbol", "timeframe"], help="best run per symbol or timeframe")
+    parser.add_argument("--data-type", default=BACKTEST_DATA_TYPE, help="data type whose database to query")
+    args = parser.parse_args()
+
+    database_path = Path(BASE_PATH) / args.data_type / DATABASE_FILE
+    if not database_path.exists():
+        print(f"❌ No database at {database_path}: set storage.backend to \"sqlite\" and run a backtest first.")
+        return
+    runs = best_runs(database_path, args.metric, args.by)
+    if runs.empty:
+        print(f"⚠️  No stored run has a '{args.metric}' metric.")
+        return
+    print(f"🏆 Best {args.metric} per {args.by}:")
+    print(runs.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
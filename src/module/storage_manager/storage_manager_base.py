@@ -7,6 +7,8 @@ RAW_DATA_TYPE = "raw"
 PROCESSED_DATA_TYPE = "processed"
 RESULT_DATA_TYPE = "result"
 SUMMARY_DATA_TYPE = "summary"
+SWEEP_DATA_TYPE = "sweep"
+MONTE_CARLO_DATA_TYPE = "monte_carlo"
 
 
 BACKTEST_DATA_TYPE = "backtest"
@@ -14,6 +16,9 @@ LIVE_DATA_TYPE = "live"
 
 TEST_DATA_TYPE = "test"
 
+# Columns of raw market data: what a backtest reads before computing indicators
+MARKET_DATA_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume", "datetime"]
+
 BASE_PATH = "./data"
 
 class DataStoreManagerBase(ABC):
@@ -66,9 +71,11 @@ class DataStoreManagerBase(ABC):
         pass
 
     @abstractmethod
-    def load_dataframe(self, filepath: Path) -> pd.DataFrame:
+    def load_dataframe(self, filepath: Path, compact: bool = False, columns=None) -> pd.DataFrame:
         """
         Loads a pandas DataFrame from the specified location.
+        With `compact`, the frame uses compact dtypes (see compact_frame).
+        With `columns`, only those of the stored columns are read.
         """
         pass
 
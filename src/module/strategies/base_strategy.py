@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-import datetime
+from datetime import datetime
+import numpy as np
 from module.data_manager.data_manager_base import DataStorageBase
 from module.data_manager.historical_data_manager import HistoricalDataStorage
 from module.data_manager.live_data_manager import LiveDataManager
+from utils.stop_loss_kernel import EXIT_NONE, EXIT_SIGNAL, EXIT_STOP, resolve_exit
 
 
 class BaseStrategy(ABC):
@@ -19,6 +21,30 @@ class BaseStrategy(ABC):
         self.logger = logger
         self.is_live = False
         self.exchange = None
+        # Optional IntrabarResolver, set by the engine to order stop vs exit within a bar
+        self.intrabar_resolver = None
+        # Optional BacktestCheckpoint, set by the engine to snapshot long sync backtests
+        self.checkpointer = None
+
+    @classmethod
+    def sweep_setup(cls, params: dict):
+        """
+        Prepares one parameter set of a parameter sweep.
+        Returns (params, indicator_configs): the parameters to build the strategy with and
+        the indicator configs (same format as the `indicators` config) its columns need.
+        Strategies whose indicators depend on their parameters should override this.
+        """
+        return params, []
+
+    @classmethod
+    def required_columns(cls, params: dict):
+        """
+        Indicator columns the strategy reads with these parameters, or None if it does not
+        declare them. Declared columns let the engines compute only the configured
+        indicators producing them; otherwise backtests compute each indicator column the
+        first time the signal methods read it.
+        """
+        return None
 
     @abstractmethod
     def buy_signal(self):
@@ -52,6 +78,48 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def buy_signal_vectorized(self, columns):
+        """
+        Optional array form of `buy_signal`, evaluated over whole columns at once.
+        `columns` maps column names to full-length arrays. Should return a tuple of
+        (price, stop_loss) arrays with NaN where there is no signal, or None when
+        the strategy does not support vectorized backtests.
+        """
+        return None
+
+    def sell_signal_vectorized(self, columns):
+        """
+        Optional array form of `sell_signal`.
+        Should return a tuple of (price, stop_loss) arrays or None.
+        """
+        return None
+
+    def close_long_signal_vectorized(self, columns):
+        """
+        Optional array form of `close_long_signal`.
+        Should return a tuple of (price array, reason) or None.
+        """
+        return None
+
+    def close_short_signal_vectorized(self, columns):
+        """
+        Optional array form of `close_short_signal`.
+        Should return a tuple of (price array, reason) or None.
+        """
+        return None
+
+    def _resolve_stop_loss(self, trade_type, price, stop_loss=None):
+        """Returns (stop_loss, risk_per_share), defaulting the stop to `risk_pct` away from price."""
+        if stop_loss is None:
+            risk_per_share = price * self.risk_pct
+            if trade_type == "buy":
+                stop_loss = price - risk_per_share
+            else:
+                stop_loss = price + risk_per_share
+        else:
+            risk_per_share = abs(price - stop_loss)
+        return stop_loss, risk_per_share
+
     def _calculate_position_size(self, risk_per_share, price):
         """Calculate position size based on fixed risk amount."""
         # Fixed risk amount based on initial capital
@@ -71,88 +139,66 @@ class BaseStrategy(ABC):
 
         return max(0, round(position_size, 2))
 
+    def _take_position_sync(self, trade_type, price, stop_loss=None):
+        """Opens a simulated position on the portfolio (no exchange interaction)."""
+        stop_loss, risk_per_share = self._resolve_stop_loss(trade_type, price, stop_loss)
+        self.portfolio.open_position(
+            trade_type=trade_type,
+            price=price,
+            stop_loss=stop_loss,
+            risk_per_share=risk_per_share,
+            entry_date=self.data_storage.current_date,
+            entry_step=self.data_storage.current_step,
+        )
+        if self.logger:
+            self.logger.info(f"Trade signal: {trade_type} at {price}")
+
     async def _take_position(self, trade_type, price, stop_loss=None):
-        if stop_loss is None:
-            risk_per_share = price * self.risk_pct
-            if trade_type == "buy":
-                stop_loss = price - risk_per_share
-            else:
-                stop_loss = price + risk_per_share
-        else:
-            risk_per_share = abs(price - stop_loss)
+        if not self.is_live:
+            self._take_position_sync(trade_type, price, stop_loss)
+            return
 
-        if self.is_live:
-            amount = self._calculate_position_size(risk_per_share, price)
-            if amount > 0:
-                self.logger.info(
-                    f"Placing live {trade_type} order for {amount} of {self.data_storage.symbol} at {price}"
+        stop_loss, risk_per_share = self._resolve_stop_loss(trade_type, price, stop_loss)
+        amount = self._calculate_position_size(risk_per_share, price)
+        if amount > 0:
+            self.logger.info(
+                f"Placing live {trade_type} order for {amount} of {self.data_storage.symbol} at {price}"
+            )
+            try:
+                await self.exchange.create_market_order(
+                    symbol=self.data_storage.symbol,
+                    side=trade_type,
+                    amount=amount,
+                    stop_loss=stop_loss,
                 )
-                try:
-                    await self.exchange.create_market_order(
-                        symbol=self.data_storage.symbol,
-                        side=trade_type,
-                        amount=amount,
-                        stop_loss=stop_loss,
-                    )
-                    # In a live scenario, you would ideally wait for the order fill confirmation
-                    # and then update the portfolio. For simplicity here, we open the position directly.
-                    self.portfolio.open_position(
-                        trade_type=trade_type,
-                        price=price,
-                        stop_loss=stop_loss,
-                        risk_per_share=risk_per_share,
-                        entry_date=self.data_storage.current_date,
-                        entry_step=self.data_storage.current_step,
-                    )
-                except Exception as e:
-                    self.logger.error(f"Failed to place live order: {e}")
-            else:
-                self.logger.warning("Could not open position, quantity is 0")
-
+                # In a live scenario, you would ideally wait for the order fill confirmation
+                # and then update the portfolio. For simplicity here, we open the position directly.
+                self.portfolio.open_position(
+                    trade_type=trade_type,
+                    price=price,
+                    stop_loss=stop_loss,
+                    risk_per_share=risk_per_share,
+                    entry_date=self.data_storage.current_date,
+                    entry_step=self.data_storage.current_step,
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to place live order: {e}")
         else:
-            self.portfolio.open_position(
-                trade_type=trade_type,
-                price=price,
-                stop_loss=stop_loss,
-                risk_per_share=risk_per_share,
-                entry_date=self.data_storage.current_date,
-                entry_step=self.data_storage.current_step,
-            )
+            self.logger.warning("Could not open position, quantity is 0")
+
         if self.logger:
             self.logger.info(f"Trade signal: {trade_type} at {price}")
 
-    async def _liquidate(self, price=0, reason="signal_exit"):
+    def _liquidate_sync(self, price=0, reason="signal_exit"):
+        """Closes the simulated position on the portfolio (no exchange interaction)."""
         if self.logger:
             self.logger.info(f"Liquidation signal: {reason} at {price}")
         # Use current_candle for liquidation price if not provided
         if price == 0 and self.data_storage.current_candle() is not None:
             price = self.data_storage.current_candle()["close"]
 
-        if self.is_live:
-            trade = self.portfolio.current_trade
-            if trade:
-                self.logger.info(
-                    f"Placing live order to close {trade['type']} position for {self.data_storage.symbol}"
-                )
-                try:
-                    side = "sell" if trade["type"] == "buy" else "buy"
-                    await self.exchange.create_market_order(
-                        symbol=self.data_storage.symbol,
-                        side=side,
-                        amount=trade["quantity"],
-                        reduce_only=True,
-                    )
-                    self.portfolio.close_position(
-                        price=price,
-                        exit_date=self.data_storage.current_date,
-                        exit_step=self.data_storage.current_step,
-                        action=reason,
-                    )
-                except Exception as e:
-                    self.logger.error(f"Failed to close live position: {e}")
-
         # For end_of_data, use the last available candle's close price and datetime
-        elif reason == "end_of_data":
+        if reason == "end_of_data":
             last_candle = self.data_storage.previous_candle_of(
                 0
             )  # Get the very last candle processed
@@ -180,6 +226,39 @@ class BaseStrategy(ABC):
                 action=reason,
             )
 
+    async def _liquidate(self, price=0, reason="signal_exit"):
+        if not self.is_live:
+            self._liquidate_sync(price, reason)
+            return
+
+        if self.logger:
+            self.logger.info(f"Liquidation signal: {reason} at {price}")
+        # Use current_candle for liquidation price if not provided
+        if price == 0 and self.data_storage.current_candle() is not None:
+            price = self.data_storage.current_candle()["close"]
+
+        trade = self.portfolio.current_trade
+        if trade:
+            self.logger.info(
+                f"Placing live order to close {trade['type']} position for {self.data_storage.symbol}"
+            )
+            try:
+                side = "sell" if trade["type"] == "buy" else "buy"
+                await self.exchange.create_market_order(
+                    symbol=self.data_storage.symbol,
+                    side=side,
+                    amount=trade["quantity"],
+                    reduce_only=True,
+                )
+                self.portfolio.close_position(
+                    price=price,
+                    exit_date=self.data_storage.current_date,
+                    exit_step=self.data_storage.current_step,
+                    action=reason,
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to close live position: {e}")
+
     def _update_trailing_stop(self, trade):
         """Update trailing stop loss based on current price movement, ensuring it doesn't immediately liquidate."""
         if not self.trailing_stop_enabled:
@@ -252,9 +331,13 @@ class BaseStrategy(ABC):
                 )
             self.portfolio.update_stop_loss(new_stop)
 
-    async def _check_stop_loss(self, trade):
+    def _stop_loss_exit_price(self, trade):
+        """
+        Returns (fill price, gapped) if the current candle hits the trade's stop loss, else
+        (None, False). `gapped` is True when the candle opened through the stop (filled at
+        the open) and False when the stop was touched intrabar (filled at the stop).
+        """
         today = self.data_storage.current_candle()
-        stop_loss_hit = False
 
         if trade["type"] == "buy":
             # Condition 1: Price gaps below the stop loss
@@ -263,16 +346,14 @@ class BaseStrategy(ABC):
                     self.logger.info(
                         f"Stop loss hit for buy trade at {today['open']} (gap down)"
                     )
-                self._liquidate(today["open"], "stop_loss")
-                stop_loss_hit = True
+                return today["open"], True
             # Condition 2: Price hits the stop loss during the day
-            elif today["low"] <= trade["stop_loss"]:
+            if today["low"] <= trade["stop_loss"]:
                 if self.logger:
                     self.logger.info(
                         f"Stop loss hit for buy trade at {trade['stop_loss']}"
                     )
-                self._liquidate(trade["stop_loss"], "stop_loss")
-                stop_loss_hit = True
+                return trade["stop_loss"], False
         elif trade["type"] == "sell":
             # Condition 1: Price gaps above the stop loss
             if today["open"] >= trade["stop_loss"]:
@@ -280,59 +361,118 @@ class BaseStrategy(ABC):
                     self.logger.info(
                         f"Stop loss hit for sell trade at {today['open']} (gap up)"
                     )
-                self._liquidate(today["open"], "stop_loss")
-                stop_loss_hit = True
+                return today["open"], True
             # Condition 2: Price hits the stop loss during the day
-            elif today["high"] >= trade["stop_loss"]:
+            if today["high"] >= trade["stop_loss"]:
                 if self.logger:
                     self.logger.info(
                         f"Stop loss hit for sell trade at {trade['stop_loss']}"
                     )
-                self._liquidate(trade["stop_loss"], "stop_loss")
-                stop_loss_hit = True
+                return trade["stop_loss"], False
+        return None, False
 
-        # Update trailing stop after checking for stop loss
-        if not stop_loss_hit:
+    def _exit_before_stop(self, trade):
+        """
+        For a bar that touched the stop intrabar, asks the intrabar resolver whether the
+        strategy's exit level was reached first. Returns (price, reason) of that exit,
+        or (None, None) when the stop stands.
+        """
+        if self.intrabar_resolver is None:
+            return None, None
+        exit_price, reason = self._exit_signal(trade)
+        if not exit_price:
+            return None, None
+        bar_timestamp = self.data_storage.current_candle()["timestamp"]
+        if self.intrabar_resolver.stop_hit_first(bar_timestamp, trade["type"], trade["stop_loss"], exit_price):
+            return None, None
+        return exit_price, reason
+
+    def _stop_loss_exit(self, trade):
+        """Returns (price, reason) if the current candle closes the trade through its stop."""
+        exit_price, gapped = self._stop_loss_exit_price(trade)
+        if exit_price is None:
+            return None, None
+        if not gapped:  # Touched intrabar: the exit level may have been reached first
+            signal_price, reason = self._exit_before_stop(trade)
+            if signal_price:
+                return signal_price, reason
+        return exit_price, "stop_loss"
+
+    def _check_stop_loss_sync(self, trade):
+        exit_price, reason = self._stop_loss_exit(trade)
+        if exit_price is None:
+            # Update trailing stop after checking for stop loss
             self._update_trailing_stop(trade)
+            return False
 
-        return stop_loss_hit
+        self._liquidate_sync(exit_price, reason)
+        return True
 
-    def _check_exit_signals(self, trade):
-        """Check for strategy-based exit signals. Returns True if position was closed."""
+    async def _check_stop_loss(self, trade):
+        exit_price, reason = self._stop_loss_exit(trade)
+        if exit_price is None:
+            # Update trailing stop after checking for stop loss
+            self._update_trailing_stop(trade)
+            return False
+
+        await self._liquidate(exit_price, reason)
+        return True
+
+    def _exit_signal(self, trade):
+        """Returns (price, reason) of the strategy exit signal for the open trade."""
         if trade["type"] == "buy":
-            exit_price, reason = self.close_long_signal()
-            if exit_price:
-                self._liquidate(exit_price, reason)
-                return True
-        elif trade["type"] == "sell":
-            exit_price, reason = self.close_short_signal()
-            if exit_price:
-                self._liquidate(exit_price, reason)
-                return True
+            return self.close_long_signal()
+        if trade["type"] == "sell":
+            return self.close_short_signal()
+        return None, None
+
+    def _check_exit_signals_sync(self, trade):
+        """Check for strategy-based exit signals. Returns True if position was closed."""
+        exit_price, reason = self._exit_signal(trade)
+        if exit_price:
+            self._liquidate_sync(exit_price, reason)
+            return True
         return False
 
-    def _check_entry_signals(self):
-        if not self.portfolio.current_trade:
-            buy_result = self.buy_signal()
-            if isinstance(buy_result, tuple) and len(buy_result) == 2:
-                buy_price, stop_loss = buy_result
-                if buy_price:
-                    self._take_position("buy", buy_price, stop_loss)
-            else:
-                buy_price = buy_result
-                if buy_price:
-                    self._take_position("buy", buy_price)
-
-        if not self.portfolio.current_trade:
-            sell_result = self.sell_signal()
-            if isinstance(sell_result, tuple) and len(sell_result) == 2:
-                sell_price, stop_loss = sell_result
-                if sell_price:
-                    self._take_position("sell", sell_price, stop_loss)
-            else:
-                sell_price = sell_result
-                if sell_price:
-                    self._take_position("sell", sell_price)
+    async def _check_exit_signals(self, trade):
+        """Check for strategy-based exit signals. Returns True if position was closed."""
+        exit_price, reason = self._exit_signal(trade)
+        if exit_price:
+            await self._liquidate(exit_price, reason)
+            return True
+        return False
+
+    @staticmethod
+    def _unpack_entry_signal(result):
+        """Normalizes an entry signal to (price, stop_loss); stop_loss is None if not given."""
+        if isinstance(result, tuple) and len(result) == 2:
+            return result
+        return result, None
+
+    def _check_entry_signals_sync(self):
+        for trade_type, signal in (("buy", self.buy_signal), ("sell", self.sell_signal)):
+            if self.portfolio.current_trade:
+                return
+            price, stop_loss = self._unpack_entry_signal(signal())
+            if price:
+                self._take_position_sync(trade_type, price, stop_loss)
+
+    async def _check_entry_signals(self):
+        for trade_type, signal in (("buy", self.buy_signal), ("sell", self.sell_signal)):
+            if self.portfolio.current_trade:
+                return
+            price, stop_loss = self._unpack_entry_signal(signal())
+            if price:
+                await self._take_position(trade_type, price, stop_loss)
+
+    def on_tick_sync(self):
+        """Synchronous `on_tick` for backtests, where no hook ever needs to await I/O."""
+        trade = self.portfolio.current_trade
+        if trade:
+            if not self._check_stop_loss_sync(trade):
+                self._check_exit_signals_sync(trade)
+        else:
+            self._check_entry_signals_sync()
 
     async def on_tick(self):
         trade = self.portfolio.current_trade
@@ -342,6 +482,61 @@ class BaseStrategy(ABC):
         else:
             await self._check_entry_signals()
 
+    def _resolve_trade_exit(self, entry_index, trade, exit_signals):
+        """
+        Resolves the exit of `trade`, opened at bar `entry_index`, with the stop-loss kernel.
+        `exit_signals` maps the trade type to its (exit price array, reason). Bars where the
+        stop and the exit level are both touched are ordered by the intrabar resolver.
+        Returns (exit_bar, price, reason, final_stop); exit_bar is None if the trade is
+        still open at the end of the data.
+        """
+        columns = self.data_storage.arrays
+        exit_prices, reason = exit_signals[trade["type"]]
+        exit_bar, price, exit_kind, final_stop = resolve_exit(
+            entry_index, trade["type"], trade["stop_loss"],
+            columns["open"], columns["high"], columns["low"], columns["close"],
+            trailing_stop_pct=self.trailing_stop_pct if self.trailing_stop_enabled else None,
+            exit_prices=exit_prices,
+        )
+        if exit_kind == EXIT_NONE:
+            return None, None, None, final_stop
+        if exit_kind == EXIT_SIGNAL:
+            return exit_bar, price, reason, final_stop
+
+        signal_price = exit_prices[exit_bar]
+        if (
+            exit_kind == EXIT_STOP
+            and self.intrabar_resolver is not None
+            and np.isfinite(signal_price)
+            and signal_price != 0
+            and not self.intrabar_resolver.stop_hit_first(
+                columns["timestamp"][exit_bar], trade["type"], final_stop, signal_price
+            )
+        ):
+            return exit_bar, signal_price, reason, final_stop
+        return exit_bar, price, "stop_loss", final_stop
+
+    def run_backtest_sync(self):
+        """
+        Synchronous backtest driver. Historical data never does I/O, so advancing the
+        data storage and processing ticks without coroutines avoids their per-bar cost.
+        Requires a data storage with a synchronous `next_processed_data()`.
+        With a `checkpointer`, the state is snapshotted every few bars so an interrupted
+        run can resume (see BacktestCheckpoint).
+        """
+        while self.data_storage.has_more_data:
+            current_candle, _ = self.data_storage.next_processed_data()
+            if current_candle is None:
+                break
+            self.on_tick_sync()
+            if self.checkpointer is not None:
+                self.checkpointer.maybe_save(self)
+
+        if self.portfolio.current_trade:
+            self._liquidate_sync(reason="end_of_data")
+
+        return self.portfolio.summary()
+
     async def run_backtest(self):
         while self.data_storage.has_more_data:
             # Get the next processed data (current candle and historical data)
@@ -354,9 +549,11 @@ class BaseStrategy(ABC):
                 break
 
             # Process the tick with the newly received data
-            self.on_tick()
+            await self.on_tick()
+            if self.checkpointer is not None:
+                self.checkpointer.maybe_save(self)
 
         if self.portfolio.current_trade:
-            self._liquidate(reason="end_of_data")
+            await self._liquidate(reason="end_of_data")
 
         return self.portfolio.summary()
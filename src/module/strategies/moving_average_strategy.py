@@ -1,4 +1,5 @@
 from .base_strategy import BaseStrategy
+import numpy as np
 import pandas as pd
 
 
@@ -8,11 +9,40 @@ class MovingAverageStrategy(BaseStrategy):
         self.ma_period = self.params.get("ma_period", 20)
         self.supertrend_period = self.params.get("supertrend_period", 10)
         self.supertrend_multiplier = self.params.get("supertrend_multiplier", 3)
+        self.ma_high_column = f"ma{self.ma_period}high"
+        self.ma_low_column = f"ma{self.ma_period}low"
+        self.supertrend_direction_column = f'{self.params.get("supertrend_column", "superTrend")}Direction'
+
+    @classmethod
+    def sweep_setup(cls, params):
+        ma_period = params.get("ma_period", 20)
+        supertrend_period = params.get("supertrend_period", 10)
+        supertrend_multiplier = params.get("supertrend_multiplier", 3)
+        supertrend_column = f"superTrend_{supertrend_period}_{supertrend_multiplier}"
+        indicator_configs = [
+            {"name": "ma_high", "period": ma_period},
+            {"name": "ma_low", "period": ma_period},
+            {"name": "supertrend", "period": supertrend_period, "multiplier": supertrend_multiplier, "custom_name": supertrend_column},
+        ]
+        return {**params, "supertrend_column": supertrend_column}, indicator_configs
+
+    @classmethod
+    def required_columns(cls, params):
+        ma_period = params.get("ma_period", 20)
+        return [f"ma{ma_period}high", f"ma{ma_period}low", f'{params.get("supertrend_column", "superTrend")}Direction']
 
     def _calculate_body(self, day_data):
         """Helper to calculate candle body."""
         return day_data["close"] - day_data["open"]
 
+    @staticmethod
+    def _previous(values):
+        """Shifts an array forward by one bar, so index i holds the value of bar i - 1."""
+        shifted = np.empty(len(values), dtype=float)
+        shifted[:1] = np.nan
+        shifted[1:] = values[:-1]
+        return shifted
+
     def buy_signal(self):
         today = self.data_storage.current_candle()
         yesterday = self.data_storage.previous_candle_of(1)
@@ -23,12 +53,12 @@ class MovingAverageStrategy(BaseStrategy):
         today_body = self._calculate_body(today)
         yesterday_body = self._calculate_body(yesterday)
 
-        ma20high_today = today["ma20high"]
-        supertrend_direction_today = today["superTrendDirection"]
+        ma_high_today = today[self.ma_high_column]
+        supertrend_direction_today = today[self.supertrend_direction_column]
 
         # Conditions for Buy Order
         if (
-            today["close"] > ma20high_today
+            today["close"] > ma_high_today
             and today_body > 0
             and yesterday_body > 0
             and supertrend_direction_today == "Buy"
@@ -49,12 +79,12 @@ class MovingAverageStrategy(BaseStrategy):
         today_body = self._calculate_body(today)
         yesterday_body = self._calculate_body(yesterday)
 
-        ma20low_today = today["ma20low"]
-        supertrend_direction_today = today["superTrendDirection"]
+        ma_low_today = today[self.ma_low_column]
+        supertrend_direction_today = today[self.supertrend_direction_column]
 
         # Conditions for Sell Order (Short)
         if (
-            today["close"] < ma20low_today
+            today["close"] < ma_low_today
             and today_body < 0
             and yesterday_body < 0
             and supertrend_direction_today == "Sell"
@@ -74,9 +104,9 @@ class MovingAverageStrategy(BaseStrategy):
 
         today_body = self._calculate_body(today)
 
-        ma20high_yesterday = yesterday["ma20high"]
-        if ma20high_yesterday > today["low"] and today_body < 0:
-            return ma20high_yesterday, "MA20High Crossover & Negative Body"
+        ma_high_yesterday = yesterday[self.ma_high_column]
+        if ma_high_yesterday > today["low"] and today_body < 0:
+            return ma_high_yesterday, f"MA{self.ma_period}High Crossover & Negative Body"
 
         return None, None
 
@@ -88,8 +118,44 @@ class MovingAverageStrategy(BaseStrategy):
             return None, None
 
         today_body = self._calculate_body(today)
-        ma20low_yesterday = yesterday["ma20low"]
-        if today["high"] > ma20low_yesterday and today_body > 0:
-            return ma20low_yesterday, "MA20Low Crossover & Positive Body"
+        ma_low_yesterday = yesterday[self.ma_low_column]
+        if today["high"] > ma_low_yesterday and today_body > 0:
+            return ma_low_yesterday, f"MA{self.ma_period}Low Crossover & Positive Body"
 
         return None, None
+
+    def buy_signal_vectorized(self, columns):
+        close = columns["close"]
+        body = close - columns["open"]
+        signal = (
+            (close > columns[self.ma_high_column])
+            & (body > 0)
+            & (self._previous(body) > 0)
+            & (columns[self.supertrend_direction_column] == "Buy")
+        )
+        buying_price = np.where(signal, close, np.nan)
+        return buying_price, buying_price * 0.96
+
+    def sell_signal_vectorized(self, columns):
+        close = columns["close"]
+        body = close - columns["open"]
+        signal = (
+            (close < columns[self.ma_low_column])
+            & (body < 0)
+            & (self._previous(body) < 0)
+            & (columns[self.supertrend_direction_column] == "Sell")
+        )
+        selling_price = np.where(signal, close, np.nan)
+        return selling_price, selling_price * 1.04
+
+    def close_long_signal_vectorized(self, columns):
+        body = columns["close"] - columns["open"]
+        ma_high_yesterday = self._previous(columns[self.ma_high_column])
+        signal = (ma_high_yesterday > columns["low"]) & (body < 0)
+        return np.where(signal, ma_high_yesterday, np.nan), f"MA{self.ma_period}High Crossover & Negative Body"
+
+    def close_short_signal_vectorized(self, columns):
+        body = columns["close"] - columns["open"]
+        ma_low_yesterday = self._previous(columns[self.ma_low_column])
+        signal = (columns["high"] > ma_low_yesterday) & (body > 0)
+        return np.where(signal, ma_low_yesterday, np.nan), f"MA{self.ma_period}Low Crossover & Positive Body"
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+
+from module.engine.factory import create_backtest_engine
+from module.engine.job_queue import DONE, FAILED, PENDING, RUNNING, JobQueue
+from utils.helpers import load_config
+
+
+def create_queue(config):
+    settings = config["backtest_settings"].get("queue") or {}
+    return JobQueue(
+        settings.get("path", "./data/queue/backtest_jobs.sqlite"),
+        stale_after=settings.get("stale_after_seconds", 120),
+        max_attempts=settings.get("max_attempts", 3),
+    )
+
+
+def run_coordinator(config, queue):
+    """Expands the run grid into jobs and adds the ones not queued yet."""
+    if (config["backtest_settings"].get("sweep") or {}).get("enabled", False):
+        raise ValueError("Parameter sweeps cannot be queued; disable backtest_settings.sweep.")
+    if config["backtest_settings"].get("engine", "event").lower() == "multi_asset":
+        # Jobs run one symbol each: they would not share a portfolio
+        raise ValueError("Multi-asset backtests cannot be queued; use backtest_settings.engine 'event' or 'vectorized'.")
+    engine = create_backtest_engine(config)
+    pair_configs = engine._build_pair_configs()
+    # Each job carries the config it was queued with, so every worker runs the same setup.
+    # It is keyed by the settings that shape its result only: other config edits do not
+    # queue finished jobs again.
+    payloads = [{"pair_config": pair_config, "config": config} for pair_config in pair_configs]
+    added = queue.enqueue(payloads, keys=[engine._job_key(pair_config) for pair_config in pair_configs])
+    print(f"📋 Queued {added} new jobs ({len(payloads) - added} already in the queue) in {queue.path}")
+
+
+def run_job(payload):
+    """Runs one queued backtest; results are written through the store manager like a local run."""
+    config, pair_config = payload["config"], payload["pair_config"]
+    engine = create_backtest_engine(config)
+    strategy = engine._build_strategy(pair_config)
+    if strategy is None:
+        raise ValueError(f"No data for {pair_config['symbol']} ({pair_config['timeframe']})")
+    asyncio.run(engine._run_and_save_results(strategy, pair_config))
+
+
+def run_worker(config, queue, exit_when_empty=False):
+    """Claims and runs jobs until the queue is drained (or forever, polling, unless exit_when_empty)."""
+    settings = config["backtest_settings"].get("queue") or {}
+    heartbeat = settings.get("heartbeat_seconds", 15)
+    poll = settings.get("poll_seconds", 5)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            counts = queue.counts()
+            if exit_when_empty and counts[PENDING] == 0 and counts[RUNNING] == 0:
+                print(f"✅ Worker {worker}: queue drained.")
+                return
+            time.sleep(poll)
+            continue
+
+        job_id, token, payload = claimed
+        pair_config = payload["pair_config"]
+        print(f"🚀 Worker {worker}: job {job_id} {pair_config['symbol']} ({pair_config['timeframe']}) {pair_config['start']} → {pair_config['end']}")
+        try:
+            with queue.keep_alive(job_id, token, heartbeat):
+                run_job(payload)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            queue.fail(job_id, token, traceback.format_exc())
+            continue
+        if not queue.complete(job_id, token):
+            print(f"⚠️  Job {job_id} was reassigned before it finished; the new owner will rewrite its results.")
+
+
+def print_progress(queue):
+    counts = queue.counts()
+    total = sum(counts.values())
+    finished = counts[DONE] + counts[FAILED]
+    print(f"\n📊 Queue {queue.path}: {finished}/{total} finished")
+    print(f"   Pending: {counts[PENDING]}  Running: {counts[RUNNING]}  Done: {counts[DONE]}  Failed: {counts[FAILED]}")
+
+    now = time.time()
+    for job in queue.jobs(RUNNING):
+        pair_config = job["payload"]["pair_config"]
+        print(f"   🏃 {job['id']:>5} {pair_config['symbol']} ({pair_config['timeframe']}) {pair_config['start']} "
+              f"on {job['worker']}, attempt {job['attempts']}, heartbeat {now - job['heartbeat_at']:.0f}s ago")
+    for job in queue.jobs(FAILED):
+        pair_config = job["payload"]["pair_config"]
+        last_line = (job["error"] or "").strip().splitlines()[-1:] or [""]
+        print(f"   ❌ {job['id']:>5} {pair_config['symbol']} ({pair_config['timeframe']}) {pair_config['start']}: {last_line[0]}")
+
+
+def _worker_process(exit_when_empty):
+    config = load_config('backtest')
+    run_worker(config, create_queue(config), exit_when_empty)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backtest grid through a shared SQLite job queue.")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    subparsers.add_parser("coordinator", help="queue the jobs of the backtest grid")
+    worker_parser = subparsers.add_parser("worker", help="claim and run queued jobs")
+    worker_parser.add_argument("--processes", type=int, default=1, help="worker processes on this host")
+    worker_parser.add_argument("--exit-when-empty", action="store_true", help="stop once no job is pending or running")
+    progress_parser = subparsers.add_parser("progress", help="show the queue's progress")
+    progress_parser.add_argument("--watch", type=float, default=None, help="refresh every N seconds")
+    subparsers.add_parser("retry-failed", help="put failed jobs back in the queue")
+    args = parser.parse_args()
+
+    config = load_config('backtest')
+    queue = create_queue(config)
+
+    if args.mode == "coordinator":
+        run_coordinator(config, queue)
+    elif args.mode == "worker":
+        if args.processes <= 1:
+            run_worker(config, queue, args.exit_when_empty)
+            return
+        processes = [multiprocessing.Process(target=_worker_process, args=(args.exit_when_empty,)) for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    elif args.mode == "progress":
+        while True:
+            print_progress(queue)
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+    elif args.mode == "retry-failed":
+        print(f"🔁 {queue.reset_failed()} failed jobs queued again.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,69 @@
 import pandas as pd
 import yaml
 from pathlib import Path
-from datetime import datetime
 
-from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, PROCESSED_DATA_TYPE, RAW_DATA_TYPE
+from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, MARKET_DATA_COLUMNS, PROCESSED_DATA_TYPE, RAW_DATA_TYPE
+from module.data_manager.compact import with_datetime
 
-from .historical_data_fetcher import download_data_for_pair
+from .historical_data_fetcher import download_data_for_pair, parse_date, update_data_for_pair
 
+from module.storage_manager.factory import create_store_manager
 from module.storage_manager.file_store_manager import FileStoreManager # New import
 from utils.indicator_processor import IndicatorProcessor # Keep IndicatorProcessor
 
 
-def _check_file_date_range(data_store_manager: FileStoreManager, required_start, required_end):
-    """Checks if a CSV file's date range exactly matches the required dates."""
-    try:
-        df = data_store_manager.load_dataframe(BACKTEST_DATA_TYPE)
-        if df.empty:
-            return False
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        
-        # Get the actual date range in the file
-        start_in_file = df["datetime"].iloc[0].date()
-        end_in_file = df["datetime"].iloc[-1].date()
-        
-        # Check if file dates exactly match the required dates
-        start_matches = start_in_file == required_start
-        end_matches = end_in_file == required_end
-        
-        return start_matches and end_matches
-    except Exception:
-        return False
+def period_rows(data: pd.DataFrame, pair_config) -> pd.DataFrame:
+    """Rows of `data` (sorted by timestamp) within the period of `pair_config`, same bounds as the downloader."""
+    if data.empty:
+        return data
+    start_ms = parse_date(f"{pair_config['start']} 00:00:00")
+    end_ms = parse_date(f"{pair_config['end']} 23:59:59")
+    timestamps = data["timestamp"]
+    if timestamps.is_monotonic_increasing:
+        # A row range: the period's columns are views of `data` (e.g. of memory-mapped files)
+        start, end = timestamps.searchsorted(start_ms, side="left"), timestamps.searchsorted(end_ms, side="right")
+        return data.iloc[start:end].reset_index(drop=True)
+    in_period = (timestamps >= start_ms) & (timestamps <= end_ms)
+    return data.loc[in_period].reset_index(drop=True)
 
 
-def prepare_data_for_backtest(pair_config, indicator_configs):
+def load_raw_data_for_backtest(pair_config, compact=False):
     """
-    Ensures both raw and enriched data are ready for a backtest for all specified timeframes.
-    Returns a dictionary of DataFrames, keyed by timeframe.
+    Raw data of a backtest period, after downloading the parts of it that are not
+    stored yet (see update_data_for_pair). Returns None if it is empty.
     """
-    
-    data_store_manager = FileStoreManager(pair_config, BACKTEST_DATA_TYPE)
+    data_store_manager = create_store_manager(pair_config, BACKTEST_DATA_TYPE)
     symbol = pair_config["symbol"]
     timeframe = pair_config["timeframe"]
-    start = pair_config["start"]
-    end = pair_config["end"]
-
-    # raw_filepath = data_store_manager.get_raw_filepath(symbol, timeframe, start_date_str, end_date_str)
-    # enriched_filepath = data_store_manager.get_processed_filepath(symbol, timeframe)
-
-    req_start = datetime.strptime(start, "%Y-%m-%d").date()
-    req_end = datetime.strptime(end, "%Y-%m-%d").date()
 
-    if not _check_file_date_range(data_store_manager, req_start, req_end):
-        print(f"⚠️  Raw data missing for {symbol} ({timeframe})")
-        # Pass the current_tf_pair_config to download_data_for_pair
-        download_data_for_pair(pair_config)
+    update_data_for_pair(pair_config)
 
-    print(f"🔄 Processing indicators for {symbol} ({timeframe})...")
-    raw_data = data_store_manager.load_dataframe(RAW_DATA_TYPE)
+    # The stored data can extend past the period (e.g. after a shorter rerun): only the period is tested
+    raw_data = period_rows(
+        data_store_manager.load_dataframe(RAW_DATA_TYPE, compact=compact, columns=MARKET_DATA_COLUMNS), pair_config
+    )
     if raw_data.empty:
         return print(f"❌ Raw data for {symbol} ({timeframe}) is empty. Skipping.")
-    
-    indicator_processor = IndicatorProcessor(indicator_configs)
+    return raw_data
+
+
+def prepare_data_for_backtest(pair_config, indicator_configs, cache=None, compact=False):
+    """
+    Ensures both raw and enriched data are ready for a backtest for all specified timeframes.
+    Returns a dictionary of DataFrames, keyed by timeframe.
+    With an IndicatorCache, indicators already computed on the same raw data are loaded from it.
+    With `compact`, the data uses compact dtypes (see compact_frame).
+    """
+    raw_data = load_raw_data_for_backtest(pair_config, compact)
+    if raw_data is None:
+        return None
+
+    print(f"🔄 Processing indicators for {pair_config['symbol']} ({pair_config['timeframe']})...")
+    data_store_manager = create_store_manager(pair_config, BACKTEST_DATA_TYPE)
+    indicator_processor = IndicatorProcessor(indicator_configs, cache=cache, compact=compact)
     enriched_data = indicator_processor.process(raw_data)
-    data_store_manager.save_dataframe(enriched_data, PROCESSED_DATA_TYPE)
+    # Saved with its datetime column, read by the visualizer, in compact mode too
+    data_store_manager.save_dataframe(with_datetime(enriched_data), PROCESSED_DATA_TYPE)
 
     # final_data = data_store_manager.load_dataframe(enriched_filepath)
     # all_timeframe_data[timeframe] = final_data
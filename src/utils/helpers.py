@@ -1,7 +1,11 @@
+import copy
 import yaml
 import re
 import importlib
 
+from module.storage_manager.factory import configure_storage
+from utils.indicator_processor import IndicatorProcessor
+
 def load_config(mode):
     """Load and merge configuration files."""
     with open("config/common_config.yaml", 'r') as f:
@@ -19,19 +23,23 @@ def load_config(mode):
 
     # Merge configs, with mode-specific config overriding common config
     config = {**common_config, **mode_config}
+    configure_storage(config)
     return config
 
 def to_snake_case(name):
     s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
-def initialize_strategy(strategy_config, data_storage, portfolio, logger=None):
+def load_strategy_class(strategy_config):
     strategy_class_name = strategy_config["class_name"]
-    strategy_params = strategy_config["parameters"]
     strategy_module_name = to_snake_case(strategy_class_name)
 
     strategy_module = importlib.import_module(f"module.strategies.{strategy_module_name}")
-    StrategyClass = getattr(strategy_module, strategy_class_name)
+    return getattr(strategy_module, strategy_class_name)
+
+def initialize_strategy(strategy_config, data_storage, portfolio, logger=None):
+    strategy_params = strategy_config["parameters"]
+    StrategyClass = load_strategy_class(strategy_config)
     
     return StrategyClass(
         data_storage=data_storage,
@@ -39,3 +47,33 @@ def initialize_strategy(strategy_config, data_storage, portfolio, logger=None):
         logger=logger,
         **strategy_params
     )
+
+def required_indicator_configs(config, *strategy_params):
+    """
+    The configured indicators the strategy reads with the given parameter sets (its
+    configured parameters by default): all of them unless the strategy declares its
+    columns (see BaseStrategy.required_columns).
+    """
+    strategy_class = load_strategy_class(config["strategy"])
+    indicator_configs = copy.deepcopy(config["indicators"])
+    columns = set()
+    for params in strategy_params or (config["strategy"]["parameters"],):
+        required = strategy_class.required_columns(params)
+        if required is None:
+            return indicator_configs
+        columns.update(required)
+    return IndicatorProcessor(indicator_configs).required_configs(columns)
+
+TIMEFRAME_UNITS_MS = {
+    "m": 60 * 1000,
+    "h": 60 * 60 * 1000,
+    "d": 24 * 60 * 60 * 1000,
+    "w": 7 * 24 * 60 * 60 * 1000,
+}
+
+def timeframe_to_ms(timeframe):
+    """Converts a ccxt-style timeframe such as '1m', '4h' or '1d' to milliseconds."""
+    unit = timeframe[-1]
+    if unit not in TIMEFRAME_UNITS_MS or not timeframe[:-1].isdigit():
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[unit]
@@ -5,23 +5,39 @@ import time
 from datetime import datetime
 from pathlib import Path
 from module.storage_manager.storage_manager_base import BACKTEST_DATA_TYPE, RAW_DATA_TYPE
-from module.storage_manager.file_store_manager import FileStoreManager
+from module.storage_manager.coverage_index import CoverageIndex
+from module.storage_manager.factory import create_store_manager
+from utils.helpers import timeframe_to_ms
+
+# Consecutive failed requests after which a fetch gives up (rate limits are always waited out)
+MAX_FETCH_ERRORS = 5
+
 
 def parse_date(date_str):
     return int(datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S").timestamp() * 1000)
 
 
-def _fetch_ohlcv(exchange, symbol, timeframe, since_ms, until_ms, pair_config):
-    """Internal function to fetch data from the exchange."""
+def _fetch_ohlcv(exchange, symbol, timeframe, since_ms, until_ms):
+    """
+    Internal function to fetch data from the exchange.
+    Returns (candles, answered_until_ms): the exchange answered for [since_ms,
+    answered_until_ms]. That is until_ms unless the fetch gave up after MAX_FETCH_ERRORS
+    failed requests in a row; an empty page counts as an answer (no candles there, e.g.
+    before a listing or during an outage).
+    """
     all_data = []
+    requested_since_ms = since_ms
+    answered_until_ms = until_ms
     limit = 1000  # Standard limit for most exchanges
     earliest_timestamp = None
+    errors = 0
 
     while since_ms < until_ms:
         try:
             data = exchange.fetch_ohlcv(
                 symbol, timeframe=timeframe, since=since_ms, limit=limit, 
             )
+            errors = 0
 
             if not data:
                 break
@@ -64,11 +80,16 @@ def _fetch_ohlcv(exchange, symbol, timeframe, since_ms, until_ms, pair_config):
             time.sleep(10)
         except Exception as e:
             print(f"[ERROR] Failed for {symbol} @ {datetime.fromtimestamp(since_ms / 1000)}: {e}")
+            errors += 1
+            if errors >= MAX_FETCH_ERRORS:
+                print(f"[ERROR] Giving up on {symbol} after {errors} failed requests: the rest of the range is fetched next time")
+                answered_until_ms = since_ms - 1
+                break
             time.sleep(5)
 
     # After fetching, filter all_data to ensure it's within the exact requested range
     # and handle potential duplicates from multiple fetches
-    final_data = [d for d in all_data if d[0] >= parse_date(f"{pair_config["start"]} 00:00:00") and d[0] <= parse_date(f"{pair_config["end"]} 23:59:59")]
+    final_data = [d for d in all_data if d[0] >= requested_since_ms and d[0] <= until_ms]
     final_data = sorted(final_data, key=lambda x: x[0])
     
     # Remove duplicates based on timestamp
@@ -79,31 +100,108 @@ def _fetch_ohlcv(exchange, symbol, timeframe, since_ms, until_ms, pair_config):
             deduplicated_data.append(d)
             seen_timestamps.add(d[0])
 
-    return deduplicated_data
+    return deduplicated_data, answered_until_ms
 
 
-def _save_to_csv(pair_config, data):
-    data_store_manager = FileStoreManager(pair_config, BACKTEST_DATA_TYPE)
-    """Internal function to save DataFrame to CSV."""
+def _to_raw_frame(data) -> pd.DataFrame:
     df = pd.DataFrame(
         data, columns=["timestamp", "open", "high", "low", "close", "volume"]
     )
     df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
-    data_store_manager.save_dataframe(df, RAW_DATA_TYPE)
+    return df
+
+
+def _exchange():
+    return ccxt.bybit({"enableRateLimit": True, "options": {"defaultType": "swap"}})
+
+
+def _requested_range(pair_config) -> tuple:
+    """(since_ms, until_ms) of the pair's start/end dates, until the last closed candle at most."""
+    since_ms = parse_date(f"{pair_config['start']} 00:00:00")
+    until_ms = parse_date(f"{pair_config['end']} 23:59:59")
+    # The candle still forming is left out (and so left uncovered): the next update fetches it once closed
+    bar_ms = timeframe_to_ms(pair_config["timeframe"])
+    now_ms = int(time.time() * 1000)
+    return since_ms, min(until_ms, now_ms - now_ms % bar_ms - 1)
 
 
 def download_data_for_pair(pair_config):
     """
-    Fetches and saves data for a single trading pair configuration.
+    Fetches and saves data for a single trading pair configuration, replacing what is
+    stored for it (see update_data_for_pair to fetch only what is missing).
     """
-    exchange = ccxt.bybit({"enableRateLimit": True, "options": {"defaultType": "swap"}})
     symbol = pair_config["symbol"]
     timeframe = pair_config["timeframe"]
-    since_ms = parse_date(f"{pair_config["start"]} 00:00:00")
-    until_ms = parse_date(f"{pair_config["end"]} 23:59:59")
+    since_ms, until_ms = _requested_range(pair_config)
+
+    data, answered_until_ms = _fetch_ohlcv(_exchange(), symbol, timeframe, since_ms, until_ms)
+    if not data:
+        raise Exception(f"No data returned for {symbol} {timeframe}")
+    data_store_manager = create_store_manager(pair_config, BACKTEST_DATA_TYPE)
+    data_store_manager.save_dataframe(_to_raw_frame(data), RAW_DATA_TYPE)
+    coverage = CoverageIndex(symbol, timeframe)
+    coverage.reset(data_store_manager.filename)
+    coverage.add(data_store_manager.filename, since_ms, answered_until_ms)
 
-    data = _fetch_ohlcv(exchange, symbol, timeframe, since_ms, until_ms, pair_config)
-    if data:
-        _save_to_csv(pair_config, data)
+
+def update_data_for_pair(pair_config) -> bool:
+    """
+    Brings the stored raw data of a trading pair configuration up to its start/end
+    range: only the parts the coverage index does not list as stored (gaps, and the
+    newest candles) are fetched, then merged into the stored data. Nothing is read from
+    storage when the index already covers the range. Data stored before the coverage
+    index existed counts as covering its first to last candle.
+    Returns True if anything was fetched.
+    """
+    symbol = pair_config["symbol"]
+    timeframe = pair_config["timeframe"]
+    bar_ms = timeframe_to_ms(timeframe)
+    data_store_manager = create_store_manager(pair_config, BACKTEST_DATA_TYPE)
+    coverage = CoverageIndex(symbol, timeframe)
+    dataset = data_store_manager.filename
+    since_ms, until_ms = _requested_range(pair_config)
+
+    indexed = bool(coverage.intervals(dataset))
+    if indexed and not coverage.gaps(dataset, since_ms, until_ms):
+        return False
+
+    stored_timestamps = data_store_manager.load_dataframe(RAW_DATA_TYPE, columns=["timestamp"])
+    if stored_timestamps.empty:
+        coverage.reset(dataset) # The data was deleted: nothing is covered
+    elif not indexed:
+        coverage.add(dataset, stored_timestamps["timestamp"].min(), stored_timestamps["timestamp"].max() + bar_ms - 1)
+    gaps = coverage.gaps(dataset, since_ms, until_ms)
+    if not gaps:
+        return False
+
+    exchange = _exchange()
+    fetched = []
+    covered = []
+    for gap_start, gap_end in gaps:
+        print(f"📥 {symbol} ({timeframe}) {datetime.fromtimestamp(gap_start / 1000)} → {datetime.fromtimestamp(gap_end / 1000)}")
+        data, answered_until_ms = _fetch_ohlcv(exchange, symbol, timeframe, gap_start, gap_end)
+        # Covered as far as the exchange answered, candles or not: gaps only end at closed candles
+        if answered_until_ms >= gap_start:
+            covered.append((gap_start, answered_until_ms))
+        fetched.extend(data)
+    if not fetched:
+        for covered_start, covered_end in covered:
+            coverage.add(dataset, covered_start, covered_end)
+        if stored_timestamps.empty:
+            raise Exception(f"No data returned for {symbol} {timeframe}")
+        return False
+
+    fetched = _to_raw_frame(fetched)
+    if not stored_timestamps.empty and fetched["timestamp"].min() > stored_timestamps["timestamp"].max():
+        # Only newer candles: appended, the stored ones are not read or rewritten
+        data_store_manager.save_dataframe(fetched, RAW_DATA_TYPE, append=True)
     else:
-        raise Exception(f"No data returned for {symbol} {timeframe}")
\ No newline at end of file
+        # Fetched candles replace stored ones with the same timestamp
+        stored = data_store_manager.load_dataframe(RAW_DATA_TYPE, columns=list(fetched.columns))
+        merged = pd.concat([stored, fetched], ignore_index=True) if not stored.empty else fetched
+        merged = merged.drop_duplicates(subset="timestamp", keep="last").sort_values("timestamp", kind="stable")
+        merged["datetime"] = pd.to_datetime(merged["timestamp"], unit="ms") # Stored as text in CSV files
+        data_store_manager.save_dataframe(merged.reset_index(drop=True), RAW_DATA_TYPE)
+    for covered_start, covered_end in covered:
+        coverage.add(dataset, covered_start, covered_end)
+    return True
@@ -0,0 +1,133 @@
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# Bump when an indicator implementation changes its output, to ignore older entries
+CACHE_VERSION = 1
+
+
+class IndicatorCache:
+    """
+    Content-addressed on-disk cache of indicator columns.
+    Each entry holds the columns one indicator added to one raw dataset, keyed by a
+    hash of the raw data and of the normalized indicator config. A changed dataset or
+    config therefore never hits a stale entry, and adding an indicator to the config
+    only computes that indicator.
+    Entries are pickled DataFrames (dtypes such as categoricals survive) named
+    `<data key>--<indicator>--<entry key>.pkl`, so they can be invalidated per dataset
+    or per indicator. Reads refresh the file's mtime and the least recently used
+    entries are evicted once the cache grows past `max_bytes`.
+    """
+    def __init__(self, path, max_bytes=None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def data_key(data_df: pd.DataFrame) -> str:
+        """Hash of a dataset's columns and values."""
+        digest = hashlib.sha256(json.dumps([str(column) for column in data_df.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(data_df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def entry_key(data_key: str, config: dict, dependencies=()) -> str:
+        """Hash of the dataset, the indicator config (key order and name case ignored) and the entries it reads from."""
+        normalized = {**config, "name": config["name"].lower()}
+        payload = json.dumps([CACHE_VERSION, data_key, normalized, list(dependencies)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _entry_path(self, data_key, name, key) -> Path:
+        return self.path / f"{data_key}--{name.lower()}--{key}.pkl"
+
+    def get(self, data_key, name, key):
+        """The cached columns, or None."""
+        entry_path = self._entry_path(data_key, name, key)
+        try:
+            columns = pd.read_pickle(entry_path)
+        except (OSError, EOFError, ValueError):
+            return None
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass # Evicted by another process since it was read
+        return columns
+
+    def put(self, data_key, name, key, columns: pd.DataFrame):
+        entry_path = self._entry_path(data_key, name, key)
+        temporary = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        columns.reset_index(drop=True).to_pickle(temporary)
+        os.replace(temporary, entry_path)
+        self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used entries until the cache fits in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        entries = []
+        for entry_path in self.path.glob("*.pkl"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total -= size
+
+    def invalidate(self, data_key=None, name=None) -> int:
+        """
+        Deletes the entries of one dataset and/or one indicator name (all entries if
+        neither is given). Returns the number of entries deleted.
+        """
+        pattern = f"{data_key or '*'}--{name.lower() if name else '*'}--*.pkl"
+        deleted = 0
+        for entry_path in self.path.glob(pattern):
+            entry_path.unlink(missing_ok=True)
+            deleted += 1
+        return deleted
+
+    def size(self) -> int:
+        """Total size of the entries, in bytes."""
+        return sum(entry_path.stat().st_size for entry_path in self.path.glob("*.pkl"))
+
+
+def create_indicator_cache(config):
+    """The IndicatorCache of `backtest_settings.indicator_cache`, or None when it is disabled."""
+    settings = config["backtest_settings"].get("indicator_cache") or {}
+    if not settings.get("enabled", False):
+        return None
+    max_size_mb = settings.get("max_size_mb")
+    return IndicatorCache(
+        settings.get("path", "./data/cache/indicators"),
+        max_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb else None,
+    )
+
+
+def main():
+    from utils.helpers import load_config
+
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the indicator cache.")
+    parser.add_argument("--data", default=None, help="only the entries of this data key")
+    parser.add_argument("--indicator", default=None, help="only the entries of this indicator name")
+    parser.add_argument("--size", action="store_true", help="print the cache size instead of invalidating")
+    args = parser.parse_args()
+
+    config = load_config('backtest')
+    settings = config["backtest_settings"].get("indicator_cache") or {}
+    cache = IndicatorCache(settings.get("path", "./data/cache/indicators"))
+    if args.size:
+        print(f"📦 Indicator cache {cache.path}: {cache.size() / 1024 / 1024:.1f} MB")
+        return
+    print(f"🗑️  Deleted {cache.invalidate(args.data, args.indicator)} cached indicator entries from {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
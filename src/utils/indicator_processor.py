@@ -1,12 +1,21 @@
 import pandas as pd
+from module.data_manager.compact import compact_frame
+from module.data_manager.lazy_columns import LazyColumns
+from module.indicators.context import IndicatorContext
 from module.indicators.factory import create_indicator
 
 class IndicatorProcessor:
-    def __init__(self, indicator_configs: list):
+    def __init__(self, indicator_configs: list, cache=None, compact: bool = False):
         """
         Initializes the IndicatorProcessor by creating a list of indicator
         instances based on the provided configurations.
+        With an IndicatorCache, `process` reuses the columns cached for the same data
+        and indicator config and only computes the missing indicators.
+        With `compact`, outputs use compact dtypes (see compact_frame).
         """
+        self.configs = [config.copy() for config in indicator_configs]
+        self.cache = cache
+        self.compact = compact
         self.indicators = []
         for config in indicator_configs:
             # Make a copy so we don't modify the original config dict
@@ -16,11 +25,148 @@ class IndicatorProcessor:
             indicator = create_indicator(name, **config_copy)
             self.indicators.append(indicator)
 
+    @property
+    def warmup(self) -> int:
+        """Bars needed before every configured indicator is reliable."""
+        return max((indicator.warmup for indicator in self.indicators), default=0)
+
     def process(self, data_df: pd.DataFrame) -> pd.DataFrame:
         """
         Processes a DataFrame by applying all configured indicators in sequence.
+        The indicators share one IndicatorContext, so common intermediates (true range,
+        ATR, rolling means, ...) are computed once, and the output frame is built once
+        at the end instead of being copied and extended per indicator. `data_df` is not
+        modified.
+        """
+        context = IndicatorContext(data_df)
+        if self.cache is None:
+            for indicator in self.indicators:
+                context.add(indicator.compute(context))
+        else:
+            self._compute_cached(context)
+        return compact_frame(context.to_frame()) if self.compact else context.to_frame()
+
+    def batch_groups(self) -> tuple:
+        """
+        Splits the configured indicators into (single_configs, batches).
+        A batch is two or more configs of one batchable indicator (see
+        `Indicator.compute_batch`) that differ only in its `batch_parameter`, as a list
+        of (config, indicator) pairs. Indicators whose output another config reads as
+        its `column` stay single, so they are in the frame built from single_configs.
+        """
+        read_columns = {config["column"] for config in self.configs if "column" in config}
+        groups = {}
+        for config, indicator in zip(self.configs, self.indicators):
+            key = None
+            if indicator.batch_parameter is not None and indicator.column_name not in read_columns:
+                excluded = ("name", "custom_name", indicator.batch_parameter)
+                shared = {name: value for name, value in config.items() if name not in excluded}
+                key = (config["name"].lower(), type(indicator), tuple(sorted(shared.items(), key=repr)))
+            groups.setdefault(key or id(indicator), []).append((config, indicator))
+
+        single_configs, batches = [], []
+        for members in groups.values():
+            if len(members) > 1 and members[0][1].batch_parameter is not None:
+                batches.append(members)
+            else:
+                single_configs.extend(config for config, _ in members)
+        return single_configs, batches
+
+    @staticmethod
+    def compute_batches(data_df: pd.DataFrame, batches: list) -> list:
+        """
+        Computes each batch of `batch_groups` on `data_df` in one pass.
+        Returns [(column names, (bars x columns) array)], one per batch.
+        """
+        context = IndicatorContext(data_df)
+        results = []
+        for members in batches:
+            indicators = [indicator for _, indicator in members]
+            matrix = type(indicators[0]).compute_batch(context, indicators)
+            results.append(([indicator.column_name for indicator in indicators], matrix))
+        return results
+
+    def _compute_cached(self, context):
+        """Adds each indicator's columns to `context` from the cache, or computes and stores them."""
+        cache_keys = self.cache_keys(context.data_df)
+        for index in range(len(self.indicators)):
+            context.add(self.compute_indicator(context, index, cache_keys))
+
+    def cache_keys(self, data_df: pd.DataFrame):
+        """(data key, cache entry key of each indicator) for `data_df`, or None without a cache."""
+        if self.cache is None:
+            return None
+        data_key = self.cache.data_key(data_df)
+        raw_columns = set(data_df.columns)
+        entry_keys = []
+        for config in self.configs:
+            # An indicator reading another indicator's column depends on the entries before it
+            reads_computed_column = "column" in config and config["column"] not in raw_columns
+            entry_keys.append(self.cache.entry_key(data_key, config, list(entry_keys) if reads_computed_column else ()))
+        return data_key, entry_keys
+
+    def compute_indicator(self, context, index: int, cache_keys=None) -> dict:
+        """
+        Output columns of the indicator at `index`, loaded from the cache (with the
+        `cache_keys` of the dataset) or computed on `context` and stored.
+        The columns it reads must already be in the context.
+        """
+        indicator = self.indicators[index]
+        if cache_keys is None:
+            return indicator.compute(context)
+
+        data_key, entry_keys = cache_keys
+        name = self.configs[index]["name"]
+        columns = self.cache.get(data_key, name, entry_keys[index])
+        if columns is not None and len(columns) == len(context.data_df):
+            return {column: columns[column].array for column in columns.columns}
+
+        outputs = indicator.compute(context)
+        self.cache.put(data_key, name, entry_keys[index], pd.DataFrame(outputs))
+        return outputs
+
+    def required_configs(self, columns) -> list:
+        """
+        The configs of the indicators needed for `columns`: those producing one of them,
+        plus the indicators they read through their `column` parameter. Indicators that
+        do not declare their output columns are always kept.
+        """
+        needed = set(columns)
+        required = []
+        # Indicators read columns of indicators configured before them: walk back from the readers
+        for config, indicator in reversed(list(zip(self.configs, self.indicators))):
+            outputs = indicator.output_columns
+            if outputs is None or needed.intersection(outputs):
+                required.append(config)
+                if "column" in config:
+                    needed.add(config["column"])
+        return [config.copy() for config in reversed(required)]
+
+    def lazy_columns(self, data_df: pd.DataFrame):
+        """The column arrays of `data_df` with the indicator columns computed on first access (see LazyColumns)."""
+        return LazyColumns(data_df, self)
+
+    @property
+    def streaming(self) -> bool:
+        """True if every configured indicator supports `seed` / `update`."""
+        return all(indicator.streaming for indicator in self.indicators)
+
+    def seed(self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Like `process` (one shared IndicatorContext, one output frame), but also prepares
+        every indicator for `update`. `data_df` is not modified.
+        """
+        context = IndicatorContext(data_df)
+        for indicator in self.indicators:
+            context.add(indicator.seed(context))
+        return compact_frame(context.to_frame()) if self.compact else context.to_frame()
+
+    def update(self, candle: dict) -> dict:
+        """
+        Advances every indicator by one candle, after `seed`, in configuration order.
+        Returns the candle's columns with the indicator values added.
         """
-        processed_data = data_df.copy()
+        row = dict(candle)
         for indicator in self.indicators:
-            processed_data = indicator.apply(processed_data)
-        return processed_data
\ No newline at end of file
+            row.update(indicator.update(row))
+        return row
@@ -0,0 +1,130 @@
+"""
+Stop-loss and trailing-stop simulation kernel.
+
+Given an open trade (entry bar, side, initial stop) and the OHLC arrays, finds the bar
+where the trade exits, the fill price and the reason, in a single call. The rules are
+the ones of BaseStrategy's event loop, applied from the bar after the entry:
+
+1. Gap through the stop at the open -> fill at the open.
+2. Stop touched during the bar -> fill at the stop.
+3. Otherwise the trailing stop (if enabled) tightens towards close * (1 -/+ pct), but
+   never to a level that would liquidate at that close.
+4. Then an exit signal (a non-NaN, non-zero entry in `exit_prices`) closes the trade at
+   its price.
+
+The kernel is JIT-compiled with numba when it is installed and falls back to a
+chunked pure-NumPy scan otherwise. Both return identical results.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+EXIT_NONE = 0
+EXIT_STOP_GAP = 1
+EXIT_STOP = 2
+EXIT_SIGNAL = 3
+
+# Bars scanned per step by the NumPy fallback; doubled after each miss.
+SCAN_CHUNK = 256
+
+
+def _resolve_exit_loop(entry_index, is_long, stop, open_, high, low, close, trailing_pct, exit_prices):
+    """Bar-by-bar reference implementation, compiled by numba when available."""
+    has_trailing = trailing_pct == trailing_pct  # NaN disables trailing
+    has_exits = len(exit_prices) > 0
+    for bar in range(entry_index + 1, len(close)):
+        if is_long:
+            if open_[bar] <= stop:
+                return bar, open_[bar], EXIT_STOP_GAP, stop
+            if low[bar] <= stop:
+                return bar, stop, EXIT_STOP, stop
+            if has_trailing:
+                trail = close[bar] * (1 - trailing_pct)
+                if trail > stop and trail < close[bar]:
+                    stop = trail
+        else:
+            if open_[bar] >= stop:
+                return bar, open_[bar], EXIT_STOP_GAP, stop
+            if high[bar] >= stop:
+                return bar, stop, EXIT_STOP, stop
+            if has_trailing:
+                trail = close[bar] * (1 + trailing_pct)
+                if trail < stop and trail > close[bar]:
+                    stop = trail
+        if has_exits:
+            price = exit_prices[bar]
+            if np.isfinite(price) and price != 0:
+                return bar, price, EXIT_SIGNAL, stop
+    return -1, np.nan, EXIT_NONE, stop
+
+
+if NUMBA_AVAILABLE:
+    _resolve_exit_jit = njit(cache=True, nogil=True)(_resolve_exit_loop)
+
+
+def _stops_in_effect(stop, close, is_long, trailing_pct):
+    """Stop level in effect at each bar of a chunk, plus the stop carried past its last bar."""
+    if trailing_pct != trailing_pct:
+        return np.full(len(close) + 1, stop, dtype=float)
+    if is_long:
+        trail = close * (1 - trailing_pct)
+        trail = np.where(trail < close, trail, -np.inf)
+        return np.maximum.accumulate(np.concatenate(([stop], trail)))
+    trail = close * (1 + trailing_pct)
+    trail = np.where(trail > close, trail, np.inf)
+    return np.minimum.accumulate(np.concatenate(([stop], trail)))
+
+
+def _resolve_exit_numpy(entry_index, is_long, stop, open_, high, low, close, trailing_pct, exit_prices):
+    """Vectorized fallback: scans growing chunks of bars with array operations."""
+    start, length, chunk = entry_index + 1, len(close), SCAN_CHUNK
+    while start < length:
+        end = min(start + chunk, length)
+        bars = slice(start, end)
+        stops = _stops_in_effect(stop, close[bars], is_long, trailing_pct)
+        if is_long:
+            gap = open_[bars] <= stops[:-1]
+            intrabar = low[bars] <= stops[:-1]
+        else:
+            gap = open_[bars] >= stops[:-1]
+            intrabar = high[bars] >= stops[:-1]
+        events = gap | intrabar
+        if len(exit_prices):
+            events |= np.isfinite(exit_prices[bars]) & (exit_prices[bars] != 0)
+        if events.any():
+            offset = int(np.argmax(events))
+            bar = start + offset
+            if gap[offset]:
+                return bar, open_[bar], EXIT_STOP_GAP, stops[offset]
+            if intrabar[offset]:
+                return bar, stops[offset], EXIT_STOP, stops[offset]
+            return bar, exit_prices[bar], EXIT_SIGNAL, stops[offset + 1]
+        stop, start, chunk = stops[-1], end, chunk * 2
+    return -1, np.nan, EXIT_NONE, stop
+
+
+def resolve_exit(entry_index, side, initial_stop, open_, high, low, close,
+                 trailing_stop_pct=None, exit_prices=None):
+    """
+    Finds the exit of a trade opened at bar `entry_index`.
+
+    :param side: "buy" for a long trade, "sell" for a short one.
+    :param trailing_stop_pct: Trailing distance as a fraction, or None to disable trailing.
+    :param exit_prices: Optional array of strategy exit prices (NaN where there is no exit).
+    :return: (exit_bar, price, reason, stop_loss). exit_bar is -1 and reason EXIT_NONE if
+             the trade is still open at the end of the data; stop_loss is the (trailed)
+             stop at the time of exit.
+    """
+    arrays = [np.asarray(values, dtype=np.float64) for values in (open_, high, low, close)]
+    exit_prices = np.empty(0) if exit_prices is None else np.asarray(exit_prices, dtype=np.float64)
+    trailing_pct = np.nan if trailing_stop_pct is None else float(trailing_stop_pct)
+    resolve = _resolve_exit_jit if NUMBA_AVAILABLE else _resolve_exit_numpy
+
+    bar, price, reason, stop = resolve(
+        int(entry_index), side == "buy", float(initial_stop), *arrays, trailing_pct, exit_prices
+    )
+    return int(bar), float(price), int(reason), float(stop)
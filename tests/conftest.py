@@ -0,0 +1,124 @@
+"""
+Shared fixtures. The code under test imports its packages from `src/` (as when run from
+that directory), and every test runs in its own temporary working directory so the
+`./data` tree the engines write stays out of the repository.
+"""
+import asyncio
+import copy
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from module.data_manager.historical_data_manager import HistoricalDataStorage  # noqa: E402
+from module.engine.backtest_engine import BacktestEngine  # noqa: E402
+from module.storage_manager.factory import configure_storage  # noqa: E402
+from utils.helpers import load_config  # noqa: E402
+from utils.indicator_processor import IndicatorProcessor  # noqa: E402
+
+BAR_MS = 4 * 3600 * 1000
+PAIR_CONFIG = {"symbol": "BTC/USDT", "timeframe": "4h", "start": "2024-01-01", "end": "2024-12-31"}
+INDICATORS = [
+    {"name": "ma_high", "period": 20},
+    {"name": "ma_low", "period": 20},
+    {"name": "supertrend", "period": 10, "multiplier": 2},
+    {"name": "EMA", "period": 12},
+    {"name": "EMA", "period": 26},
+]
+
+
+def make_candles(bars=2000, seed=0, start=1704067200000, bar_ms=BAR_MS) -> pd.DataFrame:
+    """Random-walk OHLCV candles with a datetime column, as the fetcher stores them."""
+    rng = np.random.default_rng(seed)
+    close = 40000 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.002, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, bars)))
+    timestamps = start + np.arange(bars, dtype=np.int64) * bar_ms
+    candles = pd.DataFrame({
+        "timestamp": timestamps, "open": open_, "high": high, "low": low, "close": close,
+        "volume": rng.uniform(1, 100, bars),
+    })
+    candles["datetime"] = pd.to_datetime(candles["timestamp"], unit="ms")
+    return candles
+
+
+def trade_records(summary: dict) -> pd.DataFrame:
+    """The trades of a summary as a frame, for comparing runs."""
+    return pd.DataFrame(summary["trades"]).reset_index(drop=True)
+
+
+def assert_same_run(summary: dict, baseline: dict):
+    """Same trades (sides, bars, prices, reasons) and the same P&L as the baseline run."""
+    assert summary["total_trades"] == baseline["total_trades"]
+    trades, expected = trade_records(summary), trade_records(baseline)
+    columns = ["type", "entry_step", "exit_step", "exit_reason"]
+    pd.testing.assert_frame_equal(trades[columns], expected[columns])
+    for column in ("entry_price", "exit_price", "net_profit_loss"):
+        np.testing.assert_allclose(trades[column].astype(float), expected[column].astype(float), rtol=1e-9)
+    assert summary["final_capital"] == pytest.approx(baseline["final_capital"], rel=1e-9)
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Runs each test in an empty directory with the default (csv) storage backend."""
+    monkeypatch.chdir(tmp_path)
+    configure_storage({})
+    yield tmp_path
+    configure_storage({})
+
+
+@pytest.fixture(scope="session")
+def repo_config() -> dict:
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        return load_config("backtest")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def config(repo_config) -> dict:
+    """The repository's backtest config on one pair, with the test indicators and trailing stops."""
+    config = copy.deepcopy(repo_config)
+    config["indicators"] = copy.deepcopy(INDICATORS)
+    config["strategy"]["parameters"]["trailing_stop_enabled"] = True
+    config["backtest_settings"].update(symbols=["BTC/USDT"], timeframes=["4h"], periods={2024: []})
+    return config
+
+
+@pytest.fixture(scope="session")
+def candles() -> pd.DataFrame:
+    return make_candles()
+
+
+@pytest.fixture(scope="session")
+def enriched(candles) -> pd.DataFrame:
+    return IndicatorProcessor(copy.deepcopy(INDICATORS)).process(candles)
+
+
+def run_strategy(config: dict, data_storage, engine_class=BacktestEngine, strategy_config=None) -> dict:
+    """Backtests the configured strategy over `data_storage` with `engine_class`. Returns the summary."""
+    engine = engine_class(config)
+    strategy = engine._create_strategy(data_storage, PAIR_CONFIG, strategy_config)
+    return asyncio.run(engine._execute_backtest(strategy))
+
+
+@pytest.fixture
+def baseline_run(config):
+    """
+    Runs the baseline event engine: the event-driven BacktestEngine on the async
+    driver, which every faster path must reproduce.
+    """
+    def run(enriched_data: pd.DataFrame, strategy_config=None) -> dict:
+        baseline_config = copy.deepcopy(config)
+        baseline_config["backtest_settings"].update(engine="event", driver="async")
+        return run_strategy(baseline_config, HistoricalDataStorage(enriched_data.copy()), strategy_config=strategy_config)
+    return run
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from module.data_manager.data_manager_base import DataManagerError, DataStorageBase
+from module.data_manager.historical_data_manager import HistoricalDataStorage
+
+
+def test_candles_and_window_match_frame_rows(enriched):
+    storage = HistoricalDataStorage(enriched.copy(), window_size=50)
+    for step in range(1, 301):
+        candle, window = storage.next_processed_data()
+        row = enriched.iloc[step - 1]
+        assert candle["timestamp"] == row["timestamp"]
+        assert candle["close"] == row["close"]
+        assert candle["superTrendDirection"] == row["superTrendDirection"] or pd.isna(row["superTrendDirection"])
+        assert storage.current_step == step
+        assert storage.current_date == row["datetime"]
+        assert len(window) == min(step, 50)
+        np.testing.assert_array_equal(window["close"], enriched["close"].to_numpy()[max(0, step - 50):step])
+    previous = storage.previous_candle_of(10)
+    assert previous["timestamp"] == enriched["timestamp"].iloc[289]
+    assert storage.previous_candle_of(50) is None
+
+
+def test_window_columns_are_views(enriched):
+    storage = HistoricalDataStorage(enriched.copy())
+    _, window = storage.next_processed_data()
+    assert np.shares_memory(window["close"], storage.arrays["close"])
+
+
+def test_data_df_is_the_window(enriched):
+    storage = HistoricalDataStorage(enriched.copy(), window_size=20)
+    storage.seek(100)
+    expected = enriched.iloc[80:100].reset_index(drop=True)
+    pd.testing.assert_series_equal(storage.data_df["close"], expected["close"])
+
+
+def test_compact_storage_keeps_prices_and_dates(enriched):
+    storage = HistoricalDataStorage(enriched.copy(), compact=True)
+    assert storage.arrays["close"].dtype == np.float64
+    storage.seek(len(enriched))
+    assert storage.current_date == enriched["datetime"].iloc[-1]
+    assert storage.arrays["superTrendDirection"].codes.dtype == np.int8
+
+
+def test_sync_access_capability():
+    assert HistoricalDataStorage.supports_sync
+    assert not DataStorageBase.supports_sync
+
+    class AsyncOnlyStorage(HistoricalDataStorage):
+        supports_sync = False
+        next_processed_data = DataStorageBase.next_processed_data
+
+    storage = AsyncOnlyStorage(pd.DataFrame({"timestamp": [0], "close": [1.0]}))
+    with pytest.raises(DataManagerError):
+        storage.next_processed_data()
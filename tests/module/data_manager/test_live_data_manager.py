@@ -0,0 +1,68 @@
+import asyncio
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import INDICATORS, make_candles
+from module.data_manager.live_data_manager import LiveDataManager
+from utils.indicator_processor import IndicatorProcessor
+
+WINDOW = 500
+# More candles than the buffers hold (twice the window), so they are compacted once
+CANDLES = make_candles(bars=1100, seed=8)[["timestamp", "open", "high", "low", "close", "volume"]]
+
+
+def simulate(candles: pd.DataFrame):
+    """
+    Feeds `candles` to a simulated live storage. Returns it and, for every candle, the
+    (candle, window, view of the window's last closes) it produced.
+    """
+    storage = LiveDataManager("BTC/USDT", "1h", [], copy.deepcopy(INDICATORS), None, simulation_data=candles)
+
+    async def run():
+        produced = []
+        while True:
+            candle, window = await storage.get_next_processed_data()
+            if candle is None:
+                return produced
+            produced.append((candle, window, window["close"][-3:]))
+
+    return storage, asyncio.run(run())
+
+
+@pytest.fixture(scope="module")
+def simulated(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path_factory.mktemp("live"))
+        return simulate(CANDLES)
+
+
+def test_streamed_window_matches_batch_indicators(simulated):
+    candles = CANDLES
+    storage, produced = simulated
+    assert len(produced) == len(candles)
+
+    expected = IndicatorProcessor(copy.deepcopy(INDICATORS)).process(candles).tail(WINDOW).reset_index(drop=True)
+    window = storage.data_df
+    assert len(window) == WINDOW
+    for column in expected.columns:
+        if expected[column].dtype.kind == "f":
+            np.testing.assert_allclose(window[column].astype(float), expected[column], rtol=1e-9, equal_nan=True)
+    assert window["superTrendDirection"].tolist() == expected["superTrendDirection"].astype(object).tolist()
+    assert storage.previous_candle_of(WINDOW - 1)["timestamp"] == expected["timestamp"].iloc[0]
+    assert storage.previous_candle_of(WINDOW) is None
+
+
+def test_earlier_candles_and_views_keep_their_values(simulated):
+    candles = CANDLES
+    _, produced = simulated
+    closes = candles["close"].to_numpy()
+    for step, (candle, _, last_closes) in enumerate(produced):
+        assert candle["timestamp"] == candles["timestamp"].iloc[step]
+        assert candle["close"] == closes[step]
+        np.testing.assert_array_equal(last_closes, closes[max(0, step - 2):step + 1])
+    window = produced[-1][1]
+    assert window is produced[0][1]
+    np.testing.assert_array_equal(window["close"], closes[-WINDOW:])
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from module.data_manager.historical_data_manager import HistoricalDataStorage
+from module.data_manager.shared_columns import SharedColumns
+
+
+def test_attached_columns_match_the_original(enriched):
+    arrays = HistoricalDataStorage(enriched.copy(), compact=True).arrays
+    matrix = np.column_stack([enriched["close"].to_numpy(), enriched["open"].to_numpy()])
+    shared = SharedColumns.create(arrays, [(["a", "b"], matrix)])
+    try:
+        with SharedColumns.attach(shared.spec) as attached:
+            for column in ("timestamp", "close", "superTrend"):
+                np.testing.assert_array_equal(attached.arrays[column], arrays[column])
+            assert list(attached.arrays["superTrendDirection"]) == list(arrays["superTrendDirection"])
+            assert (pd.DatetimeIndex(attached.arrays["datetime"]) == pd.DatetimeIndex(arrays["datetime"])).all()
+            np.testing.assert_array_equal(attached.arrays["b"], enriched["open"].to_numpy())
+            assert attached.arrays["b"].flags.c_contiguous
+        assert attached.arrays == {}
+    finally:
+        shared.close()
+        shared.unlink()
@@ -0,0 +1,79 @@
+import asyncio
+import copy
+import json
+import os
+
+import pytest
+
+import module.engine.backtest_engine as backtest_engine
+import utils.backtestHelpers as backtest_helpers
+from conftest import PAIR_CONFIG, assert_same_run, make_candles, run_strategy
+from module.data_manager.historical_data_manager import HistoricalDataStorage
+from module.engine.backtest_engine import BacktestEngine
+from module.storage_manager.factory import create_store_manager
+from module.storage_manager.storage_manager_base import RAW_DATA_TYPE
+from utils.indicator_processor import IndicatorProcessor
+
+
+@pytest.fixture
+def stored_candles(monkeypatch):
+    """Serves synthetic candles for every period instead of downloading them."""
+    def update_data_for_pair(pair_config):
+        seed = sum(map(ord, pair_config["symbol"] + pair_config.get("month", "all")))
+        create_store_manager(pair_config).save_dataframe(make_candles(bars=2200, seed=seed), RAW_DATA_TYPE)
+
+    monkeypatch.setattr(backtest_helpers, "update_data_for_pair", update_data_for_pair)
+    monkeypatch.setattr(backtest_engine, "update_data_for_pair", update_data_for_pair)
+
+
+def summaries() -> dict:
+    """(trades, final capital) of every saved summary, by file name."""
+    directory = "data/backtest/summary"
+    results = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name)) as f:
+            summary = json.load(f)
+        results[name] = (summary["total_trades"], summary["final_capital"])
+    return results
+
+
+def test_sync_driver_matches_baseline(config, enriched, baseline_run):
+    summary = run_strategy(config, HistoricalDataStorage(enriched.copy()))
+    assert summary["total_trades"] > 20
+    assert_same_run(summary, baseline_run(enriched))
+
+
+def test_lazy_indicators_match_baseline(config, candles, enriched, baseline_run):
+    processor = IndicatorProcessor(copy.deepcopy(config["indicators"]))
+    summary = run_strategy(config, HistoricalDataStorage.lazy(candles.copy(), processor))
+    assert_same_run(summary, baseline_run(enriched))
+
+
+def test_compact_dtypes_match_baseline(config, enriched, baseline_run):
+    summary = run_strategy(config, HistoricalDataStorage(enriched.copy(), compact=True))
+    assert_same_run(summary, baseline_run(enriched))
+
+
+def test_parallel_run_matches_serial_run(config, stored_candles):
+    config["backtest_settings"].update(symbols=["BTC/USDT", "ETH/USDT"], periods={2024: ["january", "march"]})
+    asyncio.run(BacktestEngine(config).run())
+    serial = summaries()
+    assert len(serial) == 4
+
+    os.rename("data/backtest/summary", "data/backtest/serial_summary")
+    config["backtest_settings"]["parallel"] = {"enabled": True, "workers": 2, "chunksize": 1}
+    asyncio.run(BacktestEngine(config).run())
+    assert summaries() == serial
+
+
+def test_job_key_covers_result_settings(config):
+    engine = BacktestEngine(config)
+    key = engine._job_key(PAIR_CONFIG)
+    for setting, value in (("engine", "vectorized"), ("lazy_indicators", False), ("compact_dtypes", {"enabled": True})):
+        changed = copy.deepcopy(config)
+        changed["backtest_settings"][setting] = value
+        assert BacktestEngine(changed)._job_key(PAIR_CONFIG) != key
+
+    changed = copy.deepcopy(config)
+    changed["backtest_settings"]["checkpoint"] = {"enabled": True}
+    assert BacktestEngine(changed)._job_key(PAIR_CONFIG) == key
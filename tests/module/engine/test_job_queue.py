@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from module.engine.job_queue import DONE, FAILED, PENDING, RUNNING, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "queue" / "jobs.sqlite", stale_after=60, max_attempts=2, timeout=5)
+
+
+def expire_heartbeats(queue, seconds):
+    """Ages the heartbeats of the running jobs, as if their workers had died `seconds` ago."""
+    with queue._transaction() as connection:
+        connection.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - ? WHERE status = ?", (seconds, RUNNING))
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue([{"symbol": "BTC/USDT"}, {"symbol": "ETH/USDT"}]) == 2
+    assert queue.enqueue([{"symbol": "ETH/USDT"}, {"symbol": "SOL/USDT"}]) == 1
+    assert queue.enqueue([{"symbol": "BTC/USDT", "x": 1}], keys=[JobQueue.job_key({"symbol": "BTC/USDT"})]) == 0
+    assert queue.counts()[PENDING] == 3
+
+
+def test_claim_and_complete(queue):
+    queue.enqueue([{"n": 1}, {"n": 2}])
+    first, second = queue.claim("a"), queue.claim("b")
+    assert first[2] == {"n": 1} and second[2] == {"n": 2}
+    assert queue.claim("c") is None
+    assert queue.heartbeat(first[0], first[1])
+    assert not queue.complete(first[0], second[1])
+    assert queue.complete(first[0], first[1])
+    assert queue.counts() == {PENDING: 0, RUNNING: 1, DONE: 1, FAILED: 0}
+
+
+def test_stale_job_is_reclaimed_and_late_result_ignored(queue):
+    queue.enqueue([{"n": 1}])
+    job_id, lost_token, _ = queue.claim("dead")
+    expire_heartbeats(queue, 61)
+
+    job_id_again, token, payload = queue.claim("alive")
+    assert (job_id_again, payload) == (job_id, {"n": 1})
+    assert not queue.heartbeat(job_id, lost_token)
+    assert not queue.complete(job_id, lost_token)
+    assert queue.complete(job_id, token)
+    assert queue.jobs(DONE)[0]["attempts"] == 2
+
+
+def test_stale_job_fails_after_max_attempts(queue):
+    queue.enqueue([{"n": 1}])
+    for _ in range(2):
+        queue.claim("dead")
+        expire_heartbeats(queue, 61)
+    assert queue.claim("next") is None
+    job = queue.jobs(FAILED)[0]
+    assert job["error"] == "worker heartbeat lost"
+
+
+def test_failed_attempts_are_retried_then_reset(queue):
+    queue.enqueue([{"n": 1}])
+    job_id, token, _ = queue.claim("a")
+    assert queue.fail(job_id, token, "boom")
+    assert queue.counts()[PENDING] == 1
+
+    job_id, token, _ = queue.claim("a")
+    assert queue.fail(job_id, token, "boom again")
+    assert queue.counts()[FAILED] == 1
+    assert queue.claim("a") is None
+
+    assert queue.reset_failed() == 1
+    job_id, token, _ = queue.claim("a")
+    assert queue.complete(job_id, token)
+    assert queue.jobs(DONE)[0]["attempts"] == 1
+
+
+def test_keep_alive_refreshes_heartbeat_and_survives_errors(queue, monkeypatch):
+    queue.enqueue([{"n": 1}])
+    job_id, token, _ = queue.claim("a")
+    calls = []
+    heartbeat = queue.heartbeat
+
+    def flaky_heartbeat(job_id, token):
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return heartbeat(job_id, token)
+
+    monkeypatch.setattr(queue, "heartbeat", flaky_heartbeat)
+    started = queue.jobs(RUNNING)[0]["heartbeat_at"]
+    with queue.keep_alive(job_id, token, interval=0.05):
+        deadline = time.time() + 5
+        while len(calls) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    assert len(calls) >= 3
+    assert queue.jobs(RUNNING)[0]["heartbeat_at"] > started
@@ -0,0 +1,52 @@
+import asyncio
+import copy
+
+import pandas as pd
+import pytest
+
+import module.engine.backtest_engine as backtest_engine
+import utils.backtestHelpers as backtest_helpers
+from conftest import make_candles
+from module.engine.factory import create_backtest_engine
+from module.storage_manager.factory import create_store_manager
+from module.storage_manager.storage_manager_base import RAW_DATA_TYPE
+from module.strategies.moving_average_strategy import MovingAverageStrategy
+from utils.indicator_processor import IndicatorProcessor
+
+SWEEP_PAIR_CONFIG = {"symbol": "BTC/USDT", "timeframe": "4h", "start": "2024-01-01", "end": "2024-12-31", "month": "all"}
+
+
+@pytest.fixture
+def stored_candles(monkeypatch):
+    def update_data_for_pair(pair_config):
+        create_store_manager(pair_config).save_dataframe(make_candles(bars=2200, seed=3), RAW_DATA_TYPE)
+
+    monkeypatch.setattr(backtest_helpers, "update_data_for_pair", update_data_for_pair)
+    monkeypatch.setattr(backtest_engine, "update_data_for_pair", update_data_for_pair)
+
+
+@pytest.mark.parametrize("engine", ["event", "vectorized"])
+def test_sweep_matches_baseline_runs(config, baseline_run, stored_candles, engine):
+    settings = config["backtest_settings"]
+    settings["engine"] = engine
+    settings["sweep"].update(
+        enabled=True, method="grid", workers=2,
+        parameters={"ma_period": [20, 50], "supertrend_multiplier": [2, 3], "trailing_stop_pct": [0.02]},
+    )
+    asyncio.run(create_backtest_engine(config).run())
+    table = create_store_manager(SWEEP_PAIR_CONFIG).load_dataframe("sweep")
+    assert len(table) == 4
+
+    raw = backtest_helpers.load_raw_data_for_backtest(SWEEP_PAIR_CONFIG)
+    for row in table.itertuples():
+        parameters = {
+            **config["strategy"]["parameters"], "ma_period": int(row.ma_period),
+            "supertrend_multiplier": int(row.supertrend_multiplier), "trailing_stop_pct": float(row.trailing_stop_pct),
+        }
+        parameters, indicators = MovingAverageStrategy.sweep_setup(parameters)
+        enriched = IndicatorProcessor(copy.deepcopy(config["indicators"] + indicators)).process(raw)
+        baseline = baseline_run(enriched, {**config["strategy"], "parameters": parameters})
+        assert row.total_trades == baseline["total_trades"]
+        assert row.final_capital == pytest.approx(baseline["final_capital"], rel=1e-9)
+    assert table["net_profit"].is_monotonic_decreasing
+    assert pd.Series(table["rank"]).tolist() == [1, 2, 3, 4]
@@ -0,0 +1,26 @@
+import pytest
+
+from conftest import assert_same_run, make_candles, run_strategy
+from module.data_manager.historical_data_manager import HistoricalDataStorage
+from module.engine.vectorized_backtest_engine import VectorizedBacktestEngine
+from utils.indicator_processor import IndicatorProcessor
+
+
+@pytest.mark.parametrize("trailing_stop_enabled", [True, False])
+def test_vectorized_engine_matches_baseline(config, enriched, baseline_run, trailing_stop_enabled):
+    config["strategy"]["parameters"]["trailing_stop_enabled"] = trailing_stop_enabled
+    summary = run_strategy(config, HistoricalDataStorage(enriched.copy()), VectorizedBacktestEngine)
+    assert summary["total_trades"] > 20
+    assert_same_run(summary, baseline_run(enriched))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vectorized_engine_matches_baseline_on_other_series(config, baseline_run, seed):
+    enriched = IndicatorProcessor(config["indicators"]).process(make_candles(bars=1500, seed=seed))
+    summary = run_strategy(config, HistoricalDataStorage(enriched.copy()), VectorizedBacktestEngine)
+    assert_same_run(summary, baseline_run(enriched))
+
+
+def test_vectorized_engine_with_compact_dtypes_matches_baseline(config, enriched, baseline_run):
+    summary = run_strategy(config, HistoricalDataStorage(enriched.copy(), compact=True), VectorizedBacktestEngine)
+    assert_same_run(summary, baseline_run(enriched))
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import utils.historical_data_fetcher as fetcher
+from module.storage_manager.coverage_index import CoverageIndex
+from utils.backtestHelpers import load_raw_data_for_backtest
+
+HOUR_MS = 3600 * 1000
+PAIR_CONFIG = {"symbol": "BTC/USDT", "timeframe": "1h", "start": "2023-01-01", "end": "2023-03-31"}
+DATASET = "btcusdt_1h_all_2023"
+
+
+class FakeExchange:
+    """Hourly candles from `listed_ms` on; requests from `failing_from_ms` on raise."""
+    rateLimit = 0
+
+    def __init__(self, listed_ms=0, failing_from_ms=None):
+        self.listed_ms = listed_ms
+        self.failing_from_ms = failing_from_ms
+        self.requests = []
+
+    def parse_timeframe(self, timeframe):
+        return 3600
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.requests.append(since)
+        start = max(since + (-since) % HOUR_MS, self.listed_ms)
+        if self.failing_from_ms is not None and start >= self.failing_from_ms:
+            raise RuntimeError("exchange unavailable")
+        timestamps = np.arange(start, start + limit * HOUR_MS, HOUR_MS)
+        if self.failing_from_ms is not None:
+            timestamps = timestamps[timestamps < self.failing_from_ms]
+        return [[int(t), 100.0, 101.0, 99.0, 100.5, 1.0] for t in timestamps]
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    """Installs a fake exchange listed on 2023-02-01; set attributes on it to change its behaviour."""
+    exchange = FakeExchange(listed_ms=fetcher.parse_date("2023-02-01 00:00:00"))
+    monkeypatch.setattr(fetcher, "_exchange", lambda: exchange)
+    monkeypatch.setattr(fetcher.time, "sleep", lambda seconds: None)
+    return exchange
+
+
+def test_gaps():
+    coverage = CoverageIndex("X/USDT", "1h")
+    coverage.add("d", 0, 9)
+    coverage.add("d", 20, 29)
+    coverage.add("d", 10, 12)
+    assert coverage.intervals("d") == [[0, 12], [20, 29]]
+    assert coverage.gaps("d", 0, 40) == [(13, 19), (30, 40)]
+    assert coverage.gaps("d", 5, 25) == [(13, 19)]
+    assert coverage.gaps("d", 21, 28) == []
+    coverage.reset("d")
+    assert coverage.gaps("d", 0, 5) == [(0, 5)]
+
+
+def test_covered_range_is_not_requested_again(exchange):
+    data = load_raw_data_for_backtest(PAIR_CONFIG)
+    assert len(data) == (28 + 31) * 24
+    assert (np.diff(data["timestamp"].to_numpy()) == HOUR_MS).all()
+
+    exchange.requests.clear()
+    assert len(load_raw_data_for_backtest(PAIR_CONFIG)) == len(data)
+    assert exchange.requests == []
+
+
+def test_range_before_listing_is_covered(exchange):
+    load_raw_data_for_backtest(PAIR_CONFIG)
+    since, until = fetcher._requested_range(PAIR_CONFIG)
+    assert CoverageIndex("BTC/USDT", "1h").intervals(DATASET) == [[since, until]]
+
+
+def test_extension_only_requests_the_new_range(exchange):
+    load_raw_data_for_backtest(PAIR_CONFIG)
+    exchange.requests.clear()
+    extended = load_raw_data_for_backtest({**PAIR_CONFIG, "end": "2023-04-30"})
+    assert min(exchange.requests) > fetcher.parse_date("2023-03-31 23:00:00")
+    assert extended["timestamp"].iloc[-1] == fetcher.parse_date("2023-04-30 23:00:00")
+
+
+def test_failed_fetch_is_retried_on_next_update(exchange):
+    exchange.failing_from_ms = fetcher.parse_date("2023-03-01 00:00:00")
+    data = load_raw_data_for_backtest(PAIR_CONFIG)
+    assert data["timestamp"].iloc[-1] == fetcher.parse_date("2023-02-28 23:00:00")
+    gaps = CoverageIndex("BTC/USDT", "1h").gaps(DATASET, *fetcher._requested_range(PAIR_CONFIG))
+    assert len(gaps) == 1 and gaps[0][0] > fetcher.parse_date("2023-02-28 22:00:00")
+
+    exchange.failing_from_ms = None
+    exchange.requests.clear()
+    data = load_raw_data_for_backtest(PAIR_CONFIG)
+    assert min(exchange.requests) == gaps[0][0]
+    assert data["timestamp"].iloc[-1] == fetcher.parse_date("2023-03-31 23:00:00")
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import module.storage_manager.parquet_store_manager as parquet_store_manager
+from conftest import PAIR_CONFIG, make_candles
+from module.storage_manager.factory import STORE_MANAGER_MAP, configure_storage, create_store_manager
+from module.storage_manager.file_store_manager import FileStoreManager
+from module.storage_manager.storage_manager_base import MARKET_DATA_COLUMNS, PROCESSED_DATA_TYPE, RAW_DATA_TYPE
+from module.storage_manager.sqlite_store_manager import SqliteStoreManager
+
+BACKENDS = sorted(STORE_MANAGER_MAP)
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    if request.param == "parquet" and not parquet_store_manager.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    configure_storage({"storage": {"backend": request.param}})
+    return request.param
+
+
+def assert_same_candles(loaded: pd.DataFrame, expected: pd.DataFrame):
+    """Same columns and rows; CSV text may round prices in the last bit."""
+    expected = expected.reset_index(drop=True)
+    assert list(loaded.columns) == list(expected.columns)
+    np.testing.assert_array_equal(loaded["timestamp"].to_numpy(), expected["timestamp"].to_numpy())
+    for column in ("open", "high", "low", "close", "volume"):
+        if column in expected:
+            np.testing.assert_allclose(loaded[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float), rtol=1e-15)
+    if "datetime" in expected:
+        assert (pd.to_datetime(loaded["datetime"]) == expected["datetime"]).all()
+
+
+def test_round_trip(backend):
+    candles = make_candles(bars=500, seed=1)
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_dataframe(candles, RAW_DATA_TYPE)
+    assert_same_candles(create_store_manager(PAIR_CONFIG).load_dataframe(RAW_DATA_TYPE), candles)
+
+
+def test_append_round_trip(backend):
+    candles = make_candles(bars=300, seed=2)
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_dataframe(candles.iloc[:100], RAW_DATA_TYPE)
+    for start in range(100, 300, 20):
+        store.save_dataframe(candles.iloc[start:start + 20], RAW_DATA_TYPE, append=True)
+    assert_same_candles(store.load_dataframe(RAW_DATA_TYPE), candles)
+
+
+def test_column_projection(backend):
+    candles = make_candles(bars=200, seed=3)
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_dataframe(candles, RAW_DATA_TYPE)
+    loaded = store.load_dataframe(RAW_DATA_TYPE, columns=["timestamp", "close"])
+    assert_same_candles(loaded, candles[["timestamp", "close"]])
+
+
+def test_compact_load_keeps_prices(backend):
+    candles = make_candles(bars=200, seed=4)
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_dataframe(candles, RAW_DATA_TYPE)
+    loaded = store.load_dataframe(RAW_DATA_TYPE, compact=True)
+    for column in ("open", "high", "low", "close"):
+        assert loaded[column].dtype == np.float64
+        np.testing.assert_allclose(loaded[column].to_numpy(), candles[column].to_numpy(), rtol=1e-15)
+
+
+def test_json_round_trip(backend):
+    summary = {"total_trades": 3, "final_capital": 101234.5, "trades": [{"entry_step": 1, "exit_reason": "stop_loss"}]}
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_json(summary, "summary")
+    assert create_store_manager(PAIR_CONFIG).load_json("summary") == summary
+
+
+def test_parquet_parts_are_compacted(monkeypatch):
+    if not parquet_store_manager.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    monkeypatch.setattr(parquet_store_manager, "PARTS_PER_COMPACTION", 4)
+    configure_storage({"storage": {"backend": "parquet"}})
+    candles = make_candles(bars=110, seed=5)
+    store = create_store_manager(PAIR_CONFIG)
+    store.save_dataframe(candles.iloc[:10], RAW_DATA_TYPE)
+    for start in range(10, 110, 10):
+        store.save_dataframe(candles.iloc[start:start + 10], RAW_DATA_TYPE, append=True)
+        filepath = store._get_filepath(RAW_DATA_TYPE)
+        assert len(store._part_files(filepath)) < 4
+    assert_same_candles(store.load_dataframe(RAW_DATA_TYPE), candles)
+
+
+def test_sqlite_imports_existing_csv_datasets():
+    candles = make_candles(bars=150, seed=6)
+    FileStoreManager(PAIR_CONFIG).save_dataframe(candles, RAW_DATA_TYPE)
+    FileStoreManager(PAIR_CONFIG).save_dataframe(candles.assign(ma20high=candles["high"]), PROCESSED_DATA_TYPE)
+
+    store = SqliteStoreManager(PAIR_CONFIG)
+    assert_same_candles(store.load_dataframe(RAW_DATA_TYPE, columns=MARKET_DATA_COLUMNS), candles)
+    processed = store.load_dataframe(PROCESSED_DATA_TYPE)
+    np.testing.assert_allclose(processed["ma20high"].to_numpy(), candles["high"].to_numpy(), rtol=1e-15)
@@ -0,0 +1,56 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import INDICATORS, make_candles
+from module.indicators.base import IndicatorError
+from module.indicators.factory import create_indicator
+from utils.indicator_processor import IndicatorProcessor
+
+
+def assert_same_columns(actual: pd.DataFrame, expected: pd.DataFrame):
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        if expected[column].dtype.kind == "f":
+            np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(), rtol=1e-9, equal_nan=True)
+        else:
+            assert actual[column].astype(object).fillna("").tolist() == expected[column].astype(object).fillna("").tolist()
+
+
+def test_seed_matches_process_and_leaves_input_unchanged():
+    candles = make_candles(bars=800, seed=11)
+    original = candles.copy()
+    seeded = IndicatorProcessor(copy.deepcopy(INDICATORS)).seed(candles)
+    assert_same_columns(seeded, IndicatorProcessor(copy.deepcopy(INDICATORS)).process(candles))
+    pd.testing.assert_frame_equal(candles, original)
+
+
+@pytest.mark.parametrize("history", [0, 1, 5, 60, 500])
+def test_streaming_updates_match_batch_indicators(history):
+    candles = make_candles(bars=history + 400, seed=history)
+    processor = IndicatorProcessor(copy.deepcopy(INDICATORS))
+    assert processor.streaming
+    rows = [processor.seed(candles.iloc[:history])]
+    rows += [pd.DataFrame([processor.update(candle)]) for candle in candles.iloc[history:].to_dict("records")]
+    streamed = pd.concat(rows, ignore_index=True)
+    assert_same_columns(streamed, IndicatorProcessor(copy.deepcopy(INDICATORS)).process(candles))
+
+
+def test_batched_indicators_match_single_ones():
+    candles = make_candles(bars=600, seed=5)
+    configs = [{"name": "EMA", "period": period} for period in (5, 12, 50)] + [{"name": "ma_high", "period": p} for p in (10, 20)]
+    single_configs, batches = IndicatorProcessor(configs).batch_groups()
+    assert single_configs == [] and len(batches) == 2
+    expected = IndicatorProcessor(configs).process(candles)
+    for names, matrix in IndicatorProcessor.compute_batches(candles, batches):
+        for column, name in enumerate(names):
+            np.testing.assert_allclose(matrix[:, column], expected[name].to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_unsupported_capabilities_raise_indicator_error():
+    supertrend = create_indicator("supertrend", period=10, multiplier=2)
+    assert supertrend.batch_parameter is None
+    with pytest.raises(IndicatorError):
+        type(supertrend).compute_batch(None, [supertrend])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import utils.stop_loss_kernel as kernel
+from conftest import make_candles
+from utils.stop_loss_kernel import EXIT_NONE, EXIT_SIGNAL, EXIT_STOP, EXIT_STOP_GAP, resolve_exit
+
+
+def reference_exit(entry_index, side, stop, open_, high, low, close, trailing_pct, exit_prices):
+    """The event loop's stop rules, one bar at a time (see the module docstring)."""
+    for bar in range(entry_index + 1, len(close)):
+        if side == "buy":
+            if open_[bar] <= stop:
+                return bar, open_[bar], EXIT_STOP_GAP, stop
+            if low[bar] <= stop:
+                return bar, stop, EXIT_STOP, stop
+            if trailing_pct is not None:
+                candidate = close[bar] * (1 - trailing_pct)
+                if stop < candidate < close[bar]:
+                    stop = candidate
+        else:
+            if open_[bar] >= stop:
+                return bar, open_[bar], EXIT_STOP_GAP, stop
+            if high[bar] >= stop:
+                return bar, stop, EXIT_STOP, stop
+            if trailing_pct is not None:
+                candidate = close[bar] * (1 + trailing_pct)
+                if close[bar] < candidate < stop:
+                    stop = candidate
+        if exit_prices is not None and np.isfinite(exit_prices[bar]) and exit_prices[bar] != 0:
+            return bar, exit_prices[bar], EXIT_SIGNAL, stop
+    return -1, np.nan, EXIT_NONE, stop
+
+
+def trades(bars, count, seed):
+    """(entry bar, side, initial stop, trailing pct) of random trades, with exit signals on ~2% of the bars."""
+    candles = make_candles(bars=bars, seed=seed)
+    arrays = [candles[column].to_numpy() for column in ("open", "high", "low", "close")]
+    rng = np.random.default_rng(seed)
+    exit_prices = np.where(rng.random(bars) < 0.02, arrays[3], np.nan)
+    for _ in range(count):
+        entry = int(rng.integers(0, bars - 1))
+        side = "buy" if rng.random() < 0.5 else "sell"
+        distance = rng.uniform(0.005, 0.05)
+        stop = arrays[3][entry] * (1 - distance if side == "buy" else 1 + distance)
+        trailing_pct = None if rng.random() < 0.3 else float(rng.uniform(0.005, 0.04))
+        yield arrays, exit_prices, entry, side, stop, trailing_pct
+
+
+@pytest.mark.parametrize("numba", [True, False])
+def test_kernel_matches_event_loop_rules(monkeypatch, numba):
+    if numba and not kernel.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(kernel, "NUMBA_AVAILABLE", numba)
+    for arrays, exit_prices, entry, side, stop, trailing_pct in trades(3000, 300, seed=4):
+        for signals in (exit_prices, None):
+            bar, price, reason, final_stop = resolve_exit(entry, side, stop, *arrays, trailing_pct, signals)
+            expected = reference_exit(entry, side, stop, *arrays, trailing_pct, signals)
+            assert (bar, reason) == expected[::2]
+            np.testing.assert_allclose([price, final_stop], [expected[1], expected[3]], rtol=1e-12)
+
+
+def test_numba_and_numpy_kernels_agree(monkeypatch):
+    if not kernel.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    for arrays, exit_prices, entry, side, stop, trailing_pct in trades(5000, 200, seed=9):
+        monkeypatch.setattr(kernel, "NUMBA_AVAILABLE", True)
+        compiled = resolve_exit(entry, side, stop, *arrays, trailing_pct, exit_prices)
+        monkeypatch.setattr(kernel, "NUMBA_AVAILABLE", False)
+        np.testing.assert_equal(resolve_exit(entry, side, stop, *arrays, trailing_pct, exit_prices), compiled)